@@ -35,9 +35,11 @@ from rich.console import Console
 from statistics import quantiles
 from math import ceil, log10
 from pathlib import Path
-from collections import Counter
+from collections import Counter, deque
+from functools import cache
 import subprocess
 import argparse
+import hashlib
 import platform
 import shutil
 import struct
@@ -46,6 +48,8 @@ import sys
 import gc
 import os
 import re
+import signal
+import time
 
 try:
     import wakepy
@@ -192,6 +196,16 @@ parser.add_argument(
 parser.add_argument(
     "--zones", help="Path to specific zones file override", default=None
 )
+parser.add_argument(
+    "--reuse-chunks",
+    action="store_true",
+    help="Keep fast pass chunks and splice them into the final output for scenes whose final parameters match (e.g. same speed and CRF) | Default: not active",
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="Regenerate zones and re-encode only the scenes whose parameters changed since the last final encode. Use it for the first encode as well so its chunks are kept | Default: not active",
+)
 
 args = parser.parse_args()
 
@@ -250,9 +264,17 @@ def get_script_setting(key_name: str, default_value: str) -> str:
 s_downscale = get_script_setting("downscale", "False")
 s_target_res = get_script_setting("target_resolution", "1920x1080")
 s_kernel = get_script_setting("kernel_type", "Hermite")
+s_fast_xpsnr = get_script_setting("fast_xpsnr", "auto")
+s_fast_xpsnr_width = get_script_setting("fast_xpsnr_width", "960")
 
 # Normalize boolean string
 do_downscale_bool = s_downscale.lower() == "true"
+# Fast XPSNR defaults to on for low-end CPUs (4 threads or fewer)
+if s_fast_xpsnr.lower() == "auto":
+    fast_xpsnr_bool = (os.cpu_count() or 1) <= 4
+else:
+    fast_xpsnr_bool = s_fast_xpsnr.lower() == "true"
+fast_xpsnr_width = int(s_fast_xpsnr_width)
 # -----------------------
 
 stage = int(args.stage)
@@ -285,6 +307,15 @@ ssimu2_log_file = tmp_dir / f"{src_file.stem}_ssimu2.log"
 xpsnr_log_file = tmp_dir / f"{src_file.stem}_xpsnr.log"
 scenes_file = tmp_dir / f"{src_file.stem}_scenes.json"
 stage_file = tmp_dir / f"{src_file.stem}_stage.txt"
+# Av1an temp folders, only pinned when chunks are reused
+fast_chunks_dir = tmp_dir / "fastpass-chunks"
+final_chunks_dir = tmp_dir / "final-chunks"
+# Finished final pass chunks by scene fingerprint, kept outside of Av1an's temp folders
+chunk_pool_dir = tmp_dir / "chunk-pool"
+# Runs a pooled chunk is kept for after its scene last matched
+chunk_pool_generations = 3
+# Extra split length written to every scene, split_scenes follows it
+av1an_extra_splits_len = 240
 stage_resume = 0
 
 # Handle external scenes path
@@ -331,6 +362,8 @@ ssimu2_cpu_workers = int(args.ssimu2_cpu_workers)
 verbose = args.verbose
 resume = args.resume
 no_boosting = args.no_boosting
+reuse_chunks = args.reuse_chunks
+incremental = args.incremental
 convert_yuv420p10 = args.convert_to_YUV420P10
 # Worker Logic — mirror Windows behavior
 # The .sh scripts always pass --workers $WORKER_COUNT, so we use it for both passes.
@@ -402,6 +435,12 @@ if stage != 0 and resume:
     )
     raise SystemExit(1)
 
+if incremental and (stage != 0 or resume or no_boosting):
+    print(
+        "Incremental mode picks the stages to rerun by itself. You cannot combine it with stage, resume or no-boosting."
+    )
+    raise SystemExit(1)
+
 if os.path.exists(tmp_dir):
     if resume and os.path.exists(stage_file):
         with open(stage_file, "r") as file:
@@ -413,7 +452,14 @@ if os.path.exists(tmp_dir):
             else:
                 print(f"Resuming from stage {stage_resume}.")
 
-    if not resume and stage in [0, 1]:
+    if incremental and os.path.exists(stage_file):
+        with open(stage_file, "r") as file:
+            lines = file.readlines()
+            # Metrics are kept, zones and the final encode are always redone
+            stage_resume = min(int(lines[0].strip()), 3)
+            print(f"Incremental re-encode from stage {stage_resume}.")
+
+    if not resume and not incremental and stage in [0, 1]:
         shutil.rmtree(tmp_dir)
 
 if not os.path.exists(tmp_dir):
@@ -641,7 +687,7 @@ def get_file_info(
     else:
         kf_file = tmp_dir / "info.txt"
 
-    if kf_file.exists() and mode == "src" and (stage != 0 or resume):
+    if kf_file.exists() and mode == "src" and (stage != 0 or resume or incremental):
         with open(kf_file, "r") as file:
             print("Loading cached scene information...")
             lines = file.readlines()
@@ -812,6 +858,10 @@ def fast_pass() -> None:
     if external_scenes_file:
         av1an_cmd.extend(["-s", str(external_scenes_file)])
 
+    if reuse_chunks:
+        # Keep the chunks around so the final pass can splice matching ones
+        av1an_cmd.extend(["--keep", "--temp", fast_chunks_dir.name])
+
     av1an_cmd.extend(
         [
             "-v",
@@ -860,9 +910,13 @@ def final_pass() -> None:
         tmp_final_output_file.name,  # Just the filename
     ]
 
+    seeded_chunks = {}
     if not no_boosting:
         # Use generated scenes
         av1an_cmd.extend(["-s", scenes_file.name])
+        if reuse_chunks or incremental:
+            av1an_cmd.extend(["--temp", final_chunks_dir.name])
+            seeded_chunks = seed_reused_chunks(av1an_cmd)
     else:
         v_params = f"--preset {final_speed} --crf {quality} {final_params}"
         av1an_cmd.extend(["-v", v_params])
@@ -880,6 +934,62 @@ def final_pass() -> None:
         console.print(f"[red]Final pass failed:[/red]\n{e}")
         raise SystemExit(1)
 
+    if seeded_chunks:
+        check_seeded_chunks(seeded_chunks)
+
+
+def fast_xpsnr_clip(clip: vs.VideoNode) -> vs.VideoNode:
+    """
+    Luma plane of the clip, downscaled to fast_xpsnr_width if it is wider.
+    """
+    clip = core.std.ShufflePlanes(clip, planes=0, colorfamily=vs.GRAY)
+    if clip.width > fast_xpsnr_width:
+        height = round(clip.height * fast_xpsnr_width / clip.width / 2) * 2
+        clip = clip.resize.Bilinear(fast_xpsnr_width, height)
+    return clip
+
+
+def validate_fast_xpsnr(
+    source_clip: vs.VideoNode, encoded_clip: vs.VideoNode, fast_scores: list
+) -> None:
+    """
+    Compares the fast luma scores with full resolution XPSNR on a sparse set
+    of frames and warns if their ranking disagrees.
+    """
+    step = max(1, source_clip.num_frames // 64)
+    frames = list(range(0, source_clip.num_frames, step))
+    if len(frames) < 8:
+        return
+
+    result = core.vszip.XPSNR(
+        core.std.Splice([source_clip[n] for n in frames]),
+        core.std.Splice([encoded_clip[n] for n in frames]),
+        temporal=False,
+        verbose=False,
+    )
+    full_scores = [None] * len(frames)
+
+    def get_props(n: int, f: vs.VideoFrame) -> None:
+        full_scores[n] = float(f.props.get("XPSNR_Y"))
+
+    clip_async_render(result, callback=get_props)
+
+    fast = np.array([float(fast_scores[n]) for n in frames])
+    full = np.array(full_scores)
+    # Spearman rank correlation, capped so identical frames don't break the ranking
+    fast = np.argsort(np.argsort(np.minimum(fast, 100.0)))
+    full = np.argsort(np.argsort(np.minimum(full, 100.0)))
+    correlation = np.corrcoef(fast, full)[0, 1]
+
+    if correlation < 0.9:
+        console.print(
+            f"[red]Fast XPSNR ranks frames differently from full resolution (rank correlation {correlation:.3f}). Consider fast_xpsnr=False in settings.txt.[/red]"
+        )
+    elif verbose:
+        console.print(
+            f"[green]Fast XPSNR rank correlation with full resolution: {correlation:.3f}[/green]"
+        )
+
 
 def calculate_metric() -> None:
     # Import needed for parallelism
@@ -925,21 +1035,38 @@ def calculate_metric() -> None:
                 console.print("[red]vs-zip plugin not found! Required for XPSNR.[/red]")
                 raise SystemExit(1)
 
+            if fast_xpsnr_bool:
+                # Luma only on a downscaled plane. Zones only compare scenes
+                # against each other, so the ranking is what has to hold up.
+                console.print(
+                    f"[yellow]Fast XPSNR: luma only at {fast_xpsnr_width}px width[/yellow]"
+                )
+                metric_source_clip = fast_xpsnr_clip(cut_source_clip)
+                metric_encoded_clip = fast_xpsnr_clip(cut_encoded_clip)
+                planes = ["Y"]
+            else:
+                metric_source_clip = cut_source_clip
+                metric_encoded_clip = cut_encoded_clip
+                planes = ["Y", "U", "V"]
+
             result = core.vszip.XPSNR(
-                cut_source_clip, cut_encoded_clip, temporal=False, verbose=False
+                metric_source_clip, metric_encoded_clip, temporal=False, verbose=False
             )
 
             # XPSNR requires storing Y, U, V separately
             score_list = [[None] * cut_source_clip.num_frames for _ in range(3)]
 
             def get_xpsnrprops(n: int, f: vs.VideoFrame) -> None:
-                for i, plane in enumerate(["Y", "U", "V"]):
+                for i, plane in enumerate(planes):
                     val = f.props.get(f"XPSNR_{plane}")
                     # inf = perfect match
                     if str(val) == "inf":
                         score_list[i][n] = "100.0"
                     else:
                         score_list[i][n] = float(val)
+                if len(planes) == 1:
+                    # Luma only, the 4:1:1 weighting in stage 3 then reduces to Y
+                    score_list[1][n] = score_list[2][n] = score_list[0][n]
 
             with Progress(
                 SpinnerColumn(), BarColumn(), FPSColumn(), console=console
@@ -953,6 +1080,9 @@ def calculate_metric() -> None:
 
                 clip_async_render(result, progress=update_p, callback=get_xpsnrprops)
 
+            if fast_xpsnr_bool:
+                validate_fast_xpsnr(cut_source_clip, cut_encoded_clip, score_list[0])
+
             # Write Log
             with open(xpsnr_log_file, "w") as file:
                 skip_offset = 0
@@ -1096,13 +1226,11 @@ def calculate_metric() -> None:
                     f.write(packed)
 
             # WORKER FUNCTION FOR PARALLEL EXECUTION
-            def process_frame(n):
+            # Frames are decoded asynchronously by VapourSynth and handed over
+            def process_frame(n, f_ref, f_dist):
                 if fallback_needed:
                     return n, 0.0  # Abort
 
-                f_ref = ref_rgb.get_frame(n)
-                f_dist = dist_rgb.get_frame(n)
-
                 current_ref_path = tmp_dir / f"ref_{n}.pam"
                 current_dist_path = tmp_dir / f"dist_{n}.pam"
 
@@ -1153,32 +1281,73 @@ def calculate_metric() -> None:
                         total=ref_rgb.num_frames * skip,
                     )
 
+                    # Bounded producer/consumer: VapourSynth prefetches frames
+                    # with get_frame_async while the workers score earlier ones,
+                    # and at most max_in_flight frames are decoded or being
+                    # scored at any time, so memory stays flat for any length.
+                    max_in_flight = workers_count * 2
+                    next_frame = 0
+                    decoding = deque()
+                    scoring = set()
+
                     with concurrent.futures.ThreadPoolExecutor(
                         max_workers=workers_count
                     ) as executor:
-                        future_to_frame = {
-                            executor.submit(process_frame, n): n
-                            for n in range(ref_rgb.num_frames)
-                        }
-
-                        for future in concurrent.futures.as_completed(future_to_frame):
-                            try:
-                                n, score = future.result()
-                                score_list[n] = score
-                                p.update(task, advance=skip)
-                            except RuntimeError:
-                                if ssimu2 == "auto":
-                                    console.print(
-                                        "[red]Crash detected in worker! Switching to fallback...[/red]"
+                        while next_frame < ref_rgb.num_frames or decoding or scoring:
+                            while (
+                                next_frame < ref_rgb.num_frames
+                                and len(decoding) + len(scoring) < max_in_flight
+                            ):
+                                decoding.append(
+                                    (
+                                        next_frame,
+                                        ref_rgb.get_frame_async(next_frame),
+                                        dist_rgb.get_frame_async(next_frame),
                                     )
-                                    fallback_needed = True
-                                    executor.shutdown(wait=False, cancel_futures=True)
-                                    break
-                                else:
-                                    console.print(
-                                        "[red]Crash detected in worker! Aborting.[/red]"
+                                )
+                                next_frame += 1
+
+                            while (
+                                decoding
+                                and decoding[0][1].done()
+                                and decoding[0][2].done()
+                            ):
+                                n, f_ref, f_dist = decoding.popleft()
+                                scoring.add(
+                                    executor.submit(
+                                        process_frame, n, f_ref.result(), f_dist.result()
                                     )
-                                    raise SystemExit(1)
+                                )
+
+                            waiting = set(scoring)
+                            if decoding:
+                                waiting.update(decoding[0][1:])
+                            done, _ = concurrent.futures.wait(
+                                waiting, return_when=concurrent.futures.FIRST_COMPLETED
+                            )
+
+                            for future in done & scoring:
+                                scoring.discard(future)
+                                try:
+                                    n, score = future.result()
+                                    score_list[n] = score
+                                    p.update(task, advance=skip)
+                                except RuntimeError:
+                                    if ssimu2 == "auto":
+                                        console.print(
+                                            "[red]Crash detected in worker! Switching to fallback...[/red]"
+                                        )
+                                        fallback_needed = True
+                                        break
+                                    else:
+                                        console.print(
+                                            "[red]Crash detected in worker! Aborting.[/red]"
+                                        )
+                                        raise SystemExit(1)
+
+                            if fallback_needed:
+                                executor.shutdown(wait=False, cancel_futures=True)
+                                break
             except Exception as e:
                 if ssimu2 == "auto":
                     console.print(
@@ -1365,6 +1534,420 @@ def merge_params(
 # ---------------------
 
 
+# --- CHUNK REUSE HELPERS ---
+# Params that do not change the bitstream and are ignored when matching chunks
+CHUNK_NEUTRAL_PARAMS = ("--lp",)
+
+
+def normalize_params(param_list: list[str]) -> tuple:
+    """
+    Turns a param list into a hashable, order independent form.
+    Numbers are compared by value so that --crf 30 matches --crf 30.00.
+    """
+    normalized = []
+    for k, v in parse_param_string_to_dict(param_list).items():
+        if k in CHUNK_NEUTRAL_PARAMS:
+            continue
+        if v is not None:
+            try:
+                v = repr(float(v))
+            except ValueError:
+                pass
+        normalized.append((k, v))
+    return tuple(sorted(normalized, key=lambda item: (item[0], str(item[1]))))
+
+
+@cache
+def vpy_digest() -> str:
+    return hashlib.sha1(vpy_file.read_bytes()).hexdigest()
+
+
+def scene_fingerprint(
+    start_frame: int, end_frame: int, video_params: list[str], photon_noise
+) -> str:
+    """
+    Identifies the encode of a scene: frame range, normalized video params,
+    photon noise and the VPY the frames are served from.
+    """
+    if photon_noise in [0, "0"]:
+        photon_noise = None
+    key = [
+        int(start_frame),
+        int(end_frame),
+        normalize_params(video_params),
+        photon_noise,
+        vpy_digest(),
+    ]
+    return hashlib.sha1(json.dumps(key).encode()).hexdigest()[:16]
+
+
+def split_long_scenes(scenes: list[dict], max_len: int) -> list[dict]:
+    """
+    Splits scenes longer than max_len the same way Av1an's extra splits do:
+    length // max_len + 1 parts of a fixed step, with the remainder going to
+    the last part. Every Av1an chunk then maps to one entry.
+    """
+    split_scenes = []
+    for scene in scenes:
+        length = scene["end_frame"] - scene["start_frame"]
+        parts = length // max_len + 1 if length > max_len else 1
+        step = length // parts
+        boundaries = [scene["start_frame"] + step * part for part in range(parts)]
+        boundaries.append(scene["end_frame"])
+        for part in range(parts):
+            split_scene = dict(scene)
+            split_scene["start_frame"] = boundaries[part]
+            split_scene["end_frame"] = boundaries[part + 1]
+            split_scene["fingerprint"] = scene_fingerprint(
+                split_scene["start_frame"],
+                split_scene["end_frame"],
+                scene["zone_overrides"]["video_params"],
+                scene["zone_overrides"]["photon_noise"],
+            )
+            split_scenes.append(split_scene)
+    return split_scenes
+
+
+def load_done_json(chunks_dir: Path) -> dict:
+    done_json = chunks_dir / "done.json"
+    if done_json.exists():
+        try:
+            with open(done_json, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    return {"frames": 0, "done": {}, "audio_done": False}
+
+
+def load_chunk_candidates(chunks_dir: Path, photon_noise=None) -> dict:
+    """
+    Reads a kept Av1an temp folder and returns {fingerprint: (chunk file, done entry)}
+    for every chunk that finished encoding.
+    """
+    chunks_json = chunks_dir / "chunks.json"
+    if not chunks_json.exists():
+        return {}
+
+    try:
+        with open(chunks_json, "r") as f:
+            chunks = json.load(f)
+    except json.JSONDecodeError:
+        return {}
+    done = load_done_json(chunks_dir)["done"]
+
+    candidates = {}
+    for chunk in chunks:
+        name = f"{chunk['index']:05}"
+        if name not in done:
+            continue
+        chunk_files = sorted((chunks_dir / "encode").glob(f"{name}.*"))
+        if not chunk_files:
+            continue
+        fingerprint = scene_fingerprint(
+            chunk["start_frame"],
+            chunk["end_frame"],
+            chunk.get("video_params", []),
+            photon_noise,
+        )
+        candidates[fingerprint] = (chunk_files[0], done[name])
+    return candidates
+
+
+def load_chunk_queue(chunks_dir: Path) -> list[dict]:
+    chunks_json = chunks_dir / "chunks.json"
+    if chunks_json.exists():
+        try:
+            with open(chunks_json, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    return []
+
+
+def stash_final_chunks(fingerprints: list[str]) -> dict:
+    """
+    Links the finished chunks of the previous final pass into the chunk pool
+    keyed by their scene fingerprint and returns the whole pool, including
+    chunks stashed by earlier runs.
+    The pool lives outside of Av1an's temp folder so that Av1an can never
+    remove it. Entries not matched by the current scenes are dropped after
+    chunk_pool_generations runs.
+    """
+    pool_file = chunk_pool_dir / "pool.json"
+    pool = {"generation": 0, "chunks": {}}
+    if pool_file.exists():
+        try:
+            with open(pool_file, "r") as f:
+                pool = json.load(f)
+        except json.JSONDecodeError:
+            pass
+    pool["generation"] += 1
+
+    fingerprints_file = chunk_pool_dir / "final-fingerprints.json"
+    if fingerprints_file.exists():
+        with open(fingerprints_file, "r") as f:
+            previous_fingerprints = json.load(f)
+        done = load_done_json(final_chunks_dir)["done"]
+
+        for index, fingerprint in enumerate(previous_fingerprints):
+            name = f"{index:05}"
+            if name not in done or fingerprint in pool["chunks"]:
+                continue
+            chunk_files = sorted((final_chunks_dir / "encode").glob(f"{name}.*"))
+            if not chunk_files:
+                continue
+            pooled_file = chunk_pool_dir / f"{fingerprint}{chunk_files[0].suffix}"
+            place_chunk(chunk_files[0], pooled_file)
+            pool["chunks"][fingerprint] = {
+                "file": pooled_file.name,
+                "done": done[name],
+                "generation": pool["generation"],
+            }
+
+    current_fingerprints = set(fingerprints)
+    for fingerprint, entry in list(pool["chunks"].items()):
+        if fingerprint in current_fingerprints:
+            entry["generation"] = pool["generation"]
+        elif entry["generation"] <= pool["generation"] - chunk_pool_generations:
+            (chunk_pool_dir / entry["file"]).unlink(missing_ok=True)
+            del pool["chunks"][fingerprint]
+
+    with open(pool_file, "w") as f:
+        json.dump(pool, f)
+
+    return pool
+
+
+def place_chunk(src: Path, dst: Path) -> None:
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def chunk_source_range(chunk: dict) -> tuple[int, int] | None:
+    """
+    Frame range [start, end) that the source_cmd of an Av1an chunk pipes
+    into the encoder, read from vspipe's -s/--start and -e/--end, or None if
+    the command has no such range.
+    """
+    args = []
+    for arg in chunk.get("source_cmd", []):
+        # Serde writes OsString as {"Unix": [bytes]} or {"Windows": [u16]}
+        if isinstance(arg, dict):
+            if "Unix" in arg:
+                arg = bytes(arg["Unix"]).decode(errors="replace")
+            else:
+                arg = "".join(map(chr, arg.get("Windows", [])))
+        args.append(str(arg))
+
+    start = end = None
+    for flag, value in zip(args, args[1:]):
+        if flag in ["-s", "--start"]:
+            start = int(value)
+        elif flag in ["-e", "--end"]:
+            end = int(value) + 1
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def chunk_queue_mismatches(chunk_queue: list[dict], final_chunks: list[dict]) -> list[int]:
+    """
+    Indices where Av1an's chunk queue differs from split_scenes, either in the
+    chunk's frame range or in the range its source_cmd serves.
+    """
+    if len(chunk_queue) != len(final_chunks):
+        return list(range(max(len(chunk_queue), len(final_chunks))))
+
+    mismatches = []
+    for index, (chunk, scene) in enumerate(zip(chunk_queue, final_chunks)):
+        scene_range = (scene["start_frame"], scene["end_frame"])
+        source_range = chunk_source_range(chunk)
+        if (
+            chunk.get("index", index) != index
+            or (chunk["start_frame"], chunk["end_frame"]) != scene_range
+            or (source_range is not None and source_range != scene_range)
+        ):
+            mismatches.append(index)
+    return mismatches
+
+
+def stop_process_tree(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        if platform.system() == "Windows":
+            subprocess.run(
+                ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    proc.wait()
+
+
+def prime_chunk_queue(av1an_cmd: list[str]) -> list[dict]:
+    """
+    Starts the final pass in an empty temp folder only until Av1an has written
+    its own chunks.json for the current scenes, then stops it. Av1an's
+    --resume needs that queue, and only Av1an knows how to build every field
+    of it, such as the source command and the photon noise of each chunk.
+    Returns the queue, or an empty list if Av1an exited without one.
+    """
+    prime_cmd = list(av1an_cmd)
+    prime_cmd[prime_cmd.index("--workers") + 1] = "1"
+
+    if platform.system() == "Windows":
+        session_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        session_kwargs = {"start_new_session": True}
+    proc = subprocess.Popen(
+        prime_cmd,
+        cwd=tmp_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **session_kwargs,
+    )
+
+    chunk_queue = []
+    try:
+        while not chunk_queue:
+            # A chunks.json that is still being written fails to parse and is retried
+            chunk_queue = load_chunk_queue(final_chunks_dir)
+            if chunk_queue or proc.poll() is not None:
+                break
+            time.sleep(0.2)
+        if not chunk_queue:
+            chunk_queue = load_chunk_queue(final_chunks_dir)
+    finally:
+        stop_process_tree(proc)
+    return chunk_queue
+
+
+def seed_reused_chunks(av1an_cmd: list[str]) -> dict:
+    """
+    Fills the final pass temp folder with already encoded chunks whose
+    fingerprint matches a scene of the current scenes file and marks them as
+    done, so Av1an's --resume only encodes changed or new scenes.
+    Chunks come from previous final passes and, with --reuse-chunks, the fast pass.
+    The chunk queue itself is written by Av1an, see prime_chunk_queue.
+    Returns the stat of every seeded chunk file for check_seeded_chunks.
+    """
+    with open(scenes_file, "r") as f:
+        scenes_data = json.load(f)
+    final_chunks = scenes_data.get("split_scenes", scenes_data["scenes"])
+    fingerprints = [
+        scene.get("fingerprint")
+        or scene_fingerprint(
+            scene["start_frame"],
+            scene["end_frame"],
+            scene["zone_overrides"]["video_params"],
+            scene["zone_overrides"]["photon_noise"],
+        )
+        for scene in final_chunks
+    ]
+
+    encode_dir = final_chunks_dir / "encode"
+    chunk_pool_dir.mkdir(parents=True, exist_ok=True)
+
+    candidates = {}
+    if reuse_chunks:
+        candidates.update(load_chunk_candidates(fast_chunks_dir))
+    pool = stash_final_chunks(fingerprints)
+    candidates.update(
+        {
+            fingerprint: (chunk_pool_dir / entry["file"], entry["done"])
+            for fingerprint, entry in pool["chunks"].items()
+            if (chunk_pool_dir / entry["file"]).exists()
+        }
+    )
+
+    # Chunk indices of the previous run no longer apply, start from a clean queue.
+    # The fingerprints are recorded so that the next run can pool the chunks of this one
+    shutil.rmtree(final_chunks_dir, ignore_errors=True)
+    with open(chunk_pool_dir / "final-fingerprints.json", "w") as f:
+        json.dump(fingerprints, f)
+
+    matched = [index for index, fingerprint in enumerate(fingerprints) if fingerprint in candidates]
+    if not matched:
+        console.print(
+            f"[green]Reusing 0/{len(final_chunks)} chunks, encoding {len(final_chunks)}[/green]"
+        )
+        return {}
+
+    chunk_queue = prime_chunk_queue(av1an_cmd)
+    if not chunk_queue:
+        console.print(
+            "[yellow]Warning: Av1an did not write a chunk queue, encoding all chunks.[/yellow]"
+        )
+        shutil.rmtree(final_chunks_dir, ignore_errors=True)
+        return {}
+
+    mismatches = chunk_queue_mismatches(chunk_queue, final_chunks)
+    if mismatches:
+        console.print(
+            f"[yellow]Warning: {len(mismatches)} chunks of Av1an's queue do not match split_scenes "
+            f"(first at index {mismatches[0]}), encoding all chunks.[/yellow]"
+        )
+        shutil.rmtree(final_chunks_dir, ignore_errors=True)
+        return {}
+
+    # Drop whatever the stopped Av1an started encoding
+    encode_dir.mkdir(parents=True, exist_ok=True)
+    for chunk_file in encode_dir.iterdir():
+        chunk_file.unlink()
+
+    done_data = {"frames": 0, "done": {}, "audio_done": False}
+    seeded_chunks = {}
+    for index in matched:
+        scene = final_chunks[index]
+        name = f"{index:05}"
+        chunk_file, done_entry = candidates[fingerprints[index]]
+        seeded_file = encode_dir / f"{name}{chunk_file.suffix}"
+        place_chunk(chunk_file, seeded_file)
+        seeded_stat = seeded_file.stat()
+        seeded_chunks[seeded_file] = (seeded_stat.st_ino, seeded_stat.st_mtime_ns)
+        done_data["done"][name] = done_entry
+        done_data["frames"] += scene["end_frame"] - scene["start_frame"]
+
+    with open(final_chunks_dir / "done.json", "w") as f:
+        json.dump(done_data, f)
+
+    console.print(
+        f"[green]Reusing {len(seeded_chunks)}/{len(final_chunks)} chunks, encoding {len(final_chunks) - len(seeded_chunks)}[/green]"
+    )
+    return seeded_chunks
+
+
+def check_seeded_chunks(seeded_chunks: dict) -> None:
+    """
+    Warns when Av1an did not resume from the seeded temp folder, which shows
+    as seeded chunk files that were removed or written again.
+    """
+    reencoded = 0
+    for seeded_file, (inode, mtime) in seeded_chunks.items():
+        if not seeded_file.exists():
+            reencoded += 1
+            continue
+        seeded_stat = seeded_file.stat()
+        if (seeded_stat.st_ino, seeded_stat.st_mtime_ns) != (inode, mtime):
+            reencoded += 1
+
+    if reencoded:
+        console.print(
+            f"[yellow]Warning: Av1an did not resume from the reused chunks, {reencoded}/{len(seeded_chunks)} of them were encoded again. "
+            f"Check that the Av1an version in use supports --resume in {obscure_user_path(str(final_chunks_dir))}.[/yellow]"
+        )
+    elif verbose:
+        console.print(
+            f"[green]Av1an resumed from all {len(seeded_chunks)} reused chunks[/green]"
+        )
+
+
+# ---------------------------
+
+
 def calculate_zones_json(ranges: list[float], hr: bool, nframe: int) -> None:
     metric_scores = []
 
@@ -1620,6 +2203,12 @@ def calculate_zones_json(ranges: list[float], hr: bool, nframe: int) -> None:
             {
                 "start_frame": s["start_frame"],
                 "end_frame": s["end_frame"],
+                "fingerprint": scene_fingerprint(
+                    s["start_frame"],
+                    s["end_frame"],
+                    s["video_params"],
+                    s["photon_noise"],
+                ),
                 "zone_overrides": {
                     "encoder": "svt_av1",
                     "passes": 1,
@@ -1630,13 +2219,16 @@ def calculate_zones_json(ranges: list[float], hr: bool, nframe: int) -> None:
                     "photon_noise_height": None,
                     "photon_noise_width": None,
                     "chroma_noise": False,
-                    "extra_splits_len": 240,
+                    "extra_splits_len": av1an_extra_splits_len,
                     "min_scene_len": 24,
                 },
             }
         )
 
     output_json = {"frames": nframe, "scenes": scenes_data_output}
+    if reuse_chunks or incremental:
+        # Pin Av1an's chunk boundaries so chunks can be matched against scenes
+        output_json["split_scenes"] = split_long_scenes(scenes_data_output, av1an_extra_splits_len)
 
     with open(scenes_file, "w") as f:
         json.dump(output_json, f, indent=2)
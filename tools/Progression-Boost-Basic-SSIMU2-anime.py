@@ -22,39 +22,19 @@
 
 
 import argparse
-from collections.abc import Callable
-import copy
-from datetime import datetime
-import json
-import math
 import numpy as np
-from numpy.polynomial import Polynomial
-from numpy.random import default_rng
 import os
 from pathlib import Path
 import platform
-import re
-from scipy import fftpack, interpolate, signal, stats
-import shutil
-import subprocess
-import time
+import progression_boost
+from scipy import interpolate, stats
 from typing import Optional
-import traceback
 import vapoursynth as vs
 from vapoursynth import core
 
 if platform.system() == "Windows":
     os.system("")
 
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, object):
-        if isinstance(object, np.generic):
-            return object.item()
-        if isinstance(object, np.ndarray):
-            return object.tolist()
-        else:
-            return super(NumpyEncoder, self).default(object)
-
 parser = argparse.ArgumentParser(prog="Progression Boost", epilog="For more configs, open `Progression-Boost.py` in a text editor and follow the guide at the very top")
 parser.add_argument("-i", "--input", type=Path, required=True, help="Source video file")
 parser.add_argument("--encode-input", type=Path, help="Source file for test encodes. Supports both video file and vpy file (Default: same as `--input`). This file is only used to perform probe encodes, while all other processes will be performed using the video file specified in `--input`. Note that if you apply filtering for test encodes, you probably also want to apply the same filtering before metric calculation, which can be set via `metric_reference` in the `Progression-Boost.py` file itself")
@@ -69,6 +49,8 @@ group.add_argument("--zones", type=Path, help="Zones file for Progression Boost.
 group.add_argument("--zones-string", help="Zones string for Progression Boost. Same as `--zones` but fed from commandline")
 parser.add_argument("--temp", type=Path, help="Temporary folder for Progression Boost (Default: output scenes file with file extension replaced by „.boost.tmp“)")
 parser.add_argument("-r", "--resume", action="store_true", help="Resume from the temporary folder. By enabling this option, Progression Boost will reuse finished or unfinished testing encodes. This should be disabled should the parameters for test encode be changed")
+parser.add_argument("-t", "--metric-target", type=float, nargs="+", metavar="TARGET", help="Use this `metric_target` in place of the ones in the config for every zone. If more than one target is specified, the probes and the metric are shared, and one scenes file is written for each target, with the target added to the filename of `--output-scenes`")
+parser.add_argument("--retarget", action="store_true", help="Only redo the final calculation from the results in the temporary folder of a finished run, without scene detection, probing or metric calculation. This is mostly useful together with `--metric-target`. Implies `--resume`")
 parser.add_argument("-v", "--verbose", action="count", default=0, help="Report more details of Progression Boost. This parameter can be specified up to 3 times")
 args = parser.parse_args()
 input_file = args.input
@@ -96,7 +78,9 @@ progression_boost_temp_dir = temp_dir / "progression-boost"
 character_boost_temp_dir = temp_dir / "characters-boost"
 for dir_ in [scene_detection_temp_dir, progression_boost_temp_dir, character_boost_temp_dir]:
     dir_.mkdir(parents=True, exist_ok=True)
-resume = args.resume
+metric_targets = args.metric_target
+retarget = args.retarget
+resume = args.resume or retarget
 verbose = args.verbose
 
 if not resume:
@@ -307,7 +291,7 @@ class DefaultZone:
 #   b) search for `metric_reference` in the script, and apply the same
 #      filtering to `metric_reference`.
 
-# To optimise for speed, Progression Boost copies `source_clip_cache`
+# To optimise for speed, Progression Boost places `source_clip_cache`
 # into the av1an temp folder for scene detection and probing. This
 # will cause issues if:
 # 1. You're using different video files (not vpy; vpy would be
@@ -318,12 +302,23 @@ class DefaultZone:
 # If you're having this issue, you can set the following option to
 # `False`, or switch to lsmas or BestSource.
     source_clip_cache_reuse = True
+# `source_clip_cache` is placed into each av1an temp folder using the
+# first method below that works on your filesystem. A hard link or a
+# reflink takes no extra space and is instant even for the hundreds of
+# MB of index of a 4K remux, and a symbolic link is the same except it
+# also works across drives. Copying is only the last resort.
+# Hard links and symbolic links share the file with `source_clip_cache`
+# itself. If you're in the situation above where lsmas would recreate
+# a mismatched cache, it would then overwrite `source_clip_cache`. In
+# that case, remove `"hardlink"` and `"symlink"` from the list.
+    source_clip_cache_reuse_methods = ["hardlink", "reflink", "symlink", "copy"]
 
 # Zoning information: `source_clip` and `source_provider` are not
 # zoneable, but you can write VapourSynth code to `core.std.Splice` it
 # yourself. Make sure you do the same for `--encode-input`,
 # `--scene-detection-input`, and final encode as well.
-# `source_clip_cache_reuse` is not zoneable.
+# `source_clip_cache_reuse` and `source_clip_cache_reuse_methods` are
+# not zoneable.
 # ---------------------------------------------------------------------
 # We highly recommend using a SVT-AV1 derived encoder that supports
 # quarterstep `--crf`, which includes all the major forks from
@@ -416,10 +411,17 @@ class DefaultZone:
 # `--input-scenes` option.
     # scene_detection_method = "external".lower()
 
+# x264, av1an and VapourSynth based scene detection run at the same
+# time, and this is the number of threads they share. av1an takes one
+# thread, and x264 and VapourSynth split the rest. Long zones are cut
+# into overlapping segments so that x264 can make use of all the
+# threads it's given. By default, all threads of your system are used.
+    scene_detection_threads = os.cpu_count() or 1
+
 # `--resume` information: If you've modified anything scene detection
 # related, you need to delete everything in `scene-detection` folder in
-# the temporary directory except for the four .txt files starting with
-# `luma-`, and then you can rerun the script.
+# the temporary directory except for `luma.npy` and `luma.json`, and then
+# you can rerun the script.
 
 # Zoning information: all three `scene_detection_method` is zoneable,
 # which means you can mix av1an based scene detection with VapourSynth
@@ -474,8 +476,8 @@ class DefaultZone:
 
 # `--resume` information: If you've modified anything scene detection
 # related, you need to delete everything in `scene-detection` folder in
-# the temporary directory except for the four .txt files starting with
-# `luma-`, and then you can rerun the script.
+# the temporary directory except for `luma.npy` and `luma.json`, and then
+# you can rerun the script.
 
 # Zoning information: `scene_detection_extra_split` and
 # `scene_detection_min_scene_len` are only zoneable if you use
@@ -785,6 +787,64 @@ class DefaultZone:
               + f" --chunk-method {self.source_provider_av1an} --chunk-order random --encoder svt-av1 --audio-params -an --concat mkvmerge --force --video-params").split() + \
                 [message]
 
+# Each scene's second probe only depends on the first probe score of
+# the same scene. With this option enabled, scenes are sent to the
+# second probe in segments as soon as they are scored, while the metric
+# calculation for the rest of the first probe is still running. Only
+# one av1an runs at a time, and every new segment picks up all the
+# scenes scored while the previous segment was encoding. The segments
+# are joined with mkvmerge once the last one finishes.
+# This option is not zoneable.
+    probing_second_streaming = True
+
+# Scenes from the same episode often react to `--crf` in a very similar
+# way. With this option enabled, only a sample of the scenes is sent to
+# the second probe at first. From these scenes, a model is fitted for
+# each zone that predicts the second probe score from the first probe
+# score and the luma statistics of the scene. Every other scene takes
+# the predicted score if the expected error of the prediction is within
+# `probing_second_model_tolerance`, and is only sent to a second round
+# of second probe if it's not.
+# Set the share of scenes in the sample with
+# `probing_second_model_sample`, and the expected error allowed, in
+# the unit of the metric, with `probing_second_model_tolerance`. For
+# SSIMU2, `1.0` is a good start. For Butteraugli, try `0.05`.
+# These options are not zoneable.
+    probing_second_model = False
+    probing_second_model_sample = 0.30
+    probing_second_model_tolerance = 1.0
+
+# `--resume` information: If you toggled `probing_second_model` or
+# changed `probing_second_model_sample`, you need to delete everything
+# in `progression-boost` folder inside the temporary directory, and
+# then you can rerun the script.
+
+# For UHD sources, the two probe encodes can cost as much as a fast
+# final encode. With `probing_reduced_height` set, the probes are
+# downscaled to this height by ffmpeg inside av1an, and the metric is
+# calculated against `metric_reference` downscaled the same way.
+# Scores at a reduced resolution don't match the scores at full
+# resolution. For this reason, a few scenes from each zone are also
+# probed at full resolution at the first probe's `--crf`, and a linear
+# mapping from reduced scores to full resolution scores is calibrated
+# from them. Set the number of scenes for each zone in
+# `probing_reduced_calibration_scenes`.
+# Note that `metric_process` will receive the downscaled clips for the
+# probes, and clips at full resolution for the calibration. Anything
+# done in `metric_process` must not depend on the resolution of the
+# clip. For example, crop relative to `clip.width` and `clip.height`
+# as the default crop in `metric_process` does, instead of by a fixed
+# number of pixels.
+# This is only available for VapourSynth based `metric_method`.
+# These options are not zoneable.
+    probing_reduced_height = None
+    probing_reduced_calibration_scenes = 6
+
+# `--resume` information: If you changed `probing_reduced_height` or
+# `probing_reduced_calibration_scenes`, you need to delete everything
+# in `progression-boost` folder inside the temporary directory, and
+# then you can rerun the script.
+
 # These are the photon noise parameters for your final encode. These
 # are not applied in probe encodes.
 #
@@ -946,11 +1006,19 @@ class DefaultZone:
 # we will have proportionally more characters than backgrounds in the
 # cropped compare. This may not may not be preferrable. If you want to
 # enable cropping, uncomment the lines below to crop the clip to 900p
-# before comparing.
-        clip = clip.std.Crop(left=160, right=160, top=90, bottom=90)
+# before comparing. The crop is relative to the size of the clip, so a
+# 1080p clip loses 160 pixels left and right and 90 pixels top and
+# bottom, and the same share is cropped from clips of any other size.
+        clip = clip.std.Crop(left=clip.width // 24 * 2, right=clip.width // 24 * 2, top=clip.height // 24 * 2, bottom=clip.height // 24 * 2)
 # If you want some other processing before calculating metrics, you can
 # implement it here.
         return clip
+#
+# By default, Progression Boost collects the selected frames of many
+# scenes and renders them through VapourSynth in one go, instead of
+# starting and draining a short render for every scene. If you want one
+# render per scene as before, set this to False.
+    metric_vapoursynth_batch = True
         
 # FFVship is only available if you've not applied filtering via
 # `--encode-input`, and you don't plan to apply additional filtering
@@ -967,6 +1035,15 @@ class DefaultZone:
 # related options will be available in the next section of the guide.
     metric_ffvship_extra_parameters = []
 #
+# By default, Progression Boost collects the selected frames of all
+# scenes and calculates them in a single FFVship run per probe encode,
+# instead of launching FFVship once for every scene. This saves the
+# startup, index loading and seeking of hundreds of FFVship processes.
+# Scenes are only batched together if they share the same FFVship
+# metric and parameters. If you want one FFVship run per scene as
+# before, set this to False.
+    metric_ffvship_batch = True
+#
 # To avoid accidentally selecting the FFVship option when providing
 # additional filtering, Progression Boost will refuse to run when
 # `--encode-input` is provided. However, you can force it to continue
@@ -1101,9 +1178,6 @@ class DefaultZone:
 # is no longer recommended, we still want to take this chance and thank
 # Miss Moonlight for her various contributions to boosting.
     def metric_summarise(self, frames: np.ndarray[np.int32], scores: np.ndarray[np.float32]) -> np.float32:
-        if verbose >= 3:
-            print(f"\r\033[K{scene_frame_print(scene_n)} / Metric summarisation", end="", flush=True)
-    
         if frames.shape[0] <= 1:
             if verbose >= 3:
                 print(f" / score {scores[0]:.3f}", end="\n", flush=True)
@@ -1141,6 +1215,35 @@ class DefaultZone:
     
         return mean
 
+# The same summary as `metric_summarise` above, calculated for many
+# scenes at once. Progression Boost uses it for scenes whose metric is
+# calculated together in a batch. If you modify or replace
+# `metric_summarise` above, delete this method as well.
+    def metric_summarise_batch(self, frames: list[np.ndarray[np.int32]], scores: list[np.ndarray[np.float32]]) -> list[np.float32]:
+        summaries = np.array([scene_scores[0] for scene_scores in scores], dtype=np.float64)
+        multiple = np.nonzero(np.array([scene_frames.shape[0] for scene_frames in frames]) > 1)[0]
+        if multiple.shape[0] == 0:
+            return list(summaries)
+        lengths = np.array([frames[scene].shape[0] for scene in multiple])
+        scene_ids = np.repeat(np.arange(multiple.shape[0]), lengths)
+        positions = np.arange(scene_ids.shape[0]) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        all_frames = np.concatenate([frames[scene] for scene in multiple])
+        all_scores = np.concatenate([scores[scene] for scene in multiple]).astype(np.float64)
+
+        padded = np.full((multiple.shape[0], np.max(lengths)), np.nan)
+        padded[scene_ids, positions] = all_scores
+        median = np.nanmedian(padded, axis=1)
+        mad = np.nanmedian(np.abs(padded - median[:, None]), axis=1)
+        threshold = self.metric_make_better(median, mad * 1.5)[scene_ids]
+        trim = np.logical_or(self.metric_better(threshold, all_scores), all_scores == threshold)
+
+        interpolated, interpolated_scene_ids = progression_boost.metric_interpolate_scenes(all_frames[trim], all_scores[trim], scene_ids[trim])
+        counts = np.bincount(interpolated_scene_ids)
+        mean = np.bincount(interpolated_scene_ids, weights=interpolated) / counts
+        deviation = (np.bincount(interpolated_scene_ids, weights=(interpolated - mean[interpolated_scene_ids]) ** 8) / counts) ** (1 / 8)
+        summaries[multiple] = self.metric_make_better(mean, -deviation)
+        return list(summaries)
+
 # If you want to use a different method than above to summarise the
 # data, implement your own method here.
 # 
@@ -1284,6 +1387,15 @@ class DefaultZone:
 # The number here should be positive.
     character_motion_crf_boost_max = 3.00
 
+# ROI maps are written as text because that's what `--roi-map-file`
+# reads. If you want to read them back in your own tools, enable the
+# option below to also save the ROI maps of all scenes into a single
+# compressed `roi-maps.npz` in the ROI maps directory. For each scene,
+# `frames-{scene}` holds the frame numbers and `offsets-{scene}` holds
+# the offsets for each Super Block as int8.
+# This option is not zoneable.
+    character_roi_map_npz = False
+
 # `--resume` information: If you changed any character boosting related
 # settings, just rerun the script and it will work. Unlike some other
 # options, you don't need to delete anything in the temp folder for the
@@ -1293,6 +1405,12 @@ class DefaultZone:
 # always use `fp16=True`. The resolution required for Character Boost
 # is low and accuracies of one or two pixels doesn't matter at the
 # slightest.
+# If you don't have a GPU, you can run the model on CPU with
+# `vsmlrt.Backend.ORT_CPU(num_streams=2)`. `num_streams` is how many
+# frames ONNX Runtime works on at the same time, and the CPU threads are
+# split between them. Character segmentation runs alongside probing, so
+# a few streams sharing the threads generally keeps the CPU busier than
+# a single stream.
     def character_get_backend(self):
         import vsmlrt
         return vsmlrt.Backend.TRT(fp16=True)
@@ -1302,7 +1420,7 @@ class DefaultZone:
         import vsmlrt
         model = Path(vsmlrt.models_path) / "anime-segmentation" / "isnet_is.onnx"
         if not model.exists():
-            raise FileNotFoundError(f"Could not find anime-segmentation model at \"{character_model}\". Acquire it from https://github.com/AmusementClub/vs-mlrt/releases/external-models")
+            raise FileNotFoundError(f"Could not find anime-segmentation model at \"{model}\". Acquire it from https://github.com/AmusementClub/vs-mlrt/releases/external-models")
         return model
 # Zoning information: `character_get_model` is not zoneable.
 # ---------------------------------------------------------------------
@@ -1399,132 +1517,6 @@ zones_spec["builtin_example"] = BuiltinExampleZone()
 # ---------------------------------------------------------------------
 
 
-for zone_key in zones_spec:
-    if " " in zone_key:
-        assert False, f"Key \"{zone_key}\" in `zones_spec` contains whitespace character ` `. The key for all zones must not contain whitespace character"
-
-if zones_file:
-    with zones_file.open("r") as zones_f:
-        zones_string = zones_f.read()
-if zones_string == "":
-    if zones_file:
-        print(f"\r\033[K\033[31mInput `--zones` is empty. Continuing with no zoning...\033[0m", end="\n", flush=True)
-    else:
-        print(f"\r\033[K\033[31mInput `--zones-string` is empty. Continuing with no zoning...\033[0m", end="\n", flush=True)
-
-if zones_string is not None:
-    zones_list = []
-    zone = []
-    zone_head = 0
-    for item in zones_string.split():
-        if zone_head in [0, 1]:
-            try:
-                item = int(item)
-            except ValueError:
-                raise ValueError(f"Invalid zones. Make sure your zones file is correctly written with `start_frame end_frame zones_key`. `zones_key` is not omittable and must not contain whitespaces")
-            zone.append(item)
-            zone_head += 1
-        elif zone_head == 2:
-            zone.append(item)
-            for i in range(len(zones_list)):
-                if zones_list[i][0] > zone[0]:
-                    zones_list.insert(i, zone)
-                    break
-            else:
-                zones_list.append(zone)
-            zone = []
-            zone_head = 0
-        else:
-            assert False, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-    if zone_head != 0:
-        raise ValueError(f"Invalid zones. There are too much or two few items in the provided zones")
-else:
-    zones_list = []
-
-zones = []
-frame_head = 0
-for item in zones_list:
-    if item[0] < frame_head:
-        raise ValueError(f"Repeating section [{item[0]}:{frame_head}] between input zones.")
-    if item[0] > zone_default.source_clip.num_frames - 1:
-        print(f"\r\033[KSkipping zones with out of bound start_frame {item[0]}...", end="\n", flush=True)
-
-    if item[1] <= -2:
-        raise ValueError(f"Invalid end_frame in the zones with value {item[1]}")
-    if item[1] > zone_default.source_clip.num_frames:
-        print(f"\r\033[K\033[31mOut of bound end_frame {item[1]} in one of the zones provided. Clamp end_frame for the zone to {zone_default.source_clip.num_frames}...\033[0m", end="\n", flush=True)
-        print(f"\r\033[KUse `-1` as end_frame to always end the zone at the last frame of the video.", end="\n", flush=True)
-        item[1] = zone_default.source_clip.num_frames
-    if item[1] == -1:
-        item[1] = zone_default.source_clip.num_frames
-        
-    if item[1] <= item[0]:
-        raise ValueError(f"Invalid zone with start_frame {item[0]} and end_frame {item[1]}.")
-
-    if item[2] not in zones_spec:
-        raise ValueError(f"Invalid zone with zone_key \"{item[2]}\". This zone_key \"{item[2]}\" does not exist in `zones_spec`.")
-
-    if item[0] != frame_head:
-        zones.append({"start_frame": frame_head,
-                      "end_frame": item[0],
-                      "zone": zones_spec["default"]})
-        frame_head = item[0]
-    
-    zones.append({"start_frame": item[0],
-                  "end_frame": item[1],
-                  "zone": zones_spec[item[2]]})
-    frame_head = item[1]
-
-if frame_head != zone_default.source_clip.num_frames:
-    zones.append({"start_frame": frame_head,
-                  "end_frame": zone_default.source_clip.num_frames,
-                  "zone": zones_spec["default"]})
-    
-for zone in zones:
-    if zone["zone"].scene_detection_method == "external":
-        if not input_scenes_file:
-            print(f"\r\033[K`scene_detection_method` is set to `\"external\"` in at least one of the active zones. `scene_detection_method` of `\"external\"` requires an external scene to be provided via `--input-scenes`. Missing the required `--input-scenes` parameter.", end="\n", flush=True)
-            raise SystemExit(2)
-        
-        break
-else:
-    if input_scenes_file:
-        print(f"\r\033[KCommandline parameter `--input-scenes` is provided, but there are no active zones that are using it.", end="\n", flush=True)
-
-for zone in zones:
-    if zone["zone"].metric_enable and zone["zone"].metric_method == "ffvship":
-        if probing_input_file != input_file:
-            if zone["zone"].metric_continue_filtered_with_ffvship:
-                print(f"\r\033[KYou've set a filtered source to be used for probe encodes via `--encode-input`, but in at least one active zone, `\"ffvship\"` is selected as `metric_method`. `metric_method` of `\"ffvship\"` does not support comparing filtered source against filtered probe encodes. By selecting `\"ffvship\"`, you might be comparing a filtered encode with unfiltered source, which will produce completly unusable metric scores.", end="\n", flush=True)
-            else:
-                print(f"\r\033[KYou've set a filtered source to be used for probe encodes via `--encode-input`, but in at least one active zone, `\"ffvship\"` is selected as `metric_method`. `metric_method` of `\"ffvship\"` does not support comparing filtered source against filtered probe encodes. By selecting `\"ffvship\"`, you're now comparing a filtered encode with unfiltered source, which will produce completly unusable metric scores. You should switch to a VapourSynth based methods, and then copy in your filtering chain for `metric_reference`.", end="\n", flush=True)
-                print(f"\r\033[KProgression Boost will quit now, but if you know what you're doing, you may let it continue by setting `metric_continue_filtered_with_ffvship` for the related zones.", end="\n", flush=True)
-                raise SystemExit(2)
-
-        break
-
-for zone in zones:
-    if zone["zone"].metric_enable and zone["zone"].probing_preset < 6:
-        print(f"\r\033[KProbing with slower `--preset` than `--preset 6` is not tested, and Progression Boost's `--preset` readjustment feature may not work properly. Using slower `--preset` than `--preset 7` does not yield any meaningful improvements, and you should use `--preset 7` instead.", end="\n", flush=True)
-
-        break
-
-for zone in zones:
-    if zone["zone"].character_enable:
-        character_backend = zone_default.character_get_backend()
-        character_model = zone_default.character_get_model()
-
-        break
-for zone in zones:
-    if zone["zone"].character_enable and zone["zone"].character_roi_boost_max:
-        if not roi_maps_dir:
-            print(f"\r\033[KCharacter Boost is enabled in at least one active zone, but commandline parameter `--output-roi-map` is not provided.", end="\n", flush=True)
-            raise SystemExit(2)
-        roi_maps_dir.mkdir(parents=True, exist_ok=True)
-
-        break
-
-
 # ---------------------------------------------------------------------
 # ---------------------------------------------------------------------
 # Permission is hereby granted, free of charge, to any person obtaining
@@ -1550,2827 +1542,30 @@ for zone in zones:
 # ---------------------------------------------------------------------
 
 
-print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / Progression Boost started", end="\n", flush=True)
-
-
-#  ███████╗ ██████╗███████╗███╗   ██╗███████╗    ██████╗ ███████╗████████╗███████╗ ██████╗████████╗██╗ ██████╗ ███╗   ██╗
-#  ██╔════╝██╔════╝██╔════╝████╗  ██║██╔════╝    ██╔══██╗██╔════╝╚══██╔══╝██╔════╝██╔════╝╚══██╔══╝██║██╔═══██╗████╗  ██║
-#  ███████╗██║     █████╗  ██╔██╗ ██║█████╗      ██║  ██║█████╗     ██║   █████╗  ██║        ██║   ██║██║   ██║██╔██╗ ██║
-#  ╚════██║██║     ██╔══╝  ██║╚██╗██║██╔══╝      ██║  ██║██╔══╝     ██║   ██╔══╝  ██║        ██║   ██║██║   ██║██║╚██╗██║
-#  ███████║╚██████╗███████╗██║ ╚████║███████╗    ██████╔╝███████╗   ██║   ███████╗╚██████╗   ██║   ██║╚██████╔╝██║ ╚████║
-#  ╚══════╝ ╚═════╝╚══════╝╚═╝  ╚═══╝╚══════╝    ╚═════╝ ╚══════╝   ╚═╝   ╚══════╝ ╚═════╝   ╚═╝   ╚═╝ ╚═════╝ ╚═╝  ╚═══╝
-#
-#  ANSI Shadow ANSI FIGlet font
-
-
-scene_detection_scenes_file = scene_detection_temp_dir.joinpath("scenes.json")
-scene_detection_x264_scenes_file = scene_detection_temp_dir.joinpath("x264.scenes.json")
-scene_detection_x264_temp_dir = scene_detection_temp_dir.joinpath("x264.tmp")
-scene_detection_x264_output_file = scene_detection_temp_dir.joinpath("x264.mkv")
-scene_detection_x264_stats_dir = scene_detection_temp_dir.joinpath("x264.logs")
-scene_detection_av1an_scenes_file = scene_detection_temp_dir.joinpath("av1an.scenes.json")
-scene_detection_diffs_file = scene_detection_temp_dir.joinpath("luma-diff.txt")
-scene_detection_average_file = scene_detection_temp_dir.joinpath("luma-average.txt")
-scene_detection_min_file = scene_detection_temp_dir.joinpath("luma-min.txt")
-scene_detection_max_file = scene_detection_temp_dir.joinpath("luma-max.txt")
-
-scene_detection_diffs_available = False
-if resume and scene_detection_diffs_file.exists() and \
-              scene_detection_average_file.exists() and \
-              scene_detection_min_file.exists() and \
-              scene_detection_max_file.exists():
-    scene_detection_diffs = np.loadtxt(scene_detection_diffs_file, dtype=np.float32)
-    scene_detection_average = np.loadtxt(scene_detection_average_file, dtype=np.float32)
-    scene_detection_min = np.loadtxt(scene_detection_min_file, dtype=np.float32)
-    scene_detection_max = np.loadtxt(scene_detection_max_file, dtype=np.float32)
-    scene_detection_diffs_available = True
-
-
-frame_rjust_digits = math.floor(np.log10(zone_default.source_clip.num_frames)) + 1
-frame_print = lambda frame: f"Frame {frame}"
-frame_rjust = lambda frame: str(frame).rjust(frame_rjust_digits)
-frame_scene_print = lambda start_frame, end_frame: f"Scene [{frame_rjust(start_frame)}:{frame_rjust(end_frame)}]"
-
-
-if not resume or not scene_detection_scenes_file.exists():
-    for zone in zones:
-        if zone["zone"].scene_detection_method == "x264_vapoursynth":
-            scene_detection_perform_x264 = True
-            break
-    else:
-        scene_detection_perform_x264 = False
-    for zone in zones:
-        if zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
-            scene_detection_perform_vapoursynth = True
-            break
-    else:
-        scene_detection_perform_vapoursynth = False
-    for zone in zones:
-        if zone["zone"].scene_detection_method == "av1an":
-            if not resume or not scene_detection_av1an_scenes_file.exists():
-                scene_detection_perform_av1an = True
-            else:
-                scene_detection_perform_av1an = False
-
-            scene_detection_has_av1an = True
-            break
-    else:
-        scene_detection_has_av1an = False
-        scene_detection_perform_av1an = False
-    for zone in zones:
-        if zone["zone"].scene_detection_method == "external":
-            scene_detection_has_external = True
-            break
-    else:
-        scene_detection_has_external = False
-
-
-    if scene_detection_perform_x264:
-        scene_detection_x264_output_file.unlink(missing_ok=True)
-        scene_detection_x264_stats_dir.mkdir(exist_ok=True)
-
-        scene_detection_x264_scenes = {}
-        scene_detection_x264_scenes["scenes"] = []
-        scene_detection_x264_total_frames = 0
-        scene_detection_x264_total_frames_print = 0
-        for zone_i, zone in enumerate(zones):
-            if zone["zone"].scene_detection_method == "x264_vapoursynth":
-                def scene_detection_append_x264_scene(name, start_frame, end_frame):
-                    scene_detection_x264_scenes["scenes"].append({
-                        "start_frame": start_frame,
-                        "end_frame": end_frame,
-                        "zone_overrides": {
-                            "encoder": "x264",
-                            "passes": 1,
-                            "video_params": [
-                                "--output-depth", "10",
-                                "--preset", "veryfast",
-                                "--qp", "80",
-                                "--keyint", f"{end_frame - start_frame + 240}",
-                                "--min-keyint", "1",
-                                "--scenecut", "40",
-                                "--rc-lookahead", "120",
-                                "--ref", "1",
-                                "--aq-mode", "0",
-                                "--no-8x8dct",
-                                "--partition", "none",
-                                "--no-weightb",
-                                "--weightp", "0",
-                                "--me", "dia",
-                                "--subme", "2", # Required for scene detection
-                                "--no-psy",
-                                "--trellis", "0",
-                                "--no-cabac",
-                                "--no-deblock",
-                                "--slow-firstpass",
-                                "--pass", "1",
-                                "--stats", f"{scene_detection_x264_stats_dir / f"{name}.log"}"
-                            ],
-                            "photon_noise": None,
-                            "photon_noise_height": None,
-                            "photon_noise_width": None,
-                            "chroma_noise": False,
-                            "extra_splits_len": zone["zone"].scene_detection_extra_split,
-                            "min_scene_len": zone["zone"].scene_detection_min_scene_len
-                        }
-                    })
-                scene_detection_x264_total_frames_print += zone["end_frame"] - zone["start_frame"]
-                if zone["end_frame"] - zone["start_frame"] < 120:
-                    scene_detection_x264_total_frames += zone["end_frame"] - zone["start_frame"]
-                    scene_detection_append_x264_scene(f"{zone_i}", zone["start_frame"], zone["end_frame"])
-                else:
-                    scene_detection_x264_total_frames += zone["end_frame"] - zone["start_frame"] + 4
-                    scene_detection_append_x264_scene(f"{zone_i}_left", zone["start_frame"], math.floor((zone["start_frame"] + zone["end_frame"]) / 2) + 4)
-                    scene_detection_append_x264_scene(f"{zone_i}_right", math.floor((zone["start_frame"] + zone["end_frame"]) / 2), zone["end_frame"])
-        scene_detection_x264_scenes["frames"] = scene_detection_x264_total_frames
-        scene_detection_x264_scenes["split_scenes"] = scene_detection_x264_scenes["scenes"]
-
-        with scene_detection_x264_scenes_file.open("w") as scene_detection_x264_scenes_f:
-            json.dump(scene_detection_x264_scenes, scene_detection_x264_scenes_f, cls=NumpyEncoder)
-
-        if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
-            scene_detection_x264_temp_dir_cache = scene_detection_x264_temp_dir / "split" / "cache"
-            scene_detection_x264_temp_dir_cache = scene_detection_x264_temp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
-            
-            if not scene_detection_x264_temp_dir_cache.exists():
-                scene_detection_x264_temp_dir_cache.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(zone_default.source_clip_cache, scene_detection_x264_temp_dir_cache)
-
-        command = [
-            "av1an",
-            "-y"
-        ]
-        if verbose < 2:
-            command += ["--quiet"]
-        if verbose >= 3:
-            command += ["--verbose"]
-        command += [
-            "--temp", scene_detection_x264_temp_dir,
-            "--keep"
-        ]
-        if resume:
-            command += ["--resume"]
-        command += [
-            "-i", scene_detection_input_file
-        ]
-        if scene_detection_vspipe_args is not None:
-            command += ["--vspipe-args"] + scene_detection_vspipe_args
-        command += [
-            "-o", scene_detection_x264_output_file,
-            "--scenes", scene_detection_x264_scenes_file,
-            "--chunk-method", zone_default.source_provider_av1an,
-            "--encoder", "x264",
-            "--pix-format", "yuv420p10le",
-            "--workers", "2",
-            "--force", "--video-params", f"[K[0m[1;3m> Progression Boost [0m[3mx264-based-scene-detection[0m[1;3m <[0m",
-            "--audio-params", "-an",
-            "--concat", "mkvmerge"
-        ]
-        scene_detection_x264_process = subprocess.Popen(command, text=True)
-
-
-    if scene_detection_perform_av1an:
-        scene_detection_av1an_scenes_file.unlink(missing_ok=True)
-
-        if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
-            scene_detection_av1an_temp_dir_cache = scene_detection_temp_dir / "av1an.tmp" / "split" / "cache"
-            scene_detection_av1an_temp_dir_cache = scene_detection_av1an_temp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
-            
-            if not scene_detection_av1an_temp_dir_cache.exists():
-                scene_detection_av1an_temp_dir_cache.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(zone_default.source_clip_cache, scene_detection_av1an_temp_dir_cache)
-
-        scene_detection_av1an_force_keyframes = []
-        for zone in zones:
-            scene_detection_av1an_force_keyframes.append(str(zone["start_frame"]))
-        command = [
-            "av1an",
-            "--temp", scene_detection_temp_dir.joinpath("av1an.tmp"),
-            "-i", scene_detection_input_file
-        ]
-        if scene_detection_vspipe_args is not None:
-            command += ["--vspipe-args"] + scene_detection_vspipe_args
-        command += [
-            "--scenes", scene_detection_av1an_scenes_file,
-            *zone_default.scene_detection_av1an_parameters(),
-            "--force-keyframes", ",".join(scene_detection_av1an_force_keyframes)
-        ]
-        scene_detection_process = subprocess.Popen(command, text=True)
-
-        
-    if not scene_detection_diffs_available:
-        if not (scene_detection_perform_vapoursynth and not scene_detection_has_av1an and not scene_detection_has_external):
-            scene_detection_luma_clip = zone_default.source_clip
-            scene_detection_luma_clip = scene_detection_luma_clip.std.PlaneStats(scene_detection_luma_clip[0] + scene_detection_luma_clip, plane=0, prop="Luma")
-            
-            start = time.time() - 0.000001
-            scene_detection_diffs = np.empty((scene_detection_luma_clip.num_frames,), dtype=np.float32)
-            scene_detection_average = np.empty((scene_detection_luma_clip.num_frames,), dtype=np.float32)
-            scene_detection_min = np.empty((scene_detection_luma_clip.num_frames,), dtype=np.float32)
-            scene_detection_max = np.empty((scene_detection_luma_clip.num_frames,), dtype=np.float32)
-            for current_frame, frame in enumerate(scene_detection_luma_clip.frames(backlog=48)):
-                print(f"\r\033[K{frame_print(current_frame)} / Measuring frame luminance / {current_frame / (time.time() - start):.2f} fps", end="\r", flush=True)
-                scene_detection_diffs[current_frame] = frame.props["LumaDiff"]
-                scene_detection_average[current_frame] = frame.props["LumaAverage"]
-                scene_detection_min[current_frame] = frame.props["LumaMin"]
-                scene_detection_max[current_frame] = frame.props["LumaMax"]
-            print(f"\r\033[K{frame_print(current_frame + 1)} / Frame luminance measurement complete / {(current_frame + 1) / (time.time() - start):.2f} fps", end="\n", flush=True)
-            
-            np.savetxt(scene_detection_diffs_file, scene_detection_diffs, fmt="%.9f")
-            np.savetxt(scene_detection_average_file, scene_detection_average, fmt="%.9f")
-            np.savetxt(scene_detection_min_file, scene_detection_min, fmt="%.9f")
-            np.savetxt(scene_detection_max_file, scene_detection_max, fmt="%.9f")
-            scene_detection_diffs_available = True
-
-    
-    if scene_detection_perform_vapoursynth:
-        if not scene_detection_diffs_available:
-            scene_detection_diffs = np.empty((zone_default.source_clip.num_frames,), dtype=np.float32)
-            scene_detection_average = np.empty((zone_default.source_clip.num_frames,), dtype=np.float32)
-            scene_detection_min = np.empty((zone_default.source_clip.num_frames,), dtype=np.float32)
-            scene_detection_max = np.empty((zone_default.source_clip.num_frames,), dtype=np.float32)
-
-        scene_detection_clip_base = zone_default.source_clip
-        scene_detection_bits = scene_detection_clip_base.format.bits_per_sample
-
-        if not scene_detection_diffs_available:
-            scene_detection_clip_base = scene_detection_clip_base.std.PlaneStats(scene_detection_clip_base[0] + scene_detection_clip_base, plane=0, prop="Luma")
-        
-        target_width = np.round(np.sqrt(1280 * 720 / scene_detection_clip_base.width / scene_detection_clip_base.height) * scene_detection_clip_base.width / 40) * 40
-        if target_width < scene_detection_clip_base.width * 0.9:
-            target_height = np.ceil(target_width / scene_detection_clip_base.width * scene_detection_clip_base.height / 2) * 2
-            src_height = target_height / target_width * scene_detection_clip_base.width
-            src_top = (scene_detection_clip_base.height - src_height) / 2
-            scene_detection_clip_base = scene_detection_clip_base.resize.Point(width=target_width, height=target_height, src_top=src_top, src_height=src_height,
-                                                                               format=vs.YUV420P8, dither_type="none")
-
-        zones_diffs = {}
-        zones_vapoursynth_scenecut = {}
-        zones_luma_scenecut = {}
-        for zone_i, zone in enumerate(zones):
-            assert zone["zone"].scene_detection_method in ["av1an", "x264_vapoursynth", "vapoursynth", "external"], "Invalid `scene_detection_method`. Please check your config inside `Progression-Boost.py`."
-
-            if zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
-                assert zone["zone"].scene_detection_vapoursynth_method in ["wwxd", "wwxd_scxvid"], "Invalid `scene_detection_vapoursynth_method`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_vapoursynth_range in ["limited", "full"], "Invalid `scene_detection_vapoursynth_range`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_extra_split >= zone["zone"].scene_detection_min_scene_len * 2, "`scene_detection_method` `vapoursynth` does not support `scene_detection_extra_split` to be smaller than 2 times `scene_detection_min_scene_len`."
-
-                scene_detection_clip = scene_detection_clip_base[zone["start_frame"]:zone["end_frame"]]
-                scene_detection_clip = scene_detection_clip.wwxd.WWXD()
-                if zone["zone"].scene_detection_vapoursynth_method == "wwxd_scxvid":
-                    scene_detection_clip = scene_detection_clip.scxvid.Scxvid()
-
-                diffs = np.empty((scene_detection_clip.num_frames,), dtype=float)
-                vapoursynth_scenecut = np.zeros((scene_detection_clip.num_frames,), dtype=float)
-                luma_scenecut = np.zeros((scene_detection_clip.num_frames,), dtype=bool)
-                luma_scenecut_prev = True
-
-                start = time.time() - 0.000001
-                for offset_frame, frame in enumerate(scene_detection_clip.frames(backlog=48)):
-                    current_frame = zone["start_frame"] + offset_frame
-                    print(f"\r\033[K{frame_print(current_frame)} / Detecting scenes / {offset_frame / (time.time() - start):.2f} fps", end="", flush=True)
-
-                    if not scene_detection_diffs_available:
-                        scene_detection_diffs[current_frame] = frame.props["LumaDiff"]
-                        scene_detection_average[current_frame] = frame.props["LumaAverage"]
-                        scene_detection_min[current_frame] = frame.props["LumaMin"]
-                        scene_detection_max[current_frame] = frame.props["LumaMax"]
-                    diffs[offset_frame] = scene_detection_diffs[current_frame]
-
-                    if zone["zone"].scene_detection_vapoursynth_method == "wwxd":
-                        vapoursynth_scenecut[offset_frame] = frame.props["Scenechange"] == 1
-                    elif zone["zone"].scene_detection_vapoursynth_method == "wwxd_scxvid":
-                        vapoursynth_scenecut[offset_frame] = (frame.props["Scenechange"] == 1) + (frame.props["_SceneChangePrev"] == 1) / 2
-
-                    if zone["zone"].scene_detection_vapoursynth_range == "limited":
-                        luma_scenecut_current = scene_detection_min[current_frame] > 231.125 * 2 ** (scene_detection_bits - 8) or \
-                                                scene_detection_max[current_frame] < 19.875 * 2 ** (scene_detection_bits - 8)
-                    elif zone["zone"].scene_detection_vapoursynth_range == "full":
-                        luma_scenecut_current = scene_detection_min[current_frame] > 251.125 * 2 ** (scene_detection_bits - 8) or \
-                                                scene_detection_max[current_frame] < 3.875 * 2 ** (scene_detection_bits - 8)
-                    if luma_scenecut_current or luma_scenecut_prev:
-                        luma_scenecut[offset_frame] = True
-                    luma_scenecut_prev = luma_scenecut_current
-
-                zones_diffs[zone_i] = diffs
-                zones_vapoursynth_scenecut[zone_i] = vapoursynth_scenecut
-                zones_luma_scenecut[zone_i] = luma_scenecut
-
-        print(f"\r\033[K{frame_print(current_frame + 1)} / VapourSynth based scene detection complete", end="\n", flush=True)
-
-    if scene_detection_has_external:
-        with input_scenes_file.open("r") as input_scenes_f:
-            try:
-                scene_detection_external_scenes = json.load(input_scenes_f)
-            except:
-                raise ValueError("Invalid scenes file from `--input-scenes`")
-        assert "scenes" in scene_detection_external_scenes, "Invalid scenes file from `--input-scenes`"
-
-
-    if scene_detection_perform_av1an:
-        scene_detection_process.wait()
-        if scene_detection_process.returncode != 0:
-            raise subprocess.CalledProcessError
-
-        assert scene_detection_av1an_scenes_file.exists(), "Unexpected result from av1an"
-
-    if scene_detection_has_av1an:
-        with scene_detection_av1an_scenes_file.open("r") as av1an_scenes_f:
-            scene_detection_av1an_scenes = json.load(av1an_scenes_f)
-
-        assert scene_detection_av1an_scenes["frames"] == zone_default.source_clip.num_frames, "Unexpected result from av1an"
-        if "split_scenes" in scene_detection_av1an_scenes:
-            scene_detection_av1an_scenes["scenes"] = scene_detection_av1an_scenes["split_scenes"]
-        assert "scenes" in scene_detection_av1an_scenes, "Unexpected result from av1an"
-
-
-    if scene_detection_perform_x264:
-        if scene_detection_x264_process.poll() is None:
-            print(f"\r\033[K{frame_print(0)} / Performing x264 based scene detection", end="", flush=True)
-        scene_detection_x264_process.wait()
-        print(f"\r\033[K{frame_print(scene_detection_x264_total_frames_print)} / x264 based scene detection finished", end="\n", flush=True)
-
-        zones_x264_scenecut = {}
-        scene_detection_match_x264_I = re.compile(r"^in:(\d+) out:\d+ type:(\w)")
-        for zone_i, zone in enumerate(zones):
-            x264_scenecut = np.zeros((zone["end_frame"] - zone["start_frame"],), dtype=float)
-            def scene_detection_write_x264_scenecut(name, start_frame, end_frame, skip_starting_frames=False):
-                assert (scene_detection_x264_stats_dir / f"{name}.log").exists(), "Unexpected result from av1an or x264"
-                with (scene_detection_x264_stats_dir / f"{name}.log").open("r") as x264_stats_f:
-                    x264_stats = x264_stats_f.read()
-
-                for line in x264_stats.splitlines():
-                    if match := scene_detection_match_x264_I.match(line):
-                        try:
-                            offset_frame = int(match.group(1))
-                        except ValueError:
-                            raise ValueError("Unexpected result from av1an or x264")
-                        assert offset_frame + start_frame < end_frame, "Unexpected result from av1an or x264"
-
-                        if offset_frame == 0 and skip_starting_frames:
-                            continue
-
-                        if match.group(2) == "I":
-                            x264_scenecut[offset_frame + start_frame] = 1
-
-            if zone["end_frame"] - zone["start_frame"] < 120:
-                scene_detection_write_x264_scenecut(f"{zone_i}", 0, zone["end_frame"] - zone["start_frame"])
-            else:
-                scene_detection_write_x264_scenecut(f"{zone_i}_left", 0, math.floor((zone["end_frame"] - zone["start_frame"]) / 2) + 4)
-                scene_detection_write_x264_scenecut(f"{zone_i}_right", math.floor((zone["end_frame"] - zone["start_frame"]) / 2), zone["end_frame"] - zone["start_frame"],
-                                                                       skip_starting_frames=True)
-
-            zones_x264_scenecut[zone_i] = x264_scenecut
-
-
-    scenes = {}
-    scenes["frames"] = zone_default.source_clip.num_frames
-    scenes["scenes"] = []
-    for zone_i, zone in enumerate(zones):
-        if zone["zone"].scene_detection_method == "av1an":
-            av1an_scenes_start_copying = False
-            for av1an_scene in scene_detection_av1an_scenes["scenes"]:
-                if av1an_scene["start_frame"] == zone["start_frame"]:
-                    av1an_scenes_start_copying = True
-                assert (av1an_scene["start_frame"] >= zone["start_frame"]) == av1an_scenes_start_copying, "Unexpected result from av1an"
-                if av1an_scene["start_frame"] == zone["end_frame"]:
-                    break
-                assert av1an_scene["start_frame"] < zone["end_frame"], "Unexpected result from av1an"
-
-                if av1an_scenes_start_copying:
-                    print(f"\r\033[K{frame_scene_print(av1an_scene["start_frame"], av1an_scene["end_frame"])} / Creating scenes", end="", flush=True)
-                    scenes["scenes"].append(av1an_scene)
-
-        elif zone["zone"].scene_detection_method == "external":
-            external_scenes_start_copying = False
-            last_end_frame = None
-            for external_scene in scene_detection_external_scenes["scenes"]:
-                assert "start_frame" in external_scene and "end_frame" in external_scene, "Invalid scenes file from `--input-scenes`"
-
-                if external_scene["start_frame"] >= zone["start_frame"]:
-                    if not external_scenes_start_copying and external_scene["start_frame"] > zone["start_frame"]:
-                        if not zone["zone"].metric_enable and external_scene["end_frame"] - zone["start_frame"] < 5:
-                            print(f"\r\033[K[{frame_scene_print(zone["start_frame"], external_scene["end_frame"])} / A scene from `--input-scenes` is cut off by zone boundary into a scene shorter than 5 frames. As Progression Boost module is disabled for the zone, this scene might get poorly encoded.", end="\n", flush=True)
-                
-                        scenes["scenes"].append({"start_frame": zone["start_frame"],
-                                                 "end_frame": external_scene["start_frame"],
-                                                 "zone_overrides": None})
-                                                 
-                    external_scenes_start_copying = True
-
-                if external_scenes_start_copying:
-                    if last_end_frame is not None:
-                        assert last_end_frame == external_scene["start_frame"], "Invalid scenes file from `--input-scenes`. Scenes file not continuous."
-                    last_end_frame = external_scene["end_frame"]
-                    assert external_scene["end_frame"] > external_scene["start_frame"], "Invalid scenes file from `--input-scenes`"
-
-                    if external_scene["end_frame"] > zone["end_frame"]:
-                        if not zone["zone"].metric_enable and zone["end_frame"] - external_scene["start_frame"] < 5:
-                            print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], zone["end_frame"])} / A scene from `--input-scenes` is cut off by zone boundary into a scene shorter than 5 frames. As Progression Boost module is disabled for the zone, this scene might get poorly encoded.", end="\n", flush=True)
-                        print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], zone["end_frame"])} / Creating scenes", end="", flush=True)
-                        scenes["scenes"].append({"start_frame": external_scene["start_frame"],
-                                                 "end_frame": zone["end_frame"],
-                                                 "zone_overrides": None})
-                    else:
-                        print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], external_scene["end_frame"])} / Creating scenes", end="", flush=True)
-                        scenes["scenes"].append({"start_frame": external_scene["start_frame"],
-                                                 "end_frame": external_scene["end_frame"],
-                                                 "zone_overrides": None})
-
-                if external_scene["end_frame"] >= zone["end_frame"]:
-                    break
-            else:
-                raise ValueError("Invalid scenes file from `--input-scenes`. There are no scenes in the scenes file that reach the end of the zone")
-
-        elif zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
-            diffs = zones_diffs[zone_i]
-            luma_scenecut = zones_luma_scenecut[zone_i]
-            vapoursynth_scenecut = zones_vapoursynth_scenecut[zone_i]
-            if zone["zone"].scene_detection_method == "x264_vapoursynth":
-                x264_scenecut = zones_x264_scenecut[zone_i]
-
-            diffs_half = diffs / 2
-            diffs_0012 = diffs >= 0.0012
-            diffs_0042 = diffs >= 0.0042
-            diffs[1:] -= diffs[:-1]
-            diffs[diffs < diffs_half] = diffs_half[diffs < diffs_half]
-            diffs[np.logical_and(diffs_0012, diffs < 0.0012)] = 0.0012
-            diffs[np.logical_and(diffs_0042, diffs < 0.0042)] = 0.0042
-
-            diffs[luma_scenecut] *= 1.70
-            diffs[luma_scenecut] += 1.24
-
-            if zone["zone"].scene_detection_method == "x264_vapoursynth":
-                vapoursynth_scenecut *= 0.88
-                x264_scenecut *= 0.94
-                vapoursynth_scenecut += x264_scenecut
-                vapoursynth_scenecut[vapoursynth_scenecut > 1.0] = 1.0
-            diffs[~luma_scenecut] += vapoursynth_scenecut[~luma_scenecut]
-            
-            diffs_sort = np.argsort(diffs, stable=True)[::-1]
-
-            def scene_detection_split_scene(start_frame, end_frame):
-                assert zone["zone"].scene_detection_0042_still_scene_extra_split >= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_0042_still_scene_extra_split`. This value must be bigger than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_0012_still_scene_extra_split >= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_0012_still_scene_extra_split`. This value must be bigger than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_min_scene_len * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_min_scene_len`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_18_target_split * 2 <= zone["zone"].scene_detection_12_target_split, "Invalid `scene_detection_18_target_split`. 2 times this value must be smaller than or equal to `scene_detection_12_target_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_18_target_split * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_18_target_split`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_12_target_split * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_12_target_split`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-                assert zone["zone"].scene_detection_27_extra_target_split <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_27_extra_target_split`. This value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
-
-
-
-                print(f"\r\033[K{frame_scene_print(start_frame + zone["start_frame"], end_frame + zone["start_frame"])} / Creating scenes", end="", flush=True)
-
-
-
-                if end_frame - start_frame < 2 * zone["zone"].scene_detection_min_scene_len:
-                    if verbose >= 3:
-                        print(f" / branch complete", end="\n", flush=True)
-                    return [start_frame]
-
-
-
-                if end_frame - start_frame >= 2 * zone["zone"].scene_detection_extra_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.27:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_27_extra_target_split and end_frame - current_frame >= zone["zone"].scene_detection_27_extra_target_split and \
-                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.40):
-                            if verbose >= 3:
-                                print(f" / split / extra_split 1.27 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                if end_frame - start_frame <= 2 * zone["zone"].scene_detection_18_target_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 doubleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 doubleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 doubleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 doubleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 doubleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.18 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.18 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.18 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.18 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.18 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                if end_frame - start_frame <= 2 * zone["zone"].scene_detection_18_target_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
-                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.18:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len:
-                            if verbose >= 3:
-                                print(f" / split / 1.18 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-                    if verbose >= 3:
-                        print(f" / branch complete", end="\n", flush=True)
-                    return [start_frame]
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.18 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.18 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.18 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.18 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.18:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.18 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                if end_frame - start_frame <= 2 * zone["zone"].scene_detection_12_target_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
-                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 doubleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
-                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 doubleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
-                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 doubleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
-                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 doubleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
-                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 doubleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.12 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.12 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.12 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.12 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / 1.12 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                if end_frame - start_frame <= zone["zone"].scene_detection_extra_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-                                   
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
-                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-    
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.12:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split:
-                            if verbose >= 3:
-                                print(f" / split / 1.12 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-                    if verbose >= 3:
-                        print(f" / branch complete", end="\n", flush=True)
-                    return [start_frame]
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-    
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.12:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.12 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-                if end_frame - start_frame >= 2 * zone["zone"].scene_detection_extra_split:
-                    for current_frame in diffs_sort:
-                        if diffs[current_frame] < 1.15:
-                            break
-                        if current_frame - start_frame >= zone["zone"].scene_detection_extra_split and end_frame - current_frame >= zone["zone"].scene_detection_extra_split and \
-                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                            if verbose >= 3:
-                                print(f" / split / extra_split 1.15 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                            return scene_detection_split_scene(start_frame, current_frame) + \
-                                   scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                section_diffs = diffs[start_frame + 1:end_frame]
-                section_diffs_0012 = section_diffs >= 0.0012
-                section_diffs_0042 = section_diffs >= 0.0042
-
-
-                if np.all(~section_diffs_0012):
-                    if end_frame - start_frame <= zone["zone"].scene_detection_0012_still_scene_extra_split:
-                        if verbose >= 3:
-                            print(f" / branch complete / 0.0012 mode", end="\n", flush=True)
-                        return [start_frame]
-                    else:
-                        sections = math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_0012_still_scene_extra_split)
-                        section_frames = (end_frame - start_frame) / sections
-                        section_frames = np.min([math.ceil((section_frames - 1) / 16) * 16 + 1, zone["zone"].scene_detection_0012_still_scene_extra_split])
-                        returning_frames = []
-                        for frame in range(start_frame, end_frame, section_frames):
-                            returning_frames.append(frame)
-                        if verbose >= 3:
-                            print(f" / split / 0.0012 divide mode / frame {" ".join([str(item) for item in returning_frames[1:]])}", end="\n", flush=True)
-                        return returning_frames
-
-                if np.all(~section_diffs_0042):
-                    if end_frame - start_frame <= zone["zone"].scene_detection_0042_still_scene_extra_split:
-                        if verbose >= 3:
-                            print(f" / branch complete / 0.0042 mode", end="\n", flush=True)
-                        return [start_frame]
-                    else:
-                        sections = math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_0042_still_scene_extra_split)
-                        section_frames = (end_frame - start_frame) / sections
-                        section_frames = np.min([math.ceil((section_frames - 1) / 16) * 16 + 1, zone["zone"].scene_detection_0042_still_scene_extra_split])
-                        returning_frames = []
-                        for frame in range(start_frame, end_frame, section_frames):
-                            returning_frames.append(frame)
-                        if verbose >= 3:
-                            print(f" / split / 0.0042 divide mode / frame {" ".join([str(item) for item in returning_frames[1:]])}", end="\n", flush=True)
-                        return returning_frames
-
-
-                offset_frame = np.argmax(section_diffs_0012) + 1
-                reserve_offset_frame = np.argmax(section_diffs_0012[::-1]) + 1
-
-                split_frame = np.max([end_frame - reserve_offset_frame,
-                                      end_frame - zone["zone"].scene_detection_0012_still_scene_extra_split,
-                                      start_frame + zone["zone"].scene_detection_min_scene_len])
-                if end_frame - split_frame > zone["zone"].scene_detection_12_target_split and \
-                   math.ceil((split_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                   1 <= \
-                   math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                    if verbose >= 3:
-                        print(f" / split / 0.0012 rear mode / frame {split_frame}", end="\n", flush=True)
-                    return scene_detection_split_scene(start_frame, split_frame) + \
-                           [split_frame]
-
-                split_frame = np.min([start_frame + offset_frame,
-                                      start_frame + zone["zone"].scene_detection_0012_still_scene_extra_split,
-                                      end_frame - zone["zone"].scene_detection_min_scene_len])
-                if split_frame - start_frame > zone["zone"].scene_detection_12_target_split and \
-                   1 + \
-                   math.ceil((end_frame - split_frame) / zone["zone"].scene_detection_extra_split) <= \
-                   math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                    if verbose >= 3:
-                        print(f" / split / 0.0012 front mode / frame {split_frame}", end="\n", flush=True)
-                    return [start_frame] + \
-                           scene_detection_split_scene(split_frame, end_frame)
-
-
-                offset_frame = np.argmax(section_diffs_0042) + 1
-                reserve_offset_frame = np.argmax(section_diffs_0042[::-1]) + 1
-
-                split_frame = np.max([end_frame - reserve_offset_frame,
-                                      end_frame - zone["zone"].scene_detection_0042_still_scene_extra_split,
-                                      start_frame + zone["zone"].scene_detection_min_scene_len])
-                if end_frame - split_frame > zone["zone"].scene_detection_12_target_split and \
-                   math.ceil((split_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                   1 <= \
-                   math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                    if verbose >= 3:
-                        print(f" / split / 0.0042 rear mode / frame {split_frame}", end="\n", flush=True)
-                    return scene_detection_split_scene(start_frame, split_frame) + \
-                           [split_frame]
-
-                split_frame = np.min([start_frame + offset_frame,
-                                      start_frame + zone["zone"].scene_detection_0042_still_scene_extra_split,
-                                      end_frame - zone["zone"].scene_detection_min_scene_len])
-                if split_frame - start_frame > zone["zone"].scene_detection_12_target_split and \
-                   1 + \
-                   math.ceil((end_frame - split_frame) / zone["zone"].scene_detection_extra_split) <= \
-                   math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                    if verbose >= 3:
-                        print(f" / split / 0.0042 front mode / frame {split_frame}", end="\n", flush=True)
-                    return [start_frame] + \
-                           scene_detection_split_scene(split_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-    
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.08:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.08 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 1.02:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 1.02 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
-                        (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-                               
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.96:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.96 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-                                
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.84:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
-                       (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
-                        end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / extra_split 0.84 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                                scene_detection_split_scene(current_frame, end_frame)
-
-
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.09:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.09:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.09:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.09:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if diffs[current_frame] < 0.09:
-                        break
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-                for current_frame in diffs_sort:
-                    if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
-                       math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
-                       math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
-                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
-                        if verbose >= 3:
-                            print(f" / split / low scenechange / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
-                        return scene_detection_split_scene(start_frame, current_frame) + \
-                               scene_detection_split_scene(current_frame, end_frame)
-
-
-                assert False, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-
-            start_frames = scene_detection_split_scene(0, len(diffs))
-
-            start_frames += [zone["end_frame"] - zone["start_frame"]]
-            for i in range(len(start_frames) - 1):
-                scenes["scenes"].append({"start_frame": start_frames[i] + zone["start_frame"],
-                                         "end_frame": start_frames[i + 1] + zone["start_frame"],
-                                         "zone_overrides": None})
-
-    print(f"\r\033[K{frame_scene_print(scenes["scenes"][-1]["start_frame"], scenes["scenes"][-1]["end_frame"])} / Scene creation complete", end="\n", flush=True)
-
-    with scene_detection_scenes_file.open("w") as scenes_f:
-        json.dump(scenes, scenes_f, cls=NumpyEncoder)
-
-    if not scene_detection_diffs_available:
-        np.savetxt(scene_detection_diffs_file, scene_detection_diffs, fmt="%.9f")
-        np.savetxt(scene_detection_average_file, scene_detection_average, fmt="%.9f")
-        np.savetxt(scene_detection_min_file, scene_detection_min, fmt="%.9f")
-        np.savetxt(scene_detection_max_file, scene_detection_max, fmt="%.9f")
-        scene_detection_diffs_available = True
-
-    if scene_detection_perform_vapoursynth:
-        print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / Scene detection finished", end="\n", flush=True)
-
-    for dir_ in [progression_boost_temp_dir, character_boost_temp_dir]:
-        shutil.rmtree(dir_, ignore_errors=True)
-        dir_.mkdir(parents=True, exist_ok=True)
-else:
-    with scene_detection_scenes_file.open("r") as scenes_f:
-        scenes = json.load(scenes_f)
-
-
-for zone in zones:
-    if zone["zone"].metric_enable:
-        metric_has_metric = True
-        break
-else:
-    metric_has_metric = False
-for zone in zones:
-    if zone["zone"].character_enable:
-        character_has_character = True
-        break
-else:
-    character_has_character = False
-
-
-zone_scenes = copy.deepcopy(scenes)
-zone_head = 0
-for zone_scene in zone_scenes["scenes"]:
-    if resume:
-        assert zone_scene["start_frame"] <= zones[zone_head]["end_frame"], "Scene detection scenes misaligned with zones. Try run Progression Boost fresh without `--resume`. If this issue persists, Please report this to the repository including this entire error message."
-    else:
-        assert zone_scene["start_frame"] <= zones[zone_head]["end_frame"], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-    if zone_scene["start_frame"] == zones[zone_head]["end_frame"]:
-        zone_head += 1
-
-    zone_scene["zone"] = zones[zone_head]["zone"]
-
-    zone_scene["zone_overrides"] = {
-        "encoder": "svt_av1",
-        "passes": 1,
-        "extra_splits_len": zone_scene["zone"].scene_detection_extra_split,
-        "min_scene_len": zone_scene["zone"].scene_detection_min_scene_len
-    }
-
-
-#  ██████╗ ██████╗  ██████╗ ██████╗ ██╗███╗   ██╗ ██████╗       ███████╗██╗██████╗ ███████╗████████╗
-#  ██╔══██╗██╔══██╗██╔═══██╗██╔══██╗██║████╗  ██║██╔════╝       ██╔════╝██║██╔══██╗██╔════╝╚══██╔══╝
-#  ██████╔╝██████╔╝██║   ██║██████╔╝██║██╔██╗ ██║██║  ███╗█████╗█████╗  ██║██████╔╝███████╗   ██║   
-#  ██╔═══╝ ██╔══██╗██║   ██║██╔══██╗██║██║╚██╗██║██║   ██║╚════╝██╔══╝  ██║██╔══██╗╚════██║   ██║   
-#  ██║     ██║  ██║╚██████╔╝██████╔╝██║██║ ╚████║╚██████╔╝      ██║     ██║██║  ██║███████║   ██║   
-#  ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝       ╚═╝     ╚═╝╚═╝  ╚═╝╚══════╝   ╚═╝   
-
-
-scene_rjust_digits = math.floor(np.log10(len(scenes["scenes"]))) + 1
-scene_rjust = lambda scene: str(scene).rjust(scene_rjust_digits, "0")
-scene_frame_print = lambda scene: f"Scene {scene_rjust(scene)} Frame [{frame_rjust(scenes["scenes"][scene]["start_frame"])}:{frame_rjust(scenes["scenes"][scene]["end_frame"])}]"
-
-
-dc = np.array([
-    4,    9,    10,   13,   15,   17,   20,   22,   25,   28,   31,   34,   37,   40,   43,   47,   50,   53,   57,
-    60,   64,   68,   71,   75,   78,   82,   86,   90,   93,   97,   101,  105,  109,  113,  116,  120,  124,  128,
-    132,  136,  140,  143,  147,  151,  155,  159,  163,  166,  170,  174,  178,  182,  185,  189,  193,  197,  200,
-    204,  208,  212,  215,  219,  223,  226,  230,  233,  237,  241,  244,  248,  251,  255,  259,  262,  266,  269,
-    273,  276,  280,  283,  287,  290,  293,  297,  300,  304,  307,  310,  314,  317,  321,  324,  327,  331,  334,
-    337,  343,  350,  356,  362,  369,  375,  381,  387,  394,  400,  406,  412,  418,  424,  430,  436,  442,  448,
-    454,  460,  466,  472,  478,  484,  490,  499,  507,  516,  525,  533,  542,  550,  559,  567,  576,  584,  592,
-    601,  609,  617,  625,  634,  644,  655,  666,  676,  687,  698,  708,  718,  729,  739,  749,  759,  770,  782,
-    795,  807,  819,  831,  844,  856,  868,  880,  891,  906,  920,  933,  947,  961,  975,  988,  1001, 1015, 1030,
-    1045, 1061, 1076, 1090, 1105, 1120, 1137, 1153, 1170, 1186, 1202, 1218, 1236, 1253, 1271, 1288, 1306, 1323, 1342,
-    1361, 1379, 1398, 1416, 1436, 1456, 1476, 1496, 1516, 1537, 1559, 1580, 1601, 1624, 1647, 1670, 1692, 1717, 1741,
-    1766, 1791, 1817, 1844, 1871, 1900, 1929, 1958, 1990, 2021, 2054, 2088, 2123, 2159, 2197, 2236, 2276, 2319, 2363,
-    2410, 2458, 2508, 2561, 2616, 2675, 2737, 2802, 2871, 2944, 3020, 3102, 3188, 3280, 3375, 3478, 3586, 3702, 3823,
-    3953, 4089, 4236, 4394, 4559, 4737, 4929, 5130, 5347
-])
-dc_X = np.arange(dc.shape[0])
-
-
-if metric_has_metric:
-    def probing_perform_probing(probing_tmp_dir, probing_scenes_file, probing_output_file, probing_output_file_cache):
-        probing_output_file.unlink(missing_ok=True)
-        if probing_output_file_cache is not None:
-            probing_output_file_cache.unlink(missing_ok=True)
-            
-        if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
-            probing_tmp_dir_cache = probing_tmp_dir / "split" / "cache"
-            probing_tmp_dir_cache = probing_tmp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
-            
-            if not probing_tmp_dir_cache.exists():
-                probing_tmp_dir_cache.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(zone_default.source_clip_cache, probing_tmp_dir_cache)
-
-        command = [
-            "av1an",
-            "-y"
-        ]
-        if verbose < 2:
-            command += ["--quiet"]
-        if verbose >= 3:
-            command += ["--verbose"]
-        command += [
-            "--temp", probing_tmp_dir,
-            "--keep"
-        ]
-        if resume:
-            command += ["--resume"]
-        command += [
-            "-i", probing_input_file
-        ]
-        if probing_input_vspipe_args is not None:
-            command += ["--vspipe-args"] + probing_input_vspipe_args
-        command += [
-            "-o", probing_output_file,
-            "--scenes", probing_scenes_file,
-            *zone_default.probing_av1an_parameters(f"[K[0m[1;3m> Progression Boost [0m[3m{probing_output_file.stem}[0m[1;3m <[0m")
-        ]
-        return subprocess.Popen(command, text=True)
-    
-    probing_first_tmp_dir = progression_boost_temp_dir / f"probe-encode-first.tmp"
-    probing_first_done_file = probing_first_tmp_dir / "done.json"
-    probing_first_scenes_file = progression_boost_temp_dir / f"probe-encode-first.scenes.json"
-    probing_first_output_file = progression_boost_temp_dir / f"probe-encode-first.mkv"
-    probing_first_output_file_cache = zone_default.source_provider_cache(probing_first_output_file)
-    
-    probing_second_tmp_dir = progression_boost_temp_dir / f"probe-encode-second.tmp"
-    probing_second_done_file = probing_second_tmp_dir / "done.json"
-    probing_second_scenes_file = progression_boost_temp_dir / f"probe-encode-second.scenes.json"
-    probing_second_output_file = progression_boost_temp_dir / f"probe-encode-second.mkv"
-    probing_second_output_file_cache = zone_default.source_provider_cache(probing_second_output_file)
-
-    metric_result_file = progression_boost_temp_dir / f"result.json"
-
-    probing_first_perform_encode = False
-    probing_second_perform_encode = False
-
-    if resume and metric_result_file.exists():
-        with metric_result_file.open("r") as result_f:
-            metric_result = json.load(result_f)
-    else:
-        metric_result = copy.deepcopy(scenes)
-
-    if not resume or not probing_first_output_file.exists():
-        probing_first_perform_encode = True
-
-    if probing_first_perform_encode:
-        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-            if zone_scene["zone"].metric_enable:
-                if "first_score" in metric_result["scenes"][scene_n]:
-                    del metric_result["scenes"][scene_n]["first_score"]
-
-    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-        if zone_scene["zone"].metric_enable:
-            if "first_score" not in metric_result["scenes"][scene_n]:
-                probing_second_perform_encode = True
-                shutil.rmtree(probing_second_tmp_dir, ignore_errors=True)
-                break
-
-    if not resume or not probing_second_output_file.exists():
-        probing_second_perform_encode = True
-
-    if probing_second_perform_encode:
-        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-            if zone_scene["zone"].metric_enable:
-                if "second_score" in metric_result["scenes"][scene_n]:
-                    del metric_result["scenes"][scene_n]["second_score"]
-
-    with metric_result_file.open("w") as metric_result_f:
-        json.dump(metric_result, metric_result_f, cls=NumpyEncoder)
-
-if metric_has_metric and probing_first_perform_encode:
-    probing_first_scenes = {}
-    probing_first_scenes["scenes"] = []
-    total_frames = 0
-    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-        if zone_scene["zone"].metric_enable:
-            metric_result["scenes"][scene_n]["first_qstep"] = 343
-
-            total_frames += zone_scene["end_frame"] - zone_scene["start_frame"]
-            probing_scene = {
-                "start_frame": zone_scene["start_frame"],
-                "end_frame": zone_scene["end_frame"],
-                "zone_overrides": copy.copy(zone_scene["zone_overrides"])
-            }
-            probing_scene["zone_overrides"]["encoder"] = zone_scene["zone"].probing_dynamic_encoder(zone_scene["start_frame"],
-                                                                                                    zone_scene["end_frame"],
-                                                                                                    scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-            if zone_scene["zone"].quarterstep_crf:
-                probing_scene["zone_overrides"]["video_params"] = [
-                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4:.2f}"
-                ]
-            else:
-                probing_scene["zone_overrides"]["video_params"] = [
-                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4:.0f}"
-                ]
-            probing_scene["zone_overrides"]["video_params"] += [
-                "--preset", f"{zone_scene["zone"].probing_preset}",
-                *zone_scene["zone"].probing_dynamic_parameters(zone_scene["start_frame"],
-                                                               zone_scene["end_frame"],
-                                                               (np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4,
-                                                               scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-            ]
-            probing_scene["zone_overrides"]["photon_noise"] = None
-            probing_scene["zone_overrides"]["photon_noise_height"] = None
-            probing_scene["zone_overrides"]["photon_noise_width"] = None
-            probing_scene["zone_overrides"]["chroma_noise"] = False
-            probing_first_scenes["scenes"].append(probing_scene)
-    probing_first_scenes["frames"] = total_frames
-    probing_first_scenes["split_scenes"] = probing_first_scenes["scenes"]
-
-    with metric_result_file.open("w") as metric_result_f:
-        json.dump(metric_result, metric_result_f, cls=NumpyEncoder)
-            
-    with probing_first_scenes_file.open("w") as probing_scenes_f:
-        json.dump(probing_first_scenes, probing_scenes_f, cls=NumpyEncoder)
-
-    probing_first_process = probing_perform_probing(probing_first_tmp_dir, probing_first_scenes_file, probing_first_output_file, probing_first_output_file_cache)
-
-    if verbose < 2:
-        probing_first_start = time.time() - 0.000001
-        probing_first_done_scenes_len_start = 0
-        if probing_first_done_file.exists():
-            with probing_first_done_file.open("r") as done_f:
-                done_scenes = None
-                try:
-                    done_scenes = json.load(done_f)
-                except json.JSONDecodeError:
-                    pass
-                    
-                if done_scenes is not None and "done" in done_scenes:
-                    probing_first_done_scenes_len_start = len(done_scenes["done"])
-
-
-if character_has_character:
-    character_file = character_boost_temp_dir / "kyara.json"
-
-    if resume and character_file.exists():
-        with character_file.open("r") as character_f:
-            character_kyara = json.load(character_f)
-    else:
-        character_kyara = copy.deepcopy(scenes)
-
-    import vsmlrt
-
-    character_clip = zone_default.source_clip
-
-    character_block_width = math.ceil(character_clip.width / 64)
-    character_block_height = math.ceil(character_clip.height / 64)
-    character_clip = character_clip.resize.Bicubic(filter_param_a=0, filter_param_b=0.5, \
-                                                   width=character_block_width*64, height=character_block_height*64, src_width=character_block_width*64, src_height=character_block_height*64, \
-                                                   format=vs.RGBS, primaries_in=1, matrix_in=1, transfer_in=1, range_in=0, transfer=13, range=1)
-    character_clip = vsmlrt.inference(character_clip, character_model, backend=character_backend)
-    character_clip = character_clip.akarin.Expr("x 0.25 > x 0 ?")
-
-    character_clip = character_clip.std.PlaneStats(prop="Kyara")
-
-    character_clip = character_clip.std.Maximum()
-    character_clip = character_clip.resize.Bicubic(filter_param_a=0, filter_param_b=0, \
-                                                   width=character_block_width, height=character_block_height)
-    character_clip = character_clip.akarin.Expr("""
-    x[-1,-1] x[-1,0] x[-1,1]
-    x[0,-1]          x[0,1]
-    x[1,-1]  x[1,0]  x[1,1]
-    + + + + + + + sur!
-    x sur@ 0.75 pow * sur@ 8 / max
-    1 min
-    """)
-
-    def character_calculate_character(character_map_file, scene_n):
-        diffs = scene_detection_diffs[scenes["scenes"][scene_n]["start_frame"]:scenes["scenes"][scene_n]["end_frame"]]
-        frames = np.zeros((math.ceil(diffs.shape[0] / 32) * 32 + 1,), dtype=bool)
-
-        frames[0] = True
-        for frame, diff in enumerate(diffs):
-            if diff >= 0.0012:
-                frames[[math.floor(frame / 4) * 4, math.ceil(frame / 4) * 4]] = True
-                frames[[math.floor(frame / 8) * 8, math.ceil(frame / 8) * 8]] = True
-                frames[[math.floor(frame / 16) * 16, math.ceil(frame / 16) * 16]] = True
-                frames[[math.floor(frame / 32) * 32, math.ceil(frame / 32) * 32]] = True
-
-        character_map = np.full((math.ceil((scenes["scenes"][scene_n]["end_frame"] - scenes["scenes"][scene_n]["start_frame"]) / 4), character_block_width * character_block_height),
-                                np.nan, dtype=np.float64)
-
-        clip = character_clip[int(scenes["scenes"][scene_n]["start_frame"])]
-        clip_map = [0]
-        for i in range(1, character_map.shape[0]):
-            if frames[i * 4]:
-                clip += character_clip[int(scenes["scenes"][scene_n]["start_frame"] + i * 4)]
-                clip_map.append(i)
-
-        character_kyara["scenes"][scene_n]["kyara"] = 0.0
-        for i, frame in enumerate(clip.frames(backlog=48)):
-            character_map[clip_map[i]] = np.array(frame[0], dtype=np.float32).reshape((-1,))
-            character_kyara["scenes"][scene_n]["kyara"] = np.max([frame.props["KyaraAverage"], character_kyara["scenes"][scene_n]["kyara"]])
-
-        np.save(character_map_file, character_map)
-        with character_file.open("w") as character_f:
-            json.dump(character_kyara, character_f, cls=NumpyEncoder)
-
-    character_precalc = 0
-
-if metric_has_metric and probing_first_perform_encode and character_has_character:
-    start = time.time() - 0.000001
-    start_count = -1
-    for scene_n in range(0, len(scenes["scenes"])):
-        if zone_scenes["scenes"][scene_n]["zone"].character_enable:
-            character_precalc = scene_n
-
-            if probing_first_process.poll() is not None:
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Character segmentation paused / {start_count / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
-                break
-
-            character_map_file = character_boost_temp_dir / f"character-{scene_rjust(scene_n)}.npy"
-            if not resume or not character_map_file.exists() or "kyara" not in character_kyara["scenes"][scene_n]:
-                start_count += 1
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Performing character segmentation / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
-
-                character_calculate_character(character_map_file, scene_n)
-    else:
-        character_precalc = len(scenes["scenes"])
-        if start_count != -1:
-            print(f"\r\033[K{scene_frame_print(scene_n)} / Character segmentation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
-
-
-if metric_has_metric and probing_first_perform_encode:
-    if verbose < 2:
-        if probing_first_process.poll() is not None:
-            print(f"\r\033[KScene {scene_rjust(len(probing_first_scenes["scenes"]))}/{scene_rjust(len(probing_first_scenes["scenes"]))} / First probe complete", end="\n", flush=True)
-        else:
-            while True:
-                if probing_first_process.poll() is not None:
-                    break
-
-                if probing_first_done_file.exists():
-                    with probing_first_done_file.open("r") as done_f:
-                        done_scenes_len_previous = probing_first_done_scenes_len_start
-                        while True:
-                            if probing_first_process.poll() is not None:
-                                break
-
-                            done_scenes = None
-                            done_f.seek(0)
-                            try:
-                                done_scenes = json.load(done_f)
-                            except json.JSONDecodeError:
-                                time.sleep(1 / 6000 * 1001)
-                                continue
-
-                            if done_scenes is not None and "done" in done_scenes:
-                                if (done_scenes_len := len(done_scenes["done"])) != done_scenes_len_previous or done_scenes_len == 0:
-                                    print(f"\r\033[KScene {scene_rjust(done_scenes_len)}/{scene_rjust(len(probing_first_scenes["scenes"]))} / Performing first probe / {(done_scenes_len - probing_first_done_scenes_len_start) / (time.time() - probing_first_start):.2f} scenes per second", end="", flush=True)
-                                    done_scenes_len_previous = done_scenes_len
-
-                            time.sleep(1 / 6000 * 1001)
-                    break
-
-            time.sleep(1 / 6000 * 1001)
-
-            print(f"\r\033[KScene {scene_rjust(len(probing_first_scenes["scenes"]))}/{scene_rjust(len(probing_first_scenes["scenes"]))} / First probe complete / {(len(probing_first_scenes["scenes"]) - probing_first_done_scenes_len_start) / (time.time() - probing_first_start):.2f} scenes per second", end="\n", flush=True)
-    else:
-        probing_first_process.wait()
-    
-    assert probing_first_output_file.exists()
-
-
-if metric_has_metric:
-    for zone in zones:
-        if zone["zone"].metric_enable and zone["zone"].metric_method == "vapoursynth":
-            metric_method_has_vapoursynth = True
-            break
-    else:
-        metric_method_has_vapoursynth = False
-    for zone in zones:
-        if zone["zone"].metric_enable and zone["zone"].metric_method == "ffvship":
-            metric_method_has_ffvship = True
-            break
-    else:
-        metric_method_has_ffvship = False
-
-    metric_processed_reference = {}
-    metric_first = zone_default.source_provider(probing_first_output_file)
-    metric_processed_first = {}
-
-    metric_diff_clips = {}
-    if metric_method_has_vapoursynth:
-        metric_first_metric_clips = {}
-
-    if metric_method_has_ffvship:
-        metric_ffvship_output_file = progression_boost_temp_dir / "metric-ffvship.json"
-        metric_ffvship_source_cache = progression_boost_temp_dir / "metric-ffvship-source.ffindex"
-        metric_ffvship_first_cache = progression_boost_temp_dir / "metric-ffvship-first.ffindex"
-
-        if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None and zone_default.source_clip_cache.suffix == ".ffindex":
-            if not metric_ffvship_source_cache.exists():
-                metric_ffvship_source_cache.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(zone_default.source_clip_cache, metric_ffvship_source_cache)
-
-    start = time.time() - 0.000001
-    start_count = -1
-    probing_frame_head = 0
-    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-        if zone_scene["zone"].metric_enable:
-            if "first_score" not in metric_result["scenes"][scene_n]:
-                start_count += 1
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Calculating metric / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
-    
-                assert zone_scene["zone"].metric_method in ["ffvship", "vapoursynth"], "Invalid `metric_method`. Please check your config inside `Progression-Boost.py`."
-
-            if zone_scene["zone"] not in metric_processed_reference:
-                metric_processed_reference[zone_scene["zone"]] = zone_scene["zone"].metric_process(zone_scene["zone"].metric_reference)
-            if zone_scene["zone"] not in metric_processed_first:
-                metric_processed_first[zone_scene["zone"]] = zone_scene["zone"].metric_process(metric_first)
-                
-            reference_offset = zone_scene["start_frame"] - probing_frame_head
-
-
-            if "frames" not in metric_result["scenes"][scene_n]:
-                if verbose >= 3:
-                    print(f"\r\033[K{scene_frame_print(scene_n)} / Frame selection", end="", flush=True)
-
-                if zone_scene["end_frame"] - zone_scene["start_frame"] > 1:
-                    rng = default_rng(1188246) # Guess what is this number. It's the easiest cipher out there.
-                
-                    # These frames are offset from `scene["start_frame"] + 1` and that's why they are offfset, not offset
-                    offfset_frames = np.array([], dtype=np.int32)
-                    
-                    scene_diffs = scene_detection_diffs[zone_scene["start_frame"] + 1:zone_scene["end_frame"]]
-    
-                    transform = fftpack.dct(scene_diffs)
-                    transform[np.max([math.ceil(transform.shape[0] / 5), 7]):] = 0
-                    reconstructed = fftpack.idct(transform)
-    
-                    peaks, properties = signal.find_peaks(reconstructed, prominence=0)
-                    peaks_sort = peaks[np.argsort(properties["prominences"])[::-1]]
-    
-                    picked = 0
-                    if verbose >= 3:
-                        print(f" / peak transformed", end="", flush=True)
-                    for offfset_frame in peaks_sort:
-                        if picked >= zone_scene["zone"].metric_peak_transformed_diff_frames:
-                            break
-                        offfset_frames = np.append(offfset_frames, offfset_frame)
-                        picked += 1
-                        if verbose >= 3:
-                            print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
-    
-                    scene_diffs_sort = np.argsort(scene_diffs)[::-1]
-    
-                    picked = 0
-                    if verbose >= 3:
-                        print(f" / highest diff", end="", flush=True)
-                    for offfset_frame in scene_diffs_sort:
-                        if picked >= zone_scene["zone"].metric_highest_diff_frames:
-                            break
-                        if offfset_frame in offfset_frames:
-                            continue
-                        offfset_frames = np.append(offfset_frames, offfset_frame)
-                        picked += 1
-                        if verbose >= 3:
-                            print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
-    
-                    if zone_scene["zone"].metric_highest_probing_diff_frames:
-                        if (zone_scene["zone"], reference_offset) not in metric_diff_clips:
-                            metric_diff_clips[(zone_scene["zone"], reference_offset)] = core.std.PlaneStats(metric_processed_reference[zone_scene["zone"]][reference_offset:],
-                                                                                                            metric_processed_first[zone_scene["zone"]],
-                                                                                                            prop="Encode")
-                        clip = metric_diff_clips[(zone_scene["zone"], reference_offset)][probing_frame_head:probing_frame_head + zone_scene["end_frame"] - zone_scene["start_frame"]]
-                        encode_diffs = [frame.props["EncodeDiff"] for frame in clip.frames(backlog=48)]
-                        encode_diffs_sort = np.argsort(encode_diffs, stable=True)[::-1]
-                        picked = 0
-                        if verbose >= 3:
-                            print(f" / highest probing diff", end="", flush=True)
-                        for frame in encode_diffs_sort:
-                            if picked >= zone_scene["zone"].metric_highest_probing_diff_frames:
-                                break
-                            if frame - 1 in offfset_frames:
-                                continue
-                            offfset_frames = np.append(offfset_frames, frame - 1)
-                            picked += 1
-                            if verbose >= 3:
-                                print(f" {zone_scene["start_frame"] + frame}", end="", flush=True)
-                    
-                    if verbose >= 3:
-                        print(f" / last", end="", flush=True)
-                    if zone_scene["zone"].metric_last_frame >= 1 and zone_scene["end_frame"] - zone_scene["start_frame"] - 2 not in offfset_frames:
-                        offfset_frames = np.append(offfset_frames, zone_scene["end_frame"] - zone_scene["start_frame"] - 2)
-                        if verbose >= 3:
-                            print(f" {zone_scene["end_frame"] - 1}", end="", flush=True)
-                
-                    scene_diffs_percentile = np.percentile(scene_diffs, 40, method="linear")
-                    scene_diffs_percentile_absolute_deviation = np.percentile(np.abs(scene_diffs - scene_diffs_percentile), 40, method="linear")
-                    scene_diffs_upper_bracket_ = np.argwhere(scene_diffs > scene_diffs_percentile + 5 * scene_diffs_percentile_absolute_deviation).reshape((-1))
-                    scene_diffs_lower_bracket_ = np.argwhere(scene_diffs <= scene_diffs_percentile + 5 * scene_diffs_percentile_absolute_deviation).reshape((-1))
-                    scene_diffs_upper_bracket = np.empty_like(scene_diffs_upper_bracket_)
-                    rng.shuffle((scene_diffs_upper_bracket__ := scene_diffs_upper_bracket_[:math.ceil(scene_diffs_upper_bracket_.shape[0] / 2)]))
-                    scene_diffs_upper_bracket[::2] = scene_diffs_upper_bracket__
-                    rng.shuffle((scene_diffs_upper_bracket__ := scene_diffs_upper_bracket_[-math.floor(scene_diffs_upper_bracket_.shape[0] / 2):]))
-                    scene_diffs_upper_bracket[1::2] = scene_diffs_upper_bracket__
-                    scene_diffs_lower_bracket = np.empty_like(scene_diffs_lower_bracket_)
-                    rng.shuffle((scene_diffs_lower_bracket__ := scene_diffs_lower_bracket_[:math.ceil(scene_diffs_lower_bracket_.shape[0] / 2)]))
-                    scene_diffs_lower_bracket[::2] = scene_diffs_lower_bracket__
-                    rng.shuffle((scene_diffs_lower_bracket__ := scene_diffs_lower_bracket_[-math.floor(scene_diffs_lower_bracket_.shape[0] / 2):]))
-                    scene_diffs_lower_bracket[1::2] = scene_diffs_lower_bracket__
-                
-                    picked = 0
-                    if verbose >= 3:
-                        print(f" / upper bracket", end="", flush=True)
-                    for offfset_frame in scene_diffs_upper_bracket:
-                        if picked >= zone_scene["zone"].metric_upper_diff_bracket_frames:
-                            break
-                        if offfset_frames.shape[0] != 0 and np.min(np.abs(offfset_frames - offfset_frame)) < zone_scene["zone"].metric_diff_brackets_min_separation:
-                            continue
-                        offfset_frames = np.append(offfset_frames, offfset_frame)
-                        picked += 1
-                        if verbose >= 3:
-                            print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
-                    
-                    if picked < zone_scene["zone"].metric_upper_diff_bracket_fallback_frames:
-                        to_pick = zone_scene["zone"].metric_lower_diff_bracket_frames + zone_scene["zone"].metric_upper_diff_bracket_fallback_frames - picked
-                    else:
-                        to_pick = zone_scene["zone"].metric_lower_diff_bracket_frames
-                
-                    if verbose >= 3:
-                        print(f" / first", end="", flush=True)
-                    if zone_scene["zone"].metric_first_frame >= 1 and -1 not in offfset_frames:
-                        offfset_frames = np.append(offfset_frames, -1)
-                        if verbose >= 3:
-                            print(f" {zone_scene["start_frame"]}", end="", flush=True)
-                
-                    picked = 0
-                    if verbose >= 3:
-                        print(f" / lower bracket", end="", flush=True)
-                    for offfset_frame in scene_diffs_lower_bracket:
-                        if picked >= to_pick:
-                            break
-                        if offfset_frames.shape[0] != 0 and np.min(np.abs(offfset_frames - offfset_frame)) < zone_scene["zone"].metric_diff_brackets_min_separation:
-                            continue
-                        offfset_frames = np.append(offfset_frames, offfset_frame)
-                        picked += 1
-                        if verbose >= 3:
-                            print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
-    
-                    if verbose >= 3:
-                        print(f"", end="\n", flush=True)
-                        
-                    metric_result["scenes"][scene_n]["frames"] = np.sort(offfset_frames) + 1
-
-                else:
-                    if verbose >= 3:
-                        print(f" / frame {zone_scene["start_frame"]}", end="\n", flush=True)
-                    metric_result["scenes"][scene_n]["frames"] = np.array([0], dtype=np.int32)
-
-
-            if "first_score" not in metric_result["scenes"][scene_n]:
-                if zone_scene["zone"].metric_method == "vapoursynth":
-                    if (zone_scene["zone"], reference_offset) not in metric_first_metric_clips:
-                        metric_first_metric_clips[(zone_scene["zone"], reference_offset)] = zone_scene["zone"].metric_vapoursynth_calculate(metric_processed_reference[zone_scene["zone"]][reference_offset:], metric_processed_first[zone_scene["zone"]])
-        
-                    clip = metric_first_metric_clips[(zone_scene["zone"], reference_offset)][int(metric_result["scenes"][scene_n]["frames"][0] + probing_frame_head)]
-                    for frame in metric_result["scenes"][scene_n]["frames"][1:]:
-                        clip += metric_first_metric_clips[(zone_scene["zone"], reference_offset)][int(frame + probing_frame_head)]
-
-                    scores = np.array([zone_scene["zone"].metric_vapoursynth_metric(frame) for frame in clip.frames(backlog=48)])
-                    
-                elif zone_scene["zone"].metric_method == "ffvship":
-                    metric_ffvship_output_file.unlink(missing_ok=True)
-
-                    command = [
-                        "FFVship",
-                        "--source", input_file,
-                        "--encoded", probing_first_output_file,
-                        "--cache-index",
-                        "--source-index", metric_ffvship_source_cache,
-                        "--encoded-index", metric_ffvship_first_cache,
-                        "--metric", zone_scene["zone"].metric_ffvship_calculate
-                    ]
-                    if zone_scene["zone"].metric_ffvship_calculate == "Butteraugli" and zone_scene["zone"].metric_ffvship_intensity_target is not None:
-                        command += ["--intensity-target", str(zone_scene["zone"].metric_ffvship_intensity_target)]
-                    command += [
-                        "--json", metric_ffvship_output_file,
-                        "--source-indices", ",".join([str(frame) for frame in (metric_result["scenes"][scene_n]["frames"] + zone_scene["start_frame"])]),
-                        "--encoded-offset", str(-reference_offset),
-                        *zone_scene["zone"].metric_ffvship_extra_parameters
-                    ]
-                    subprocess.run(command, text=True, stdout=subprocess.DEVNULL)
-                    assert metric_ffvship_output_file.exists()
-
-                    with metric_ffvship_output_file.open("r") as metric_output_f:
-                        scores = json.load(metric_output_f)
-                    scores = np.array([zone_scene["zone"].metric_ffvship_metric(frame) for frame in scores])
-                
-                metric_result["scenes"][scene_n]["first_score"] = zone_scene["zone"].metric_summarise(np.array(metric_result["scenes"][scene_n]["frames"]), scores)
-
-
-            probing_frame_head += zone_scene["end_frame"] - zone_scene["start_frame"]
-
-            with metric_result_file.open("w") as metric_result_f:
-                json.dump(metric_result, metric_result_f, cls=NumpyEncoder)
-
-    if start_count != -1:
-        print(f"\r\033[K{scene_frame_print(scene_n)} / Metric calculation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
-
-
-#  ██████╗ ██████╗  ██████╗ ██████╗ ██╗███╗   ██╗ ██████╗       ███████╗███████╗ ██████╗ ██████╗ ███╗   ██╗██████╗ 
-#  ██╔══██╗██╔══██╗██╔═══██╗██╔══██╗██║████╗  ██║██╔════╝       ██╔════╝██╔════╝██╔════╝██╔═══██╗████╗  ██║██╔══██╗
-#  ██████╔╝██████╔╝██║   ██║██████╔╝██║██╔██╗ ██║██║  ███╗█████╗███████╗█████╗  ██║     ██║   ██║██╔██╗ ██║██║  ██║
-#  ██╔═══╝ ██╔══██╗██║   ██║██╔══██╗██║██║╚██╗██║██║   ██║╚════╝╚════██║██╔══╝  ██║     ██║   ██║██║╚██╗██║██║  ██║
-#  ██║     ██║  ██║╚██████╔╝██████╔╝██║██║ ╚████║╚██████╔╝      ███████║███████╗╚██████╗╚██████╔╝██║ ╚████║██████╔╝
-#  ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝       ╚══════╝╚══════╝ ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚═════╝ 
-
-
-if metric_has_metric and probing_second_perform_encode:
-    probing_second_scenes = {}
-    probing_second_scenes["scenes"] = []
-    total_frames = 0
-    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-        if zone_scene["zone"].metric_enable:
-            if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["first_score"], zone_scene["zone"].metric_target):
-                metric_result["scenes"][scene_n]["second_qstep"] = 891
-            else:
-                metric_result["scenes"][scene_n]["second_qstep"] = 155
-
-            total_frames += zone_scene["end_frame"] - zone_scene["start_frame"]
-            probing_scene = {
-                "start_frame": zone_scene["start_frame"],
-                "end_frame": zone_scene["end_frame"],
-                "zone_overrides": copy.copy(zone_scene["zone_overrides"])
-            }
-            probing_scene["zone_overrides"]["encoder"] = zone_scene["zone"].probing_dynamic_encoder(zone_scene["start_frame"],
-                                                                                                    zone_scene["end_frame"],
-                                                                                                    scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                                                    scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-            if zone_scene["zone"].quarterstep_crf:
-                probing_scene["zone_overrides"]["video_params"] = [
-                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4:.2f}"
-                ]
-            else:
-                probing_scene["zone_overrides"]["video_params"] = [
-                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4:.0f}"
-                ]
-            probing_scene["zone_overrides"]["video_params"] += [
-                "--preset", f"{zone_scene["zone"].probing_preset}",
-                *zone_scene["zone"].probing_dynamic_parameters(zone_scene["start_frame"],
-                                                               zone_scene["end_frame"],
-                                                               (np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4,
-                                                               scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                               scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-            ]
-            probing_scene["zone_overrides"]["photon_noise"] = None
-            probing_scene["zone_overrides"]["photon_noise_height"] = None
-            probing_scene["zone_overrides"]["photon_noise_width"] = None
-            probing_scene["zone_overrides"]["chroma_noise"] = False
-            probing_second_scenes["scenes"].append(probing_scene)
-    probing_second_scenes["frames"] = total_frames
-    probing_second_scenes["split_scenes"] = probing_second_scenes["scenes"]
-
-    with metric_result_file.open("w") as metric_result_f:
-        json.dump(metric_result, metric_result_f, cls=NumpyEncoder)
-            
-    with probing_second_scenes_file.open("w") as probing_scenes_f:
-        json.dump(probing_second_scenes, probing_scenes_f, cls=NumpyEncoder)
-
-    probing_second_process = probing_perform_probing(probing_second_tmp_dir, probing_second_scenes_file, probing_second_output_file, probing_second_output_file_cache)
-
-    if verbose < 2:
-        probing_second_start = time.time() - 0.000001
-        probing_second_done_scenes_len_start = 0
-        if probing_second_done_file.exists():
-            with probing_second_done_file.open("r") as done_f:
-                done_scenes = None
-                try:
-                    done_scenes = json.load(done_f)
-                except json.JSONDecodeError:
-                    pass
-                    
-                if done_scenes is not None and "done" in done_scenes:
-                    probing_second_done_scenes_len_start = len(done_scenes["done"])
-
-
-if character_has_character:
-    start = time.time() - 0.000001
-    start_count = -1
-    for scene_n in range(character_precalc, len(scenes["scenes"])):
-        if zone_scenes["scenes"][scene_n]["zone"].character_enable:
-            character_map_file = character_boost_temp_dir / f"character-{scene_rjust(scene_n)}.npy"
-            if not resume or not character_map_file.exists() or "kyara" not in character_kyara["scenes"][scene_n]:
-                start_count += 1
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Performing character segmentation / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
-
-                character_calculate_character(character_map_file, scene_n)
-    else:
-        if start_count != -1:
-            if character_precalc == 0:
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Character segmentation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
-            elif character_precalc != len(scenes["scenes"]):
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Character segmentation complete", end="\n", flush=True)
-
-
-if metric_has_metric and probing_second_perform_encode:
-    if verbose < 2:
-        if probing_second_process.poll() is not None:
-            print(f"\r\033[KScene {scene_rjust(len(probing_second_scenes["scenes"]))}/{scene_rjust(len(probing_second_scenes["scenes"]))} / Second probe complete", end="\n", flush=True)
-        else:
-            while True:
-                if probing_second_process.poll() is not None:
-                    break
-
-                if probing_second_done_file.exists():
-                    with probing_second_done_file.open("r") as done_f:
-                        done_scenes_len_previous = probing_second_done_scenes_len_start
-                        while True:
-                            if probing_second_process.poll() is not None:
-                                break
-
-                            done_scenes = None
-                            done_f.seek(0)
-                            try:
-                                done_scenes = json.load(done_f)
-                            except json.JSONDecodeError:
-                                time.sleep(1 / 6000 * 1001)
-                                continue
-
-                            if done_scenes is not None and "done" in done_scenes:
-                                if (done_scenes_len := len(done_scenes["done"])) != done_scenes_len_previous or done_scenes_len == 0:
-                                    print(f"\r\033[KScene {scene_rjust(done_scenes_len)}/{scene_rjust(len(probing_second_scenes["scenes"]))} / Performing second probe / {(done_scenes_len - probing_second_done_scenes_len_start) / (time.time() - probing_second_start):.2f} scenes per second", end="", flush=True)
-                                    done_scenes_len_previous = done_scenes_len
-
-                            time.sleep(1 / 6000 * 1001)
-                    break
-
-                time.sleep(1 / 6000 * 1001)
-
-            print(f"\r\033[KScene {scene_rjust(len(probing_second_scenes["scenes"]))}/{scene_rjust(len(probing_second_scenes["scenes"]))} / Second probe complete / {(len(probing_second_scenes["scenes"]) - probing_second_done_scenes_len_start) / (time.time() - probing_second_start):.2f} scenes per second", end="\n", flush=True)
-    else:
-        probing_second_process.wait()
-
-    assert probing_second_output_file.exists()
-
-if metric_has_metric:
-    if metric_method_has_vapoursynth:
-        metric_processed_reference = {}
-        
-        metric_second = zone_default.source_provider(probing_second_output_file)
-        metric_processed_second = {}
-        metric_second_metric_clips = {}
-        
-    if metric_method_has_ffvship:
-        metric_ffvship_second_cache = progression_boost_temp_dir / "metric-ffvship-second.ffindex"
-
-    start = time.time() - 0.000001
-    start_count = -1
-    probing_frame_head = 0
-    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-        if zone_scene["zone"].metric_enable:
-            if "second_score" not in metric_result["scenes"][scene_n]:
-                start_count += 1
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Calculating metric / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
-
-                assert "frames" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-    
-                reference_offset = zone_scene["start_frame"] - probing_frame_head
-                if zone_scene["zone"].metric_method == "vapoursynth":
-                    if zone_scene["zone"] not in metric_processed_reference:
-                        metric_processed_reference[zone_scene["zone"]] = zone_scene["zone"].metric_process(zone_scene["zone"].metric_reference)
-                    if zone_scene["zone"] not in metric_processed_second:
-                        metric_processed_second[zone_scene["zone"]] = zone_scene["zone"].metric_process(metric_second)
-    
-                    if (zone_scene["zone"], reference_offset) not in metric_second_metric_clips:
-                        metric_second_metric_clips[(zone_scene["zone"], reference_offset)] = zone_scene["zone"].metric_vapoursynth_calculate(metric_processed_reference[zone_scene["zone"]][reference_offset:], metric_processed_second[zone_scene["zone"]])
-        
-                    clip = metric_second_metric_clips[(zone_scene["zone"], reference_offset)][int(metric_result["scenes"][scene_n]["frames"][0] + probing_frame_head)]
-                    for frame in metric_result["scenes"][scene_n]["frames"][1:]:
-                        clip += metric_second_metric_clips[(zone_scene["zone"], reference_offset)][int(frame + probing_frame_head)]
-        
-                    scores = np.array([zone_scene["zone"].metric_vapoursynth_metric(frame) for frame in clip.frames(backlog=48)])
-                    
-                elif zone_scene["zone"].metric_method == "ffvship":
-                    metric_ffvship_output_file.unlink(missing_ok=True)
-
-                    command = [
-                        "FFVship",
-                        "--source", input_file,
-                        "--encoded", probing_second_output_file,
-                        "--cache-index",
-                        "--source-index", metric_ffvship_source_cache,
-                        "--encoded-index", metric_ffvship_second_cache,
-                        "--metric", zone_scene["zone"].metric_ffvship_calculate
-                    ]
-                    if zone_scene["zone"].metric_ffvship_calculate == "Butteraugli" and zone_scene["zone"].metric_ffvship_intensity_target is not None:
-                        command += ["--intensity-target", str(zone_scene["zone"].metric_ffvship_intensity_target)]
-                    command += [
-                        "--json", metric_ffvship_output_file,
-                        "--source-indices", ",".join([str(frame) for frame in (metric_result["scenes"][scene_n]["frames"] + zone_scene["start_frame"])]),
-                        "--encoded-offset", str(-reference_offset),
-                        *zone_scene["zone"].metric_ffvship_extra_parameters
-                    ]
-                    subprocess.run(command, text=True, stdout=subprocess.DEVNULL)
-                    assert metric_ffvship_output_file.exists()
-
-                    with metric_ffvship_output_file.open("r") as metric_output_f:
-                        scores = json.load(metric_output_f)
-                    scores = np.array([zone_scene["zone"].metric_ffvship_metric(frame) for frame in scores])
-                
-                metric_result["scenes"][scene_n]["second_score"] = zone_scene["zone"].metric_summarise(np.array(metric_result["scenes"][scene_n]["frames"]), scores)
-
-            probing_frame_head += zone_scene["end_frame"] - zone_scene["start_frame"]
-
-            with metric_result_file.open("w") as metric_result_f:
-                json.dump(metric_result, metric_result_f, cls=NumpyEncoder)
-
-    if start_count != -1:
-        print(f"\r\033[K{scene_frame_print(scene_n)} / Metric calculation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
-
-    # Failsafe for `--resume` # Fixed it properly this time
-    # for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-    #     if zone_scene["zone"].metric_enable:
-    #         if "first_qstep" not in metric_result["scenes"][scene_n]:
-    #             metric_result["scenes"][scene_n]["first_qstep"] = 343
-
-    if verbose >= 3:
-        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-            if zone_scene["zone"].metric_enable:
-                print(f"\r\033[K{scene_frame_print(scene_n)} / Metric result / first_qstep {metric_result["scenes"][scene_n]["first_qstep"]} / first_score {metric_result["scenes"][scene_n]["first_score"]:.3f} / second_qstep {metric_result["scenes"][scene_n]["second_qstep"]} / second_score {metric_result["scenes"][scene_n]["second_score"]:.3f}", end="\n", flush=True)
-
-
-#  ███████╗██╗███╗   ██╗ █████╗ ██╗     
-#  ██╔════╝██║████╗  ██║██╔══██╗██║     
-#  █████╗  ██║██╔██╗ ██║███████║██║     
-#  ██╔══╝  ██║██║╚██╗██║██╔══██║██║     
-#  ██║     ██║██║ ╚████║██║  ██║███████╗
-#  ╚═╝     ╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝
-
-
-final_scenes = copy.deepcopy(scenes)
-final_crf_frames = np.zeros((10,), dtype=np.int32)
-start = time.time() - 0.000001
-for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
-    if verbose < 1:
-        print(f"\r\033[K{scene_frame_print(scene_n)} / Calculating boost / {scene_n / (time.time() - start):.0f} scenes per second", end="", flush=True)
-    if verbose >= 1:
-        print(f"\r\033[K{scene_frame_print(scene_n)} / Calculating boost / --crf / ", end="", flush=True)
-
-    if zone_scene["zone"].character_enable:
-        # `character_map` in the front so that it is accessible in `metric_dynamic_crf` and `metric_dynamic_preset`.
-        character_map_file = character_boost_temp_dir / f"character-{scene_rjust(scene_n)}.npy"
-        assert character_map_file.exists(), "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-
-        character_map = np.load(character_map_file)
-
-    if zone_scene["zone"].metric_enable:
-        assert "first_qstep" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-        assert "first_score" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-        assert "second_qstep" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-        assert "second_score" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-
-        if verbose >= 1:
-            print(f"Progression Boost ", end="", flush=True)
-
-        def metric_linear():
-            fit = Polynomial.fit([metric_result["scenes"][scene_n]["first_score"], metric_result["scenes"][scene_n]["second_score"]],
-                                 [metric_result["scenes"][scene_n]["first_qstep"], metric_result["scenes"][scene_n]["second_qstep"]],
-                                 1)
-            qstep = fit(offset_metric_target)
-
-            crf = np.interp(qstep, dc, dc_X) / 4
-            crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
-            preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
-                                                              zone_scene["end_frame"],
-                                                              crf,
-                                                              scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                              scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                              scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                              scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-            if verbose >= 1:
-                print(f"{crf:>5.2f} / ", end="", flush=True)
-
-            if qstep > 163:
-                if zone_scene["zone"].probing_preset >= 8:
-                    if preset <= -1:
-                        qstep = (qstep - 163) * 0.69 + 163
-                    elif preset <= 0:
-                        qstep = (qstep - 163) * 0.70 + 163
-                    elif preset <= 2:
-                        qstep = (qstep - 163) * 0.73 + 163
-                    elif preset <= 6:
-                        qstep = (qstep - 163) * 0.81 + 163
-                elif zone_scene["zone"].probing_preset >= 6:
-                    if preset <= -1:
-                        qstep = (qstep - 163) * 0.72 + 163
-                    elif preset <= 0:
-                        qstep = (qstep - 163) * 0.73 + 163
-                    elif preset <= 2:
-                        qstep = (qstep - 163) * 0.76 + 163
-                    elif preset <= 5:
-                        qstep = (qstep - 163) * 0.84 + 163
-                elif zone_scene["zone"].probing_preset >= 5:
-                    if preset <= -1:
-                        qstep = (qstep - 163) * 0.82 + 163
-                    elif preset <= 0:
-                        qstep = (qstep - 163) * 0.83 + 163
-                    elif preset <= 2:
-                        qstep = (qstep - 163) * 0.86 + 163
-                elif zone_scene["zone"].probing_preset >= 3:
-                    if preset <= -1:
-                        qstep = (qstep - 163) * 0.90 + 163
-                    elif preset <= 0:
-                        qstep = (qstep - 163) * 0.91 + 163
-                    elif preset <= 2:
-                        qstep = (qstep - 163) * 0.94 + 163
-
-                crf = np.interp(qstep, dc, dc_X) / 4
-                crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
-
-            if verbose >= 1:
-                print(f"readjusted {crf:>5.2f} / ", end="", flush=True)
-
-            return crf, preset
-
-        # Panning Rejection
-        luma_diff = scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]
-        luma_diff = np.percentile(luma_diff, 25)
-        metric_target_offset_hiritsu = np.interp(luma_diff, [0.004, 0.010, 0.028, 0.034],
-                                                            [0.0,   1.0,   1.0,   0.4])
-            
-
-        if metric_result["scenes"][scene_n]["first_qstep"] < metric_result["scenes"][scene_n]["second_qstep"]:
-            if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["first_score"], metric_result["scenes"][scene_n]["second_score"]):
-                if metric_target_offset_hiritsu == 0.0:
-                    if verbose >= 1:
-                        print(f"original ", end="", flush=True)
-                    offset_metric_target = zone_scene["zone"].metric_target
-                else:
-                    if verbose >= 3:
-                        print(f"{luma_diff:.3f} ", end="", flush=True)
-                    if verbose >= 1:
-                        print(f"panning rejected ", end="", flush=True)
-                    offset_metric_target = zone_scene["zone"].metric_target + 0.20 * \
-                                                                              zone_scene["zone"].metric_panning_rejection_sigma * \
-                                                                              metric_target_offset_hiritsu * \
-                                                                              (metric_result["scenes"][scene_n]["second_score"] - metric_result["scenes"][scene_n]["first_score"])
-
-                crf, preset = metric_linear()
-            else:
-                crf = np.interp(np.mean([metric_result["scenes"][scene_n]["first_qstep"], metric_result["scenes"][scene_n]["second_qstep"]]), dc, dc_X) / 4
-                crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
-                preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
-                                                                  zone_scene["end_frame"],
-                                                                  crf,
-                                                                  scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-                if verbose >= 1:
-                    print(f"fallback {crf:>5.2f} / ", end="", flush=True)
-        else: # second_qstep < first_qstep
-            if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["second_score"], metric_result["scenes"][scene_n]["first_score"]):
-                if metric_target_offset_hiritsu == 0.0:
-                    if verbose >= 1:
-                        print(f"original ", end="", flush=True)
-                    offset_metric_target = zone_scene["zone"].metric_target
-                else:
-                    if verbose >= 3:
-                        print(f"{luma_diff:.3f} ", end="", flush=True)
-                    if verbose >= 1:
-                        print(f"panning rejected ", end="", flush=True)
-                    offset_metric_target = zone_scene["zone"].metric_target + 0.40 * \
-                                                                              zone_scene["zone"].metric_panning_rejection_sigma * \
-                                                                              metric_target_offset_hiritsu * \
-                                                                              (metric_result["scenes"][scene_n]["first_score"] - metric_result["scenes"][scene_n]["second_score"])
-
-                crf, preset = metric_linear()
-            else:
-                crf = zone_scene["zone"].metric_unreliable_crf_fallback()
-                crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
-                preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
-                                                                  zone_scene["end_frame"],
-                                                                  crf,
-                                                                  scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                  scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-                if verbose >= 1:
-                    print(f"fallback {crf:>5.2f} / ", end="", flush=True)
-        new_crf = zone_scene["zone"].metric_dynamic_crf(zone_scene["start_frame"],
-                                                        zone_scene["end_frame"],
-                                                        crf,
-                                                        scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                        scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                        scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                        scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-        if new_crf != crf:
-            crf = new_crf
-            print(f"dynamic {crf:>5.2f} / ", end="", flush=True)
-    else:
-        crf = zone_scene["zone"].metric_disabled_base_crf
-        crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
-        preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
-                                                          zone_scene["end_frame"],
-                                                          crf,
-                                                          scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                          scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                          scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                          scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-        if verbose >= 1:
-            print(f"Starting {crf:>5.2f} / ", end="", flush=True)
-
-    if zone_scene["zone"].character_enable:
-        if verbose >= 1:
-            print(f"Character Boost ", end="", flush=True)
-
-        # Reading `character_map` is moved to before Progression Boost module.
-        character_map_filled = character_map.copy()
-        a_last_filled = None
-        for i, a in enumerate(character_map):
-            if np.any((a_nan := np.isnan(a))):
-                assert np.all(a_nan), "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-
-                assert a_last_filled is not None, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
-                character_map_filled[i] = a_last_filled
-            else:
-                a_last_filled = a
-        
-        if character_map_filled.shape[0] >= 2:
-            character_map_filled_diff = np.sum(np.abs(np.diff(character_map_filled, axis=0)), axis=1)
-            character_map_filled_sum = ((sum_filled := np.sum(character_map_filled, axis=1))[1:] + sum_filled[:-1]) / 2
-        else:
-            character_map_filled_diff = np.array([0], dtype=np.float64)
-            character_map_filled_sum = np.sum(character_map_filled, axis=1)
-
-        if zone["zone"].character_roi_boost_max:
-            character_roi_diff = np.divide(character_map_filled_diff, character_map_filled_sum, out=np.zeros_like(character_map_filled_diff), where=character_map_filled_sum != 0)
-            character_roi_high_diff = np.zeros((math.ceil(character_map_filled.shape[0] / 8) * 8 + 1,), dtype=bool)
-
-            for i, diff in enumerate(character_roi_diff):
-                if diff > 0.10:
-                    character_roi_high_diff[i + 1] = True
-                    character_roi_high_diff[[math.floor((i + 1) / 2) * 2, math.ceil((i + 1) / 2) * 2]] = True
-                    character_roi_high_diff[[math.floor((i + 1) / 4) * 4, math.ceil((i + 1) / 4) * 4]] = True
-                    character_roi_high_diff[[math.floor((i + 1) / 8) * 8, math.ceil((i + 1) / 8) * 8]] = True
-    
-            roi_map = []
-            
-            uniform_offset = zone_scene["zone"].character_roi_boost_max // 2.0
-            uniform_nonboosting_offset = zone_scene["zone"].character_roi_boost_max // 1.2
-            uniform_ending_nonboosting_offset = zone_scene["zone"].character_roi_boost_max // 4.8
-            character_key_multiplier = 1.00
-            character_32_multiplier = 0.90
-            character_16_multiplier = 0.70
-            character_high_diff_8_multiplier = 0.60
-            character_high_diff_4_multiplier = 0.40
-            character_8_multiplier = 0.50
-            character_4_multiplier = 0.45
-            for i, a in enumerate(character_map):
-                if not np.any((a_nan := np.isnan(a))):
-                    a = np.round(a * -7)
-                    if i == 0:
-                        a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_key_multiplier) + uniform_offset)
-                    elif i % 8 == 0:
-                        a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_32_multiplier) + uniform_offset)
-                    elif i % 4 == 0:
-                        a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_16_multiplier) + uniform_offset)
-                    elif i % 2 == 0:
-                        if character_roi_high_diff[i]:
-                            a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_high_diff_8_multiplier) + uniform_offset)
-                        else:
-                            a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_8_multiplier) + uniform_offset)
-                    else:
-                        if character_roi_high_diff[i]:
-                            a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_high_diff_4_multiplier) + uniform_offset)
-                        else:
-                            a = np.round(a * (zone_scene["zone"].character_roi_boost_max / 1.75 * character_4_multiplier) + uniform_offset)
-                    roi_map.append([i * 4, a])
-
-                    if i != character_map.shape[0] - 1:
-                        roi_map.append([i * 4 + 1, np.full_like(a, np.round(uniform_nonboosting_offset), dtype=np.float32)])
-                    else:
-                        roi_map.append([i * 4 + 1, np.full_like(a, np.round(uniform_ending_nonboosting_offset), dtype=np.float32)])
-
-            needed_offset = 0
-            for line in roi_map:
-                needed_offset = np.max([needed_offset, 0 - np.max(line[1])])
-            for line in roi_map:
-                line[1] += needed_offset
-            crf -= needed_offset / 4
-            if verbose >= 1:
-                print(f"ROI map {crf:>5.2f} / ", end="", flush=True)
-
-            roi_map_file = roi_maps_dir / f"roi-map-{scene_rjust(scene_n)}.txt"
-            with roi_map_file.open("w") as roi_map_f:
-                for line in roi_map:
-                    roi_map_f.write(f"{line[0]} ")
-                    np.savetxt(roi_map_f, line[1].reshape((1, -1)), fmt="%d")
-
-        character_hiritsu = character_kyara["scenes"][scene_n]["kyara"]
-        if zone_scene["zone"].character_crf_boost_alt_curve == 0:
-            character_hiritsu = np.interp(character_hiritsu, [0.00, 0.02, 0.12, 0.22, 0.32, 0.42, 0.52],
-                                                             [0.00, 0.00, 1.00, 1.00, 0.92, 0.82, 0.67])
-        elif zone_scene["zone"].character_crf_boost_alt_curve == 1:
-            character_hiritsu = np.interp(character_hiritsu, [0.00, 0.02, 0.12, 0.22, 0.32, 0.42, 0.52],
-                                                             [0.00, 0.12, 0.72, 1.00, 1.00, 0.92, 0.82])
-        else:
-            assert False, "Invalid `character_crf_boost_alt_curve`. Please check your config inside `Progression-Boost.py`."
-        crf -= zone_scene["zone"].character_crf_boost_max * character_hiritsu
-        if verbose >= 1:
-            print(f"--crf {crf:>5.2f} / ", end="", flush=True)
-
-        if (sum_filled := np.sum(character_map_filled_sum)) != 0.0:
-            character_diff = np.sum(character_map_filled_diff) / sum_filled / 0.12
-        else:
-            character_diff = 0.0
-        if character_diff > 1.00:
-            character_diff = 1.00
-        # Panning Rejection
-        luma_diff = scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]
-        luma_diff = np.percentile(luma_diff, 25)
-        character_motion_crf_boost_hiritsu = np.interp(luma_diff, [0.008, 0.016, 0.028, 0.034],
-                                                                  [1.0,   0.4,   0.4,   0.8])
-        crf -= zone_scene["zone"].character_motion_crf_boost_max * character_diff * character_motion_crf_boost_hiritsu
-        if verbose >= 1:
-            print(f"motion --crf {crf:>5.2f} / ", end="", flush=True)
-
-    crf = np.max([crf, zone_scene["zone"].final_min_crf])
-    crf = np.round(crf / 0.25) * 0.25
-    if verbose >= 1:
-        print(f"Final {f"{crf:>5.2f}" if zone_scene["zone"].quarterstep_crf else f"{crf:.0f}"}", end="\n", flush=True)
-
-    final_crf_frames[np.min([math.floor(crf / 10), final_crf_frames.shape[0] - 1])] += zone_scene["end_frame"] - zone_scene["start_frame"]
-
-    final_scenes["scenes"][scene_n]["zone_overrides"] = {
-        "encoder": zone_scene["zone"].final_dynamic_encoder(zone_scene["start_frame"],
-                                                            zone_scene["end_frame"],
-                                                            crf,
-                                                            scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                            scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                            scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                            scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]),
-        "passes": 1,
-        "video_params": [
-            "--crf", (f"{crf:.2f}" if zone_scene["zone"].quarterstep_crf else f"{crf:.0f}"),
-            "--preset", f"{preset}",
-            *zone_scene["zone"].final_dynamic_parameters(zone_scene["start_frame"],
-                                                         zone_scene["end_frame"],
-                                                         crf,
-                                                         scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                         scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                         scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                         scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
-        ],
-        "photon_noise": zone_scene["zone"].final_dynamic_photon_noise(zone_scene["start_frame"],
-                                                                      zone_scene["end_frame"],
-                                                                      scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                      scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                      scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
-                                                                      scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]),
-        "photon_noise_height": zone_scene["zone"].final_photon_noise_height,
-        "photon_noise_width": zone_scene["zone"].final_photon_noise_width,
-        "chroma_noise": zone_scene["zone"].final_chroma_noise,
-        "extra_splits_len": zone_scene["zone"].scene_detection_extra_split,
-        "min_scene_len": zone_scene["zone"].scene_detection_min_scene_len
-    }
-    if zone_scene["zone"].character_enable and zone["zone"].character_roi_boost_max:
-        final_scenes["scenes"][scene_n]["zone_overrides"]["video_params"] += ["--roi-map-file", str(roi_map_file)]
-    
-final_scenes["split_scenes"] = final_scenes["scenes"]
-with scenes_file.open("w") as scenes_f:
-    json.dump(final_scenes, scenes_f, cls=NumpyEncoder)
-
-print(f"\r\033[K{scene_frame_print(scene_n)} / Boost calculation complete / {(scene_n + 1) / (time.time() - start):.0f} scenes per second", end="\n", flush=True)
-
-for section in range((nonzero_crf_frames := np.nonzero(final_crf_frames)[0])[0], nonzero_crf_frames[-1] + 1):
-    print(f"\r\033[KFrame [{frame_rjust(scenes["scenes"][0]["start_frame"])}:{frame_rjust(scenes["scenes"][-1]["end_frame"])}] / Boosting result", end="", flush=True)
-    if section == final_crf_frames.shape[0] - 1:
-        print(f" / --crf  {section * 10:.2f}+         ", end="", flush=True)
-    else:
-        print(f" / --crf [{section * 10:>5.2f} ~ {(section + 1) * 10 - 0.25:>5.2f}] ", end="", flush=True)
-    print(f"{frame_rjust(final_crf_frames[section])} frames", end="\n", flush=True)
-
-print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / Progression Boost finished", end="\n", flush=True)
+# The scene detection, probing, metric and character engines are shared
+# with Progressive-Scene-Detection and the other Progression Boost
+# preset, and live in `progression_boost/engine.py` next to this script.
+# It runs here with the config above.
+progression_boost.run(progression_boost.Context(
+    program_name="Progression Boost",
+    scene_detection_only=False,
+    verbose=verbose,
+    resume=resume,
+    input_file=input_file,
+    probing_input_file=probing_input_file,
+    probing_input_vspipe_args=probing_input_vspipe_args,
+    scene_detection_input_file=scene_detection_input_file,
+    scene_detection_vspipe_args=scene_detection_vspipe_args,
+    input_scenes_file=input_scenes_file,
+    scenes_file=scenes_file,
+    roi_maps_dir=roi_maps_dir,
+    zones_file=zones_file,
+    zones_string=zones_string,
+    zones_spec=zones_spec,
+    zone_default=zone_default,
+    scene_detection_temp_dir=scene_detection_temp_dir,
+    progression_boost_temp_dir=progression_boost_temp_dir,
+    character_boost_temp_dir=character_boost_temp_dir,
+    retarget=retarget,
+    metric_targets=metric_targets,
+))
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Metric backend benchmark.
+
+Builds deterministic synthetic clips (BlankClip + seeded noise and motion) and
+a distorted counterpart (an SVT-AV1 encode via Av1an, or a synthetic
+degradation with --no-encode), renders both once to lossless Y4M files, then
+runs every metric backend used by Auto-Boost-Av1an.py's calculate_metric() at
+each requested worker count. Only the metric is timed.
+
+Every case runs in its own subprocess so peak RSS is measured per case.
+Results (fps, peak RSS, per-frame score deltas against a reference backend)
+are written as JSON so runs can be diffed across plugin upgrades.
+
+Usage:
+    python tools/metric-benchmark.py --workers 1,4 -o bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import subprocess
+import concurrent.futures
+from pathlib import Path
+
+import numpy as np
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).parent.parent.resolve()
+TOOLS_DIR = BASE_DIR / "tools"
+TEMP_DIR = TOOLS_DIR / "metric_bench_temp"
+DEFAULT_OUTPUT = TOOLS_DIR / "metric-benchmark.json"
+
+BACKENDS = ["xpsnr", "vs-zip", "fssimu2", "vs-hip"]
+# Backend every other backend of the same metric is compared against
+REFERENCE_BACKEND = {"xpsnr": "xpsnr", "ssimu2": "vs-zip"}
+METRIC_OF = {"xpsnr": "xpsnr", "vs-zip": "ssimu2", "fssimu2": "ssimu2", "vs-hip": "ssimu2"}
+
+
+# --- SYNTHETIC CLIPS ---
+def synthetic_clip(frames: int, width: int, height: int, seed: int):
+    """
+    Gradient + moving bars + per-frame seeded noise. Identical on every run
+    and every machine for the same arguments.
+    """
+    import vapoursynth as vs
+
+    core = vs.core
+    blank = core.std.BlankClip(
+        width=width, height=height, format=vs.YUV420P8, length=frames, fpsnum=24000, fpsden=1001
+    )
+
+    yy, xx = np.mgrid[0:height, 0:width]
+    gradient = (xx * 160 // max(1, width - 1) + 48).astype(np.int16)
+    cyy, cxx = np.mgrid[0 : height // 2, 0 : width // 2]
+
+    def draw(n, f):
+        rng = np.random.default_rng(seed + n)
+        fout = f.copy()
+
+        luma = gradient + 40 * (((xx + n * 7) // 64 + yy // 64) % 2)
+        luma = luma + rng.normal(0, 6, luma.shape)
+        np.copyto(np.asarray(fout[0]), np.clip(luma, 16, 235).astype(np.uint8))
+
+        for plane, phase in [(1, 0), (2, 32)]:
+            chroma = 128 + 24 * np.sin((cxx + cyy + n * 3 + phase) / 24)
+            chroma = chroma + rng.normal(0, 3, chroma.shape)
+            np.copyto(np.asarray(fout[plane]), np.clip(chroma, 16, 240).astype(np.uint8))
+        return fout
+
+    return core.std.ModifyFrame(blank, blank, draw)
+
+
+def degraded_clip(clip, seed: int):
+    """
+    Deterministic stand-in for an encode: blur plus frame dependent noise.
+    """
+    import vapoursynth as vs
+
+    core = vs.core
+    blurred = core.std.BoxBlur(clip, hradius=1, vradius=1)
+
+    def draw(n, f):
+        rng = np.random.default_rng(seed * 7919 + n)
+        fout = f.copy()
+        strength = 2 + 6 * ((n // 24) % 3)
+        for plane in range(fout.format.num_planes):
+            a = np.asarray(fout[plane]).astype(np.int16)
+            a = a + rng.normal(0, strength, a.shape).astype(np.int16)
+            np.copyto(np.asarray(fout[plane]), np.clip(a, 0, 255).astype(np.uint8))
+        return fout
+
+    return core.std.ModifyFrame(blurred, blurred, draw)
+
+
+def build_clips(settings: dict):
+    import vapoursynth as vs
+
+    core = vs.core
+    src = synthetic_clip(settings["frames"], settings["width"], settings["height"], settings["seed"])
+    if settings["encoded"]:
+        enc = core.ffms2.Source(source=settings["encoded"], cache=False)
+    else:
+        enc = degraded_clip(src, settings["seed"])
+    return src, enc
+
+
+def render_intermediates(settings: dict) -> None:
+    """
+    Renders the reference and distorted clips once to lossless Y4M files, so
+    the synthetic frame generation and the AV1 decode are not part of any timing.
+    """
+    TEMP_DIR.mkdir(exist_ok=True)
+    src, enc = build_clips(settings)
+    for clip, name in [(src, "reference"), (enc, "distorted")]:
+        path = TEMP_DIR / f"{name}.y4m"
+        print(f"   Rendering {name} clip...", file=sys.stderr)
+        with open(path, "wb") as f:
+            clip.output(f, y4m=True)
+        settings[name] = str(path)
+
+
+def load_clips(settings: dict):
+    import vapoursynth as vs
+
+    core = vs.core
+    src = core.ffms2.Source(source=settings["reference"], cache=False)
+    enc = core.ffms2.Source(source=settings["distorted"], cache=False)
+    return src, enc
+
+
+def run_encode(settings: dict) -> Path | None:
+    """
+    Encodes the synthetic clip with Av1an the same way the fast pass does.
+    """
+    av1an_exe = shutil.which("av1an")
+    if not av1an_exe:
+        print("av1an not found in PATH, using synthetic degradation instead.", file=sys.stderr)
+        return None
+
+    TEMP_DIR.mkdir(exist_ok=True)
+    vpy_path = TEMP_DIR / "synthetic.vpy"
+    output_file = TEMP_DIR / "synthetic_fastpass.mkv"
+    with open(vpy_path, "w") as f:
+        f.write(
+            "import sys, importlib\n"
+            f"sys.path.insert(0, r\"{TOOLS_DIR}\")\n"
+            "bench = importlib.import_module(\"metric-benchmark\")\n"
+            f"bench.synthetic_clip({settings['frames']}, {settings['width']}, {settings['height']}, {settings['seed']}).set_output()\n"
+        )
+
+    cmd = [
+        av1an_exe, "-i", str(vpy_path), "-e", "svt-av1", "-c", "mkvmerge",
+        "-w", "1", "--split-method", "none", "-y",
+        "-v", "--preset 10 --crf 35", "-o", str(output_file),
+    ]
+    try:
+        subprocess.run(cmd, check=True, cwd=TEMP_DIR, stdout=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        print("Encode failed, using synthetic degradation instead.", file=sys.stderr)
+        return None
+    return output_file
+
+
+# --- CASES ---
+def _ssimu2_score(f):
+    for key in ["_SSIMULACRA2", "SSIMULACRA2"]:
+        if key in f.props:
+            return float(f.props[key])
+    raise KeyError("No SSIMULACRA2 score in the frame props")
+
+
+def _render(result, read_score, scores):
+    from vstools import clip_async_render
+
+    def callback(n, f):
+        scores[n] = read_score(f)
+
+    clip_async_render(result, outfile=None, callback=callback)
+
+
+def case_xpsnr(src, enc, workers):
+    import vapoursynth as vs
+
+    vs.core.num_threads = workers
+    scores = [None] * src.num_frames
+    result = vs.core.vszip.XPSNR(src, enc, temporal=False, verbose=False)
+    _render(result, lambda f: min(float(f.props["XPSNR_Y"]), 100.0), scores)
+    return scores
+
+
+def case_vszip(src, enc, workers):
+    import vapoursynth as vs
+
+    vs.core.num_threads = workers
+    scores = [None] * src.num_frames
+    ref = src.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+    dist = enc.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+    result = vs.core.vszip.SSIMULACRA2(ref, dist)
+    _render(result, _ssimu2_score, scores)
+    return scores
+
+
+def case_vship(src, enc, workers):
+    import vapoursynth as vs
+
+    scores = [None] * src.num_frames
+    ref = src.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+    dist = enc.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+    result = vs.core.vship.SSIMULACRA2(ref, dist, numStream=workers)
+    _render(result, _ssimu2_score, scores)
+    return scores
+
+
+def case_fssimu2(src, enc, workers):
+    import vapoursynth as vs
+
+    fssimu2_exe = shutil.which("fssimu2")
+    if not fssimu2_exe:
+        raise RuntimeError("fssimu2 not found in PATH")
+
+    TEMP_DIR.mkdir(exist_ok=True)
+    ref = src.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+    dist = enc.resize.Bicubic(format=vs.RGB24, matrix_in_s="709")
+
+    def write_pam(frame, filepath):
+        packed = np.dstack(
+            (np.asarray(frame[0]), np.asarray(frame[1]), np.asarray(frame[2]))
+        ).tobytes()
+        header = (
+            f"P7\nWIDTH {frame.width}\nHEIGHT {frame.height}\nDEPTH 3\nMAXVAL 255\nTUPLTYPE RGB\nENDHDR\n"
+        ).encode()
+        with open(filepath, "wb") as f:
+            f.write(header)
+            f.write(packed)
+
+    def process_frame(n):
+        r_path = TEMP_DIR / f"ref_{n}.pam"
+        d_path = TEMP_DIR / f"dist_{n}.pam"
+        try:
+            write_pam(ref.get_frame(n), r_path)
+            write_pam(dist.get_frame(n), d_path)
+            res = subprocess.run(
+                [fssimu2_exe, str(r_path), str(d_path)],
+                capture_output=True, text=True, check=True,
+            )
+            return n, float(res.stdout.strip() or res.stderr.strip())
+        finally:
+            r_path.unlink(missing_ok=True)
+            d_path.unlink(missing_ok=True)
+
+    scores = [None] * src.num_frames
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+        for n, score in ex.map(process_frame, range(src.num_frames)):
+            scores[n] = score
+    return scores
+
+
+CASES = {"xpsnr": case_xpsnr, "vs-zip": case_vszip, "fssimu2": case_fssimu2, "vs-hip": case_vship}
+
+
+def run_case(backend: str, workers: int, settings: dict) -> dict:
+    """
+    Runs one backend at one worker count. Called inside a fresh subprocess.
+    """
+    import vapoursynth as vs
+
+    if backend == "xpsnr" or backend == "vs-zip":
+        if not hasattr(vs.core, "vszip"):
+            raise RuntimeError("vs-zip plugin not found")
+    if backend == "vs-hip" and not hasattr(vs.core, "vship"):
+        raise RuntimeError("vship plugin not found")
+
+    # Both clips are read from the lossless intermediates, the source filter
+    # indexes them here so only the metric is timed
+    src, enc = load_clips(settings)
+
+    start = time.perf_counter()
+    scores = CASES[backend](src, enc, workers)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss_unit = 1 if platform.system() == "Darwin" else 1024
+    return {
+        "backend": backend,
+        "metric": METRIC_OF[backend],
+        "workers": workers,
+        "frames": len(scores),
+        "seconds": elapsed,
+        "fps": len(scores) / elapsed if elapsed > 0 else 0.0,
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * rss_unit,
+        "peak_rss_children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * rss_unit,
+        "scores": scores,
+    }
+
+
+# --- AGGREGATION ---
+def score_deltas(results: list[dict]) -> None:
+    """
+    Adds per-frame deltas against the reference backend of the same metric
+    (lowest worker count run), so drift between backends or plugin versions shows up.
+    """
+    for metric, reference_backend in REFERENCE_BACKEND.items():
+        references = [
+            r for r in results
+            if r["metric"] == metric and r["backend"] == reference_backend and "scores" in r
+        ]
+        if not references:
+            continue
+        reference = np.array(min(references, key=lambda r: r["workers"])["scores"], dtype=np.float64)
+        for result in results:
+            if result["metric"] != metric or "scores" not in result:
+                continue
+            delta = np.array(result["scores"], dtype=np.float64) - reference
+            result["delta_reference"] = f"{reference_backend}"
+            result["delta_mean_abs"] = float(np.mean(np.abs(delta)))
+            result["delta_max_abs"] = float(np.max(np.abs(delta)))
+            result["deltas"] = delta.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the metric backends on synthetic clips")
+    parser.add_argument("--frames", type=int, default=240, help="Synthetic clip length | Default: 240")
+    parser.add_argument("--width", type=int, default=1920, help="Synthetic clip width | Default: 1920")
+    parser.add_argument("--height", type=int, default=1080, help="Synthetic clip height | Default: 1080")
+    parser.add_argument("--seed", type=int, default=1188246, help="Noise seed | Default: 1188246")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help=f"Comma separated | Default: {','.join(BACKENDS)}")
+    parser.add_argument("--workers", default="1,4", help="Comma separated worker counts | Default: 1,4")
+    parser.add_argument("--no-encode", action="store_true", help="Use a synthetic degradation instead of an SVT-AV1 encode")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_OUTPUT), help="JSON result path")
+    parser.add_argument("--run-case", nargs=2, metavar=("BACKEND", "WORKERS"), help=argparse.SUPPRESS)
+    parser.add_argument("--settings", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        settings = json.loads(args.settings)
+        try:
+            result = run_case(args.run_case[0], int(args.run_case[1]), settings)
+        except Exception as e:
+            result = {"backend": args.run_case[0], "workers": int(args.run_case[1]), "error": str(e)}
+        print("RESULT:" + json.dumps(result))
+        return
+
+    settings = {"frames": args.frames, "width": args.width, "height": args.height, "seed": args.seed, "encoded": None}
+    if TEMP_DIR.exists():
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+    try:
+        if not args.no_encode:
+            encoded = run_encode(settings)
+            settings["encoded"] = str(encoded) if encoded else None
+        render_intermediates(settings)
+
+        results = []
+        for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+            if backend not in CASES:
+                print(f"Unknown backend {backend}, skipping.", file=sys.stderr)
+                continue
+            for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+                print(f"   Benchmarking {backend} ({workers} workers)...", file=sys.stderr)
+                proc = subprocess.run(
+                    [sys.executable, __file__, "--run-case", backend, str(workers), "--settings", json.dumps(settings)],
+                    capture_output=True, text=True, cwd=BASE_DIR,
+                )
+                result = None
+                for line in proc.stdout.splitlines():
+                    if line.startswith("RESULT:"):
+                        result = json.loads(line[len("RESULT:"):])
+                if result is None:
+                    result = {"backend": backend, "workers": workers, "error": proc.stderr.strip()[-500:]}
+                result.setdefault("metric", METRIC_OF[backend])
+                results.append(result)
+
+                if "error" in result:
+                    print(f"   [{backend}] failed: {result['error']}", file=sys.stderr)
+                else:
+                    print(
+                        f"   [{backend}] FPS: {result['fps']:.2f} | Workers: {workers} | Peak RSS: {result['peak_rss'] / 1024 ** 2:.0f} MiB",
+                        file=sys.stderr,
+                    )
+
+        score_deltas(results)
+
+        import vapoursynth as vs
+
+        output = {
+            "system": {
+                "platform": platform.platform(),
+                "python": sys.version.split()[0],
+                "cpu_count": os.cpu_count(),
+                "vapoursynth": str(vs.core.version_number()),
+            },
+            "clip": {k: v for k, v in settings.items() if k not in ["encoded", "reference", "distorted"]}
+            | {"encoded": settings["encoded"] is not None},
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"\nResults written to {args.output}", file=sys.stderr)
+    finally:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
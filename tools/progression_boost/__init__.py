@@ -0,0 +1,3 @@
+from .engine import Context, metric_interpolate_scenes, run
+
+__all__ = ["Context", "metric_interpolate_scenes", "run"]
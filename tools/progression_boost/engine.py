@@ -0,0 +1,3975 @@
+# Progression Boost
+# Copyright (c) Akatsumekusa and contributors
+# Thanks to Ironclad and their grav1an, Miss Moonlight and their Lav1e,
+# Trix and their autoboost, and BoatsMcGee and their Normal-Boost.
+
+
+# ---------------------------------------------------------------------
+# ---------------------------------------------------------------------
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+# 
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------
+# ---------------------------------------------------------------------
+
+
+# This is the engine shared by both Progression Boost presets and
+# Progressive Scene Detection. There is nothing to configure here. All
+# the config lives in the preset scripts, which call `run` with a
+# `Context` as the last step after they have parsed the commandline and
+# set up `zones_spec`.
+#
+# `program_name` in the `Context` is used for the messages printed, and
+# `scene_detection_only` writes the scenes to `--output-scenes` and
+# returns right after scene detection.
+
+
+import copy
+from dataclasses import dataclass
+from datetime import datetime
+import heapq
+import json
+import math
+import mmap
+import numpy as np
+from numpy.polynomial import Polynomial
+from numpy.random import default_rng
+import os
+from pathlib import Path
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import Optional
+import vapoursynth as vs
+from vapoursynth import core
+
+if platform.system() == "Linux":
+    import fcntl
+
+class NumpyEncoder(json.JSONEncoder):
+    def default(self, object):
+        if isinstance(object, np.generic):
+            return object.item()
+        if isinstance(object, np.ndarray):
+            return object.tolist()
+        else:
+            return super(NumpyEncoder, self).default(object)
+
+# Results that are filled in scene by scene are kept in append-only JSON
+# lines journals instead of rewriting the whole file after every scene.
+# Each line holds the fields added to one scene, and the journal is
+# replayed on top of the scenes on `--resume`. A line torn by an
+# interrupted write is skipped. Every journal is compacted with
+# `journal_write` right after it's loaded, so that the next append never
+# continues on a torn line.
+def journal_load(journal_file, base):
+    data = copy.deepcopy(base)
+    with journal_file.open("r") as journal_f:
+        for line in journal_f:
+            if not line.endswith("\n"):
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            data["scenes"][entry["scene"]].update(entry["fields"])
+    return data
+
+def journal_append(journal_file, data, scene_n, keys):
+    line = json.dumps({"scene": scene_n, "fields": {key: data["scenes"][scene_n][key] for key in keys}}, cls=NumpyEncoder)
+    with journal_file.open("a") as journal_f:
+        journal_f.write(line + "\n")
+
+# Compacts the journal into one line per scene. It's written to a
+# temporary file first so an interruption leaves the old journal intact.
+def journal_write(journal_file, data):
+    journal_temp_file = journal_file.with_suffix(journal_file.suffix + ".tmp")
+    with journal_temp_file.open("w") as journal_f:
+        for scene_n, scene in enumerate(data["scenes"]):
+            journal_f.write(json.dumps({"scene": scene_n, "fields": scene}, cls=NumpyEncoder) + "\n")
+    journal_temp_file.replace(journal_file)
+
+
+# Interpolates the scores of many scenes with PCHIP, the same as
+# `interpolate.PchipInterpolator`, and evaluates them at every frame
+# from the first to the last frame of each scene. `frames`, `scores`
+# and `scene_ids` are flat arrays with the frames of each scene sorted
+# and kept together, and every scene must have at least two frames.
+# Returns the interpolated scores and the scene of each of them.
+def metric_interpolate_scenes(frames, scores, scene_ids):
+    x = frames.astype(np.float64)
+    y = scores.astype(np.float64)
+    counts = np.bincount(scene_ids)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    # Slopes between the last frame of a scene and the first frame of
+    # the next scene are computed here but never used.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = np.diff(x)
+        m = np.diff(y) / h
+    d = np.zeros_like(y)
+
+    interior = np.ones(x.shape, dtype=bool)
+    interior[starts] = False
+    interior[ends - 1] = False
+    i = np.nonzero(interior)[0]
+    condition = (np.sign(m[i]) != np.sign(m[i - 1])) | (m[i] == 0) | (m[i - 1] == 0)
+    w1 = 2 * h[i] + h[i - 1]
+    w2 = h[i] + 2 * h[i - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        whmean = (w1 / m[i - 1] + w2 / m[i]) / (w1 + w2)
+        d[i] = np.where(condition, 0.0, 1.0 / whmean)
+
+    def edge(h0, h1, m0, m1):
+        edge_d = ((2 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        mask = np.sign(edge_d) != np.sign(m0)
+        mask2 = (np.sign(m0) != np.sign(m1)) & (np.abs(edge_d) > 3.0 * np.abs(m0))
+        return np.where(mask, 0.0, np.where(mask2, 3.0 * m0, edge_d))
+
+    linear = counts == 2
+    d[starts[linear]] = m[starts[linear]]
+    d[starts[linear] + 1] = m[starts[linear]]
+    edge_starts = starts[~linear]
+    edge_ends = ends[~linear] - 1
+    d[edge_starts] = edge(h[edge_starts], h[edge_starts + 1], m[edge_starts], m[edge_starts + 1])
+    d[edge_ends] = edge(h[edge_ends - 1], h[edge_ends - 2], m[edge_ends - 1], m[edge_ends - 2])
+
+    spans = (x[ends - 1] - x[starts]).astype(np.int64) + 1
+    value_scene_ids = np.repeat(np.arange(counts.shape[0]), spans)
+    query = np.repeat(x[starts], spans) + (np.arange(value_scene_ids.shape[0]) - np.repeat(np.cumsum(spans) - spans, spans))
+
+    width = np.max(x) - np.min(x) + 2
+    k = np.searchsorted(x + scene_ids * width, query + value_scene_ids * width, side="right") - 1
+    k = np.minimum(k, (ends - 2)[value_scene_ids])
+
+    hk = h[k]
+    slope = m[k]
+    t = (d[k] + d[k + 1] - 2 * slope) / hk
+    c0 = t / hk
+    c1 = (slope - d[k]) / hk - t
+    s = query - x[k]
+    return y[k] + d[k] * s + c1 * (s * s) + c0 * (s * s * s), value_scene_ids
+
+
+# Everything the engine takes from the preset script. `zone_default`
+# and the zones in `zones_spec` are the preset's `DefaultZone` config.
+# The rest comes from the commandline of the preset. `retarget` and
+# `metric_targets` are only used unless `scene_detection_only` is set.
+@dataclass
+class Context:
+    program_name: str
+    scene_detection_only: bool
+    verbose: int
+    resume: bool
+    input_file: Path
+    probing_input_file: Path
+    probing_input_vspipe_args: Optional[list[str]]
+    scene_detection_input_file: Path
+    scene_detection_vspipe_args: Optional[list[str]]
+    input_scenes_file: Optional[Path]
+    scenes_file: Path
+    roi_maps_dir: Optional[Path]
+    zones_file: Optional[Path]
+    zones_string: Optional[str]
+    zones_spec: dict
+    zone_default: object
+    scene_detection_temp_dir: Path
+    progression_boost_temp_dir: Path
+    character_boost_temp_dir: Path
+    retarget: bool = False
+    metric_targets: Optional[list[float]] = None
+
+
+# Scenes and frames in messages are right justified to the digits of the
+# last scene and the last frame in `scenes`.
+def scene_rjust(scenes, scene):
+    return str(scene).rjust(math.floor(np.log10(len(scenes["scenes"]))) + 1, "0")
+
+def frame_rjust(scenes, frame):
+    return str(frame).rjust(math.floor(np.log10(scenes["frames"])) + 1)
+
+def scene_frame_print(scenes, scene):
+    return f"Scene {scene_rjust(scenes, scene)} Frame [{frame_rjust(scenes, scenes["scenes"][scene]["start_frame"])}:{frame_rjust(scenes, scenes["scenes"][scene]["end_frame"])}]"
+
+
+# Places `source_clip_cache` at `destination` using the first method in
+# `source_clip_cache_reuse_methods` that works. If none works, nothing is
+# placed and av1an indexes the source itself.
+def source_clip_cache_place(context, destination):
+    source = context.zone_default.source_clip_cache.expanduser().resolve()
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    for method in context.zone_default.source_clip_cache_reuse_methods:
+        assert method in ["hardlink", "reflink", "symlink", "copy"], "Invalid `source_clip_cache_reuse_methods`. Please check your config inside `Progression-Boost.py`."
+
+        destination.unlink(missing_ok=True)
+        try:
+            if method == "hardlink":
+                os.link(source, destination)
+            elif method == "reflink":
+                if platform.system() != "Linux":
+                    continue
+                with source.open("rb") as source_f, destination.open("wb") as destination_f:
+                    fcntl.ioctl(destination_f.fileno(), 0x40049409, source_f.fileno()) # FICLONE
+                shutil.copystat(source, destination)
+            elif method == "symlink":
+                destination.symlink_to(source)
+            elif method == "copy":
+                shutil.copy2(source, destination)
+        except OSError:
+            continue
+        return
+    destination.unlink(missing_ok=True)
+
+
+# Parses `--zones` or `--zones-string` into a list of zones covering every
+# frame of the source, filling the gaps with the `"default"` zone.
+def zones_load(context):
+    zones_string = context.zones_string
+    for zone_key in context.zones_spec:
+        if " " in zone_key:
+            assert False, f"Key \"{zone_key}\" in `zones_spec` contains whitespace character ` `. The key for all zones must not contain whitespace character"
+
+    if context.zones_file:
+        with context.zones_file.open("r") as zones_f:
+            zones_string = zones_f.read()
+    if zones_string == "":
+        if context.zones_file:
+            print(f"\r\033[K\033[31mInput `--zones` is empty. Continuing with no zoning...\033[0m", end="\n", flush=True)
+        else:
+            print(f"\r\033[K\033[31mInput `--zones-string` is empty. Continuing with no zoning...\033[0m", end="\n", flush=True)
+
+    if zones_string is not None:
+        zones_list = []
+        zone = []
+        zone_head = 0
+        for item in zones_string.split():
+            if zone_head in [0, 1]:
+                try:
+                    item = int(item)
+                except ValueError:
+                    raise ValueError(f"Invalid zones. Make sure your zones file is correctly written with `start_frame end_frame zones_key`. `zones_key` is not omittable and must not contain whitespaces")
+                zone.append(item)
+                zone_head += 1
+            elif zone_head == 2:
+                zone.append(item)
+                for i in range(len(zones_list)):
+                    if zones_list[i][0] > zone[0]:
+                        zones_list.insert(i, zone)
+                        break
+                else:
+                    zones_list.append(zone)
+                zone = []
+                zone_head = 0
+            else:
+                assert False, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+        if zone_head != 0:
+            raise ValueError(f"Invalid zones. There are too much or two few items in the provided zones")
+    else:
+        zones_list = []
+
+    zones = []
+    frame_head = 0
+    for item in zones_list:
+        if item[0] < frame_head:
+            raise ValueError(f"Repeating section [{item[0]}:{frame_head}] between input zones.")
+        if item[0] > context.zone_default.source_clip.num_frames - 1:
+            print(f"\r\033[KSkipping zones with out of bound start_frame {item[0]}...", end="\n", flush=True)
+
+        if item[1] <= -2:
+            raise ValueError(f"Invalid end_frame in the zones with value {item[1]}")
+        if item[1] > context.zone_default.source_clip.num_frames:
+            print(f"\r\033[K\033[31mOut of bound end_frame {item[1]} in one of the zones provided. Clamp end_frame for the zone to {context.zone_default.source_clip.num_frames}...\033[0m", end="\n", flush=True)
+            print(f"\r\033[KUse `-1` as end_frame to always end the zone at the last frame of the video.", end="\n", flush=True)
+            item[1] = context.zone_default.source_clip.num_frames
+        if item[1] == -1:
+            item[1] = context.zone_default.source_clip.num_frames
+
+        if item[1] <= item[0]:
+            raise ValueError(f"Invalid zone with start_frame {item[0]} and end_frame {item[1]}.")
+
+        if item[2] not in context.zones_spec:
+            raise ValueError(f"Invalid zone with zone_key \"{item[2]}\". This zone_key \"{item[2]}\" does not exist in `zones_spec`.")
+
+        if item[0] != frame_head:
+            zones.append({"start_frame": frame_head,
+                          "end_frame": item[0],
+                          "zone": context.zones_spec["default"]})
+            frame_head = item[0]
+
+        zones.append({"start_frame": item[0],
+                      "end_frame": item[1],
+                      "zone": context.zones_spec[item[2]]})
+        frame_head = item[1]
+
+    if frame_head != context.zone_default.source_clip.num_frames:
+        zones.append({"start_frame": frame_head,
+                      "end_frame": context.zone_default.source_clip.num_frames,
+                      "zone": context.zones_spec["default"]})
+
+    return zones
+
+
+# The luma statistics are stored as a single float32 array of shape
+# (4, num_frames) with the rows being diff, average, min and max. It's
+# loaded memory mapped so that slicing a scene out of it doesn't read the
+# whole file. `luma.json` records which source the statistics belong to,
+# and the store is only reused if the source still matches. The format
+# is the same in Progressive-Scene-Detection and both Progression Boost
+# presets, so a store from one can be copied into the temporary
+# directory of another.
+def luma_store_fingerprint(context):
+    input_stat = context.input_file.stat()
+    return {
+        "source": str(context.input_file.expanduser().resolve()),
+        "size": input_stat.st_size,
+        "mtime": input_stat.st_mtime_ns,
+        "num_frames": context.zone_default.source_clip.num_frames,
+        "width": context.zone_default.source_clip.width,
+        "height": context.zone_default.source_clip.height,
+        "format": context.zone_default.source_clip.format.name
+    }
+
+# Returns the stored luma statistics, or None if there are none for the
+# current source.
+def luma_store_load(context):
+    luma_file = context.scene_detection_temp_dir / "luma.npy"
+    fingerprint_file = context.scene_detection_temp_dir / "luma.json"
+    if not luma_file.exists() or not fingerprint_file.exists():
+        return None
+
+    with fingerprint_file.open("r") as fingerprint_f:
+        fingerprint = json.load(fingerprint_f)
+    if fingerprint != luma_store_fingerprint(context):
+        return None
+    luma = np.load(luma_file, mmap_mode="r")
+    if luma.shape != (4, context.zone_default.source_clip.num_frames):
+        return None
+    return luma
+
+def luma_store_save(context, luma):
+    luma_file = context.scene_detection_temp_dir / "luma.npy"
+    temp_file = luma_file.with_suffix(".tmp")
+    with temp_file.open("wb") as luma_f:
+        np.save(luma_f, luma.astype(np.float32))
+    temp_file.replace(luma_file)
+    with (context.scene_detection_temp_dir / "luma.json").open("w") as fingerprint_f:
+        json.dump(luma_store_fingerprint(context), fingerprint_f)
+
+
+# x264 writes its stats into a `.temp` file and only renames it to
+# `.log` when the segment is finished, so every `.log` that appears is
+# complete and can be read while the other segments are still
+# running. Each log is memory mapped and scanned with one regex over
+# the whole buffer, writing straight into `x264_scenecut`.
+x264_stats_frame_type = re.compile(rb"^in:(\d+) out:\d+ type:(\w)", re.MULTILINE)
+
+def x264_read_scenecut(x264_scenecut, stats_file, start_frame, end_frame, skip_starting_frames):
+    with stats_file.open("rb") as x264_stats_f:
+        if stats_file.stat().st_size == 0:
+            return
+        with mmap.mmap(x264_stats_f.fileno(), 0, access=mmap.ACCESS_READ) as x264_stats:
+            for match in x264_stats_frame_type.finditer(x264_stats):
+                offset_frame = int(match.group(1))
+                assert offset_frame + start_frame < end_frame, "Unexpected result from av1an or x264"
+
+                if offset_frame == 0 and skip_starting_frames:
+                    continue
+
+                if match.group(2) == b"I":
+                    x264_scenecut[offset_frame + start_frame] = 1
+
+
+# AV1's 10 bit DC quantiser lookup, indexed by `--crf` in quarter steps.
+dc = np.array([
+    4,    9,    10,   13,   15,   17,   20,   22,   25,   28,   31,   34,   37,   40,   43,   47,   50,   53,   57,
+    60,   64,   68,   71,   75,   78,   82,   86,   90,   93,   97,   101,  105,  109,  113,  116,  120,  124,  128,
+    132,  136,  140,  143,  147,  151,  155,  159,  163,  166,  170,  174,  178,  182,  185,  189,  193,  197,  200,
+    204,  208,  212,  215,  219,  223,  226,  230,  233,  237,  241,  244,  248,  251,  255,  259,  262,  266,  269,
+    273,  276,  280,  283,  287,  290,  293,  297,  300,  304,  307,  310,  314,  317,  321,  324,  327,  331,  334,
+    337,  343,  350,  356,  362,  369,  375,  381,  387,  394,  400,  406,  412,  418,  424,  430,  436,  442,  448,
+    454,  460,  466,  472,  478,  484,  490,  499,  507,  516,  525,  533,  542,  550,  559,  567,  576,  584,  592,
+    601,  609,  617,  625,  634,  644,  655,  666,  676,  687,  698,  708,  718,  729,  739,  749,  759,  770,  782,
+    795,  807,  819,  831,  844,  856,  868,  880,  891,  906,  920,  933,  947,  961,  975,  988,  1001, 1015, 1030,
+    1045, 1061, 1076, 1090, 1105, 1120, 1137, 1153, 1170, 1186, 1202, 1218, 1236, 1253, 1271, 1288, 1306, 1323, 1342,
+    1361, 1379, 1398, 1416, 1436, 1456, 1476, 1496, 1516, 1537, 1559, 1580, 1601, 1624, 1647, 1670, 1692, 1717, 1741,
+    1766, 1791, 1817, 1844, 1871, 1900, 1929, 1958, 1990, 2021, 2054, 2088, 2123, 2159, 2197, 2236, 2276, 2319, 2363,
+    2410, 2458, 2508, 2561, 2616, 2675, 2737, 2802, 2871, 2944, 3020, 3102, 3188, 3280, 3375, 3478, 3586, 3702, 3823,
+    3953, 4089, 4236, 4394, 4559, 4737, 4929, 5130, 5347
+])
+dc_X = np.arange(dc.shape[0])
+
+
+# Maps a score measured at reduced resolution to full resolution, using
+# the calibration of the zone in `calibration`. Scores are stored mapped,
+# so everything after the metric works on full resolution scores.
+def probing_reduced_map(calibration, zone, score):
+    if zone in calibration:
+        a, b = calibration[zone]
+        return a + b * score
+    else:
+        return score
+
+
+def metric_summarise_scene(context, scenes, zone, scene_n, frames, scores):
+    if context.verbose >= 3:
+        print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Metric summarisation", end="", flush=True)
+    return zone.metric_summarise(frames, scores)
+
+# Summarises the scores of many scenes in the same zone. If the
+# `metric_summarise` of the zone comes with a `metric_summarise_batch`
+# defined next to it, all scenes are summarised in one call.
+# Otherwise, or with `--verbose` level 3 where the details of every
+# scene are printed, `metric_summarise` is called scene by scene.
+def metric_summarise_scenes(context, scenes, zone, scene_ns, frames, scores):
+    if context.verbose < 3:
+        for zone_class in type(zone).__mro__:
+            if "metric_summarise" in vars(zone_class):
+                if "metric_summarise_batch" in vars(zone_class):
+                    return zone.metric_summarise_batch(frames, scores)
+                break
+    return [metric_summarise_scene(context, scenes, zone, scene_n, scene_frames, scene_scores) for scene_n, scene_frames, scene_scores in zip(scene_ns, frames, scores)]
+
+
+# Scenes are rendered together until this many frames are pending,
+# which also limits how much work is lost if the run is interrupted.
+metric_vapoursynth_batch_frames = 4096
+
+# Renders the metric clips of all scenes in `batches` together and stores
+# the summarised score of each scene as `score_key` in `metric_result`.
+# `batches` is emptied afterwards.
+def metric_vapoursynth_run_batches(context, batches, metric_result, metric_result_file, reduced_calibration, score_key):
+    # The batched render is one long clip, so its queue can run much
+    # deeper than the renders of single scenes without draining at
+    # every scene boundary.
+    prefetch = core.num_threads * 2
+    backlog = prefetch * 4
+
+    print(f"\r\033[K{scene_frame_print(metric_result, batches[0][0])} / Calculating metric for {len(batches)} scenes in one render", end="", flush=True)
+
+    if len(batches) == 1:
+        clip = batches[0][2]
+    else:
+        clip = core.std.Splice([scene_clip for _, _, scene_clip in batches], mismatch=True)
+    frame_metrics = [zone_scene["zone"].metric_vapoursynth_metric for _, zone_scene, scene_clip in batches for _ in range(scene_clip.num_frames)]
+    scores = np.array([frame_metrics[i](frame) for i, frame in enumerate(clip.frames(prefetch=prefetch, backlog=backlog))])
+
+    zones_batch = {}
+    frames_head = 0
+    for scene_n, zone_scene, scene_clip in batches:
+        zones_batch.setdefault(zone_scene["zone"], []).append((scene_n, np.array(metric_result["scenes"][scene_n]["frames"]), scores[frames_head:frames_head + scene_clip.num_frames]))
+        frames_head += scene_clip.num_frames
+    for zone, zone_batch in zones_batch.items():
+        summaries = metric_summarise_scenes(context, metric_result, zone, [scene_n for scene_n, _, _ in zone_batch], [scene_frames for _, scene_frames, _ in zone_batch], [scene_scores for _, _, scene_scores in zone_batch])
+        for (scene_n, _, _), summary in zip(zone_batch, summaries):
+            metric_result["scenes"][scene_n][score_key] = probing_reduced_map(reduced_calibration, zone, summary)
+            journal_append(metric_result_file, metric_result, scene_n, [score_key])
+    batches.clear()
+
+
+def metric_ffvship_source_cache(context):
+    return context.progression_boost_temp_dir / "metric-ffvship-source.ffindex"
+
+def metric_ffvship_run(context, encoded_file, encoded_cache, zone, source_indices, reference_offset):
+    output_file = context.progression_boost_temp_dir / "metric-ffvship.json"
+    output_file.unlink(missing_ok=True)
+
+    command = [
+        "FFVship",
+        "--source", context.input_file,
+        "--encoded", encoded_file,
+        "--cache-index",
+        "--source-index", metric_ffvship_source_cache(context),
+        "--encoded-index", encoded_cache,
+        "--metric", zone.metric_ffvship_calculate
+    ]
+    if zone.metric_ffvship_calculate == "Butteraugli" and zone.metric_ffvship_intensity_target is not None:
+        command += ["--intensity-target", str(zone.metric_ffvship_intensity_target)]
+    command += [
+        "--json", output_file,
+        "--source-indices", ",".join([str(frame) for frame in source_indices]),
+        "--encoded-offset", str(-reference_offset),
+        *zone.metric_ffvship_extra_parameters
+    ]
+    subprocess.run(command, text=True, stdout=subprocess.DEVNULL)
+    assert output_file.exists()
+
+    with output_file.open("r") as metric_output_f:
+        return json.load(metric_output_f)
+
+# Scenes can share one FFVship run if the command line apart from `--source-indices` is the same.
+def metric_ffvship_batch_key(zone, reference_offset):
+    return (zone.metric_ffvship_calculate,
+            zone.metric_ffvship_intensity_target if zone.metric_ffvship_calculate == "Butteraugli" else None,
+            tuple(zone.metric_ffvship_extra_parameters),
+            reference_offset)
+
+# Runs FFVship once for every group in `batches` and stores the summarised
+# score of each scene as `score_key` in `metric_result`. `batches` is
+# emptied afterwards.
+def metric_ffvship_run_batches(context, batches, encoded_file, encoded_cache, metric_result, metric_result_file, reduced_calibration, score_key):
+    for (_, _, _, reference_offset), batch in batches.items():
+        print(f"\r\033[K{scene_frame_print(metric_result, batch[0][0])} / Calculating metric for {len(batch)} scenes in one FFVship run", end="", flush=True)
+
+        source_indices = np.concatenate([np.array(metric_result["scenes"][scene_n]["frames"]) + zone_scene["start_frame"] for scene_n, zone_scene in batch])
+        frames = metric_ffvship_run(context, encoded_file, encoded_cache, batch[0][1]["zone"], source_indices, reference_offset)
+        assert len(frames) == source_indices.shape[0], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+        zones_batch = {}
+        frames_head = 0
+        for scene_n, zone_scene in batch:
+            scene_frames = np.array(metric_result["scenes"][scene_n]["frames"])
+            scores = np.array([zone_scene["zone"].metric_ffvship_metric(frame) for frame in frames[frames_head:frames_head + scene_frames.shape[0]]])
+            frames_head += scene_frames.shape[0]
+            zones_batch.setdefault(zone_scene["zone"], []).append((scene_n, scene_frames, scores))
+        for zone, zone_batch in zones_batch.items():
+            summaries = metric_summarise_scenes(context, metric_result, zone, [scene_n for scene_n, _, _ in zone_batch], [scene_frames for _, scene_frames, _ in zone_batch], [scene_scores for _, _, scene_scores in zone_batch])
+            for (scene_n, _, _), summary in zip(zone_batch, summaries):
+                metric_result["scenes"][scene_n][score_key] = probing_reduced_map(reduced_calibration, zone, summary)
+                journal_append(metric_result_file, metric_result, scene_n, [score_key])
+    batches.clear()
+
+
+# Without `--metric-target`, or with a single target, the result is
+# written to `--output-scenes`. With several targets, one scenes file is
+# written for each target, named after `--output-scenes` with the target
+# inserted.
+def final_scenes_files(context):
+    if not context.metric_targets:
+        final_outputs = [(None, context.scenes_file)]
+    elif len(context.metric_targets) == 1:
+        final_outputs = [(context.metric_targets[0], context.scenes_file)]
+    else:
+        final_outputs = []
+        for final_target in context.metric_targets:
+            final_scenes_file = context.scenes_file.with_suffix("")
+            if final_scenes_file.suffix.lower() == ".scenes":
+                final_scenes_file = final_scenes_file.with_name(f"{final_scenes_file.stem}.{final_target:g}{final_scenes_file.suffix}{context.scenes_file.suffix}")
+            else:
+                final_scenes_file = context.scenes_file.with_name(f"{context.scenes_file.stem}.{final_target:g}{context.scenes_file.suffix}")
+            final_outputs.append((final_target, final_scenes_file))
+    return final_outputs
+
+
+# Calculates the final `--crf` and parameters of every scene and writes
+# them to `final_scenes_file`. `final_target` replaces the `metric_target`
+# of every zone unless it's None. `luma` is the luma statistics of the
+# source, and `metric_result` and `character_kyara` are None if no zone
+# enables Progression Boost or Character Boost.
+def final_write_scenes(context, scenes, zone_scenes, luma, metric_result, character_kyara, final_target, final_scenes_file):
+    verbose = context.verbose
+    scene_detection_diffs, scene_detection_average, scene_detection_min, scene_detection_max = luma
+
+    if final_target is not None:
+        print(f"\r\033[KFrame [{frame_rjust(scenes, scenes["scenes"][0]["start_frame"])}:{frame_rjust(scenes, scenes["scenes"][-1]["end_frame"])}] / Boosting for `metric_target` {final_target:g}", end="\n", flush=True)
+
+    final_scenes = copy.deepcopy(scenes)
+    roi_maps_npz = {}
+    final_crf_frames = np.zeros((10,), dtype=np.int32)
+    start = time.time() - 0.000001
+    for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+        if verbose < 1:
+            print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Calculating boost / {scene_n / (time.time() - start):.0f} scenes per second", end="", flush=True)
+        if verbose >= 1:
+            print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Calculating boost / --crf / ", end="", flush=True)
+
+        if zone_scene["zone"].character_enable:
+            # `character_map` in the front so that it is accessible in `metric_dynamic_crf` and `metric_dynamic_preset`.
+            character_map_file = context.character_boost_temp_dir / f"character-{scene_rjust(scenes, scene_n)}.npy"
+            assert character_map_file.exists(), "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+            character_map = np.load(character_map_file)
+
+        if zone_scene["zone"].metric_enable:
+            assert "first_qstep" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+            assert "first_score" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+            assert "second_qstep" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+            assert "second_score" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+            if verbose >= 1:
+                print(f"Progression Boost ", end="", flush=True)
+
+            def metric_linear():
+                fit = Polynomial.fit([metric_result["scenes"][scene_n]["first_score"], metric_result["scenes"][scene_n]["second_score"]],
+                                     [metric_result["scenes"][scene_n]["first_qstep"], metric_result["scenes"][scene_n]["second_qstep"]],
+                                     1)
+                qstep = fit(offset_metric_target)
+
+                crf = np.interp(qstep, dc, dc_X) / 4
+                crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
+                preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
+                                                                  zone_scene["end_frame"],
+                                                                  crf,
+                                                                  scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                  scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                  scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                  scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+                if verbose >= 1:
+                    print(f"{crf:>5.2f} / ", end="", flush=True)
+
+                if qstep > 163:
+                    if zone_scene["zone"].probing_preset >= 8:
+                        if preset <= -1:
+                            qstep = (qstep - 163) * 0.69 + 163
+                        elif preset <= 0:
+                            qstep = (qstep - 163) * 0.70 + 163
+                        elif preset <= 2:
+                            qstep = (qstep - 163) * 0.73 + 163
+                        elif preset <= 6:
+                            qstep = (qstep - 163) * 0.81 + 163
+                    elif zone_scene["zone"].probing_preset >= 6:
+                        if preset <= -1:
+                            qstep = (qstep - 163) * 0.72 + 163
+                        elif preset <= 0:
+                            qstep = (qstep - 163) * 0.73 + 163
+                        elif preset <= 2:
+                            qstep = (qstep - 163) * 0.76 + 163
+                        elif preset <= 5:
+                            qstep = (qstep - 163) * 0.84 + 163
+                    elif zone_scene["zone"].probing_preset >= 5:
+                        if preset <= -1:
+                            qstep = (qstep - 163) * 0.82 + 163
+                        elif preset <= 0:
+                            qstep = (qstep - 163) * 0.83 + 163
+                        elif preset <= 2:
+                            qstep = (qstep - 163) * 0.86 + 163
+                    elif zone_scene["zone"].probing_preset >= 3:
+                        if preset <= -1:
+                            qstep = (qstep - 163) * 0.90 + 163
+                        elif preset <= 0:
+                            qstep = (qstep - 163) * 0.91 + 163
+                        elif preset <= 2:
+                            qstep = (qstep - 163) * 0.94 + 163
+
+                    crf = np.interp(qstep, dc, dc_X) / 4
+                    crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
+
+                if verbose >= 1:
+                    print(f"readjusted {crf:>5.2f} / ", end="", flush=True)
+
+                return crf, preset
+
+            # Panning Rejection
+            luma_diff = scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]
+            luma_diff = np.percentile(luma_diff, 25)
+            metric_target_offset_hiritsu = np.interp(luma_diff, [0.004, 0.010, 0.028, 0.034],
+                                                                [0.0,   1.0,   1.0,   0.4])
+            final_metric_target = zone_scene["zone"].metric_target if final_target is None else final_target
+
+
+            if metric_result["scenes"][scene_n]["first_qstep"] < metric_result["scenes"][scene_n]["second_qstep"]:
+                if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["first_score"], metric_result["scenes"][scene_n]["second_score"]):
+                    if metric_target_offset_hiritsu == 0.0:
+                        if verbose >= 1:
+                            print(f"original ", end="", flush=True)
+                        offset_metric_target = final_metric_target
+                    else:
+                        if verbose >= 3:
+                            print(f"{luma_diff:.3f} ", end="", flush=True)
+                        if verbose >= 1:
+                            print(f"panning rejected ", end="", flush=True)
+                        offset_metric_target = final_metric_target + 0.20 * \
+                                                                                  zone_scene["zone"].metric_panning_rejection_sigma * \
+                                                                                  metric_target_offset_hiritsu * \
+                                                                                  (metric_result["scenes"][scene_n]["second_score"] - metric_result["scenes"][scene_n]["first_score"])
+
+                    crf, preset = metric_linear()
+                else:
+                    crf = np.interp(np.mean([metric_result["scenes"][scene_n]["first_qstep"], metric_result["scenes"][scene_n]["second_qstep"]]), dc, dc_X) / 4
+                    crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
+                    preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
+                                                                      zone_scene["end_frame"],
+                                                                      crf,
+                                                                      scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+                    if verbose >= 1:
+                        print(f"fallback {crf:>5.2f} / ", end="", flush=True)
+            else: # second_qstep < first_qstep
+                if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["second_score"], metric_result["scenes"][scene_n]["first_score"]):
+                    if metric_target_offset_hiritsu == 0.0:
+                        if verbose >= 1:
+                            print(f"original ", end="", flush=True)
+                        offset_metric_target = final_metric_target
+                    else:
+                        if verbose >= 3:
+                            print(f"{luma_diff:.3f} ", end="", flush=True)
+                        if verbose >= 1:
+                            print(f"panning rejected ", end="", flush=True)
+                        offset_metric_target = final_metric_target + 0.40 * \
+                                                                                  zone_scene["zone"].metric_panning_rejection_sigma * \
+                                                                                  metric_target_offset_hiritsu * \
+                                                                                  (metric_result["scenes"][scene_n]["first_score"] - metric_result["scenes"][scene_n]["second_score"])
+
+                    crf, preset = metric_linear()
+                else:
+                    crf = zone_scene["zone"].metric_unreliable_crf_fallback()
+                    crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
+                    preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
+                                                                      zone_scene["end_frame"],
+                                                                      crf,
+                                                                      scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                      scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+                    if verbose >= 1:
+                        print(f"fallback {crf:>5.2f} / ", end="", flush=True)
+            new_crf = zone_scene["zone"].metric_dynamic_crf(zone_scene["start_frame"],
+                                                            zone_scene["end_frame"],
+                                                            crf,
+                                                            scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                            scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                            scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                            scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+            if new_crf != crf:
+                crf = new_crf
+                print(f"dynamic {crf:>5.2f} / ", end="", flush=True)
+        else:
+            crf = zone_scene["zone"].metric_disabled_base_crf
+            crf = np.clip(crf, zone_scene["zone"].metric_min_crf, zone_scene["zone"].metric_max_crf)
+            preset = zone_scene["zone"].metric_dynamic_preset(zone_scene["start_frame"],
+                                                              zone_scene["end_frame"],
+                                                              crf,
+                                                              scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                              scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                              scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                              scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+            if verbose >= 1:
+                print(f"Starting {crf:>5.2f} / ", end="", flush=True)
+
+        if zone_scene["zone"].character_enable:
+            if verbose >= 1:
+                print(f"Character Boost ", end="", flush=True)
+
+            # Reading `character_map` is moved to before Progression Boost module.
+            character_map_filled = character_map.copy()
+            a_last_filled = None
+            for i, a in enumerate(character_map):
+                if np.any((a_nan := np.isnan(a))):
+                    assert np.all(a_nan), "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+                    assert a_last_filled is not None, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+                    character_map_filled[i] = a_last_filled
+                else:
+                    a_last_filled = a
+
+            if character_map_filled.shape[0] >= 2:
+                character_map_filled_diff = np.sum(np.abs(np.diff(character_map_filled, axis=0)), axis=1)
+                character_map_filled_sum = ((sum_filled := np.sum(character_map_filled, axis=1))[1:] + sum_filled[:-1]) / 2
+            else:
+                character_map_filled_diff = np.array([0], dtype=np.float64)
+                character_map_filled_sum = np.sum(character_map_filled, axis=1)
+
+            if zone_scene["zone"].character_roi_boost_max:
+                character_roi_diff = np.divide(character_map_filled_diff, character_map_filled_sum, out=np.zeros_like(character_map_filled_diff), where=character_map_filled_sum != 0)
+                character_roi_high_diff = np.zeros((math.ceil(character_map_filled.shape[0] / 8) * 8 + 1,), dtype=bool)
+
+                for i, diff in enumerate(character_roi_diff):
+                    if diff > 0.10:
+                        character_roi_high_diff[i + 1] = True
+                        character_roi_high_diff[[math.floor((i + 1) / 2) * 2, math.ceil((i + 1) / 2) * 2]] = True
+                        character_roi_high_diff[[math.floor((i + 1) / 4) * 4, math.ceil((i + 1) / 4) * 4]] = True
+                        character_roi_high_diff[[math.floor((i + 1) / 8) * 8, math.ceil((i + 1) / 8) * 8]] = True
+
+                uniform_offset = zone_scene["zone"].character_roi_boost_max // 2.0
+                uniform_nonboosting_offset = zone_scene["zone"].character_roi_boost_max // 1.2
+                uniform_ending_nonboosting_offset = zone_scene["zone"].character_roi_boost_max // 4.8
+                character_key_multiplier = 1.00
+                character_32_multiplier = 0.90
+                character_16_multiplier = 0.70
+                character_high_diff_8_multiplier = 0.60
+                character_high_diff_4_multiplier = 0.40
+                character_8_multiplier = 0.50
+                character_4_multiplier = 0.45
+                roi_rows = np.flatnonzero(~np.any(np.isnan(character_map), axis=1))
+                roi_multipliers = np.where(roi_rows % 2 == 0,
+                                           np.where(roi_rows % 4 == 0,
+                                                    np.where(roi_rows % 8 == 0, character_32_multiplier, character_16_multiplier),
+                                                    np.where(character_roi_high_diff[roi_rows], character_high_diff_8_multiplier, character_8_multiplier)),
+                                           np.where(character_roi_high_diff[roi_rows], character_high_diff_4_multiplier, character_4_multiplier))
+                roi_multipliers[roi_rows == 0] = character_key_multiplier
+
+                roi_map = np.empty((roi_rows.shape[0] * 2, character_map.shape[1] + 1), dtype=np.float64)
+                roi_map[0::2, 0] = roi_rows * 4
+                roi_map[0::2, 1:] = np.round(np.round(character_map[roi_rows] * -7) * (zone_scene["zone"].character_roi_boost_max / 1.75 * roi_multipliers)[:, np.newaxis] + uniform_offset)
+                roi_map[1::2, 0] = roi_rows * 4 + 1
+                roi_map[1::2, 1:] = np.where(roi_rows == character_map.shape[0] - 1, np.round(uniform_ending_nonboosting_offset), np.round(uniform_nonboosting_offset))[:, np.newaxis]
+
+                needed_offset = np.max([0, 0 - np.min(np.max(roi_map[:, 1:], axis=1))])
+                roi_map[:, 1:] += needed_offset
+                crf -= needed_offset / 4
+                if verbose >= 1:
+                    print(f"ROI map {crf:>5.2f} / ", end="", flush=True)
+
+                roi_map_file = context.roi_maps_dir / f"roi-map-{scene_rjust(scenes, scene_n)}.txt"
+                with roi_map_file.open("w") as roi_map_f:
+                    np.savetxt(roi_map_f, roi_map, fmt="%d")
+                if context.zone_default.character_roi_map_npz:
+                    roi_maps_npz[f"frames-{scene_n}"] = roi_map[:, 0].astype(np.int32)
+                    roi_maps_npz[f"offsets-{scene_n}"] = roi_map[:, 1:].astype(np.int8)
+
+            character_hiritsu = character_kyara["scenes"][scene_n]["kyara"]
+            if zone_scene["zone"].character_crf_boost_alt_curve == 0:
+                character_hiritsu = np.interp(character_hiritsu, [0.00, 0.02, 0.12, 0.22, 0.32, 0.42, 0.52],
+                                                                 [0.00, 0.00, 1.00, 1.00, 0.92, 0.82, 0.67])
+            elif zone_scene["zone"].character_crf_boost_alt_curve == 1:
+                character_hiritsu = np.interp(character_hiritsu, [0.00, 0.02, 0.12, 0.22, 0.32, 0.42, 0.52],
+                                                                 [0.00, 0.12, 0.72, 1.00, 1.00, 0.92, 0.82])
+            else:
+                assert False, "Invalid `character_crf_boost_alt_curve`. Please check your config inside `Progression-Boost.py`."
+            crf -= zone_scene["zone"].character_crf_boost_max * character_hiritsu
+            if verbose >= 1:
+                print(f"--crf {crf:>5.2f} / ", end="", flush=True)
+
+            if (sum_filled := np.sum(character_map_filled_sum)) != 0.0:
+                character_diff = np.sum(character_map_filled_diff) / sum_filled / 0.12
+            else:
+                character_diff = 0.0
+            if character_diff > 1.00:
+                character_diff = 1.00
+            # Panning Rejection
+            luma_diff = scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]
+            luma_diff = np.percentile(luma_diff, 25)
+            character_motion_crf_boost_hiritsu = np.interp(luma_diff, [0.008, 0.016, 0.028, 0.034],
+                                                                      [1.0,   0.4,   0.4,   0.8])
+            crf -= zone_scene["zone"].character_motion_crf_boost_max * character_diff * character_motion_crf_boost_hiritsu
+            if verbose >= 1:
+                print(f"motion --crf {crf:>5.2f} / ", end="", flush=True)
+
+        crf = np.max([crf, zone_scene["zone"].final_min_crf])
+        crf = np.round(crf / 0.25) * 0.25
+        if verbose >= 1:
+            print(f"Final {f"{crf:>5.2f}" if zone_scene["zone"].quarterstep_crf else f"{crf:.0f}"}", end="\n", flush=True)
+
+        final_crf_frames[np.min([math.floor(crf / 10), final_crf_frames.shape[0] - 1])] += zone_scene["end_frame"] - zone_scene["start_frame"]
+
+        final_scenes["scenes"][scene_n]["zone_overrides"] = {
+            "encoder": zone_scene["zone"].final_dynamic_encoder(zone_scene["start_frame"],
+                                                                zone_scene["end_frame"],
+                                                                crf,
+                                                                scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]),
+            "passes": 1,
+            "video_params": [
+                "--crf", (f"{crf:.2f}" if zone_scene["zone"].quarterstep_crf else f"{crf:.0f}"),
+                "--preset", f"{preset}",
+                *zone_scene["zone"].final_dynamic_parameters(zone_scene["start_frame"],
+                                                             zone_scene["end_frame"],
+                                                             crf,
+                                                             scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                             scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                             scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                             scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+            ],
+            "photon_noise": zone_scene["zone"].final_dynamic_photon_noise(zone_scene["start_frame"],
+                                                                          zone_scene["end_frame"],
+                                                                          scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                          scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                          scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                          scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]]),
+            "photon_noise_height": zone_scene["zone"].final_photon_noise_height,
+            "photon_noise_width": zone_scene["zone"].final_photon_noise_width,
+            "chroma_noise": zone_scene["zone"].final_chroma_noise,
+            "extra_splits_len": zone_scene["zone"].scene_detection_extra_split,
+            "min_scene_len": zone_scene["zone"].scene_detection_min_scene_len
+        }
+        if zone_scene["zone"].character_enable and zone_scene["zone"].character_roi_boost_max:
+            final_scenes["scenes"][scene_n]["zone_overrides"]["video_params"] += ["--roi-map-file", str(roi_map_file)]
+
+    final_scenes["split_scenes"] = final_scenes["scenes"]
+    with final_scenes_file.open("w") as scenes_f:
+        json.dump(final_scenes, scenes_f, cls=NumpyEncoder)
+    if roi_maps_npz:
+        np.savez_compressed(context.roi_maps_dir / "roi-maps.npz", **roi_maps_npz)
+
+    print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Boost calculation complete / {(scene_n + 1) / (time.time() - start):.0f} scenes per second", end="\n", flush=True)
+
+    for section in range((nonzero_crf_frames := np.nonzero(final_crf_frames)[0])[0], nonzero_crf_frames[-1] + 1):
+        print(f"\r\033[KFrame [{frame_rjust(scenes, scenes["scenes"][0]["start_frame"])}:{frame_rjust(scenes, scenes["scenes"][-1]["end_frame"])}] / Boosting result", end="", flush=True)
+        if section == final_crf_frames.shape[0] - 1:
+            print(f" / --crf  {section * 10:.2f}+         ", end="", flush=True)
+        else:
+            print(f" / --crf [{section * 10:>5.2f} ~ {(section + 1) * 10 - 0.25:>5.2f}] ", end="", flush=True)
+        print(f"{frame_rjust(scenes, final_crf_frames[section])} frames", end="\n", flush=True)
+
+
+# Detects the scenes of every zone, or loads them from the temporary
+# folder on `--resume`, and measures the luma statistics of the source if
+# they aren't stored yet. Returns the scenes and the luma statistics, or
+# None for both if `scene_detection_only` is set and the scenes have been
+# written to `--output-scenes`.
+def scene_detection_run(context, zones):
+    program_name = context.program_name
+    scene_detection_only = context.scene_detection_only
+    verbose = context.verbose
+    resume = context.resume
+    input_scenes_file = context.input_scenes_file
+    scenes_file = context.scenes_file
+    zone_default = context.zone_default
+    scene_detection_input_file = context.scene_detection_input_file
+    scene_detection_vspipe_args = context.scene_detection_vspipe_args
+    scene_detection_temp_dir = context.scene_detection_temp_dir
+    progression_boost_temp_dir = context.progression_boost_temp_dir
+    character_boost_temp_dir = context.character_boost_temp_dir
+    retarget = context.retarget
+
+    scene_detection_scenes_file = scene_detection_temp_dir.joinpath("scenes.json")
+    scene_detection_x264_scenes_file = scene_detection_temp_dir.joinpath("x264.scenes.json")
+    scene_detection_x264_temp_dir = scene_detection_temp_dir.joinpath("x264.tmp")
+    scene_detection_x264_output_file = scene_detection_temp_dir.joinpath("x264.mkv")
+    scene_detection_x264_stats_dir = scene_detection_temp_dir.joinpath("x264.logs")
+    scene_detection_av1an_scenes_file = scene_detection_temp_dir.joinpath("av1an.scenes.json")
+    scene_detection_luma = luma_store_load(context) if resume else None
+    scene_detection_diffs_available = scene_detection_luma is not None
+    if scene_detection_diffs_available:
+        scene_detection_diffs, scene_detection_average, scene_detection_min, scene_detection_max = scene_detection_luma
+
+
+    frame_rjust_digits = math.floor(np.log10(zone_default.source_clip.num_frames)) + 1
+    frame_print = lambda frame: f"Frame {frame}"
+    frame_scene_print = lambda start_frame, end_frame: f"Scene [{str(start_frame).rjust(frame_rjust_digits)}:{str(end_frame).rjust(frame_rjust_digits)}]"
+
+
+    # Frame luminance measurement and VapourSynth based scene detection
+    # share a single render of the source, so that every frame is only
+    # decoded once. `PlaneStats` is taken at full resolution when the luma
+    # statistics are not already available, and `WWXD` and `Scxvid` run on
+    # the downscaled clip for zones using VapourSynth based scene detection
+    # when `detect` is set. Zones not listed in `zone_is` are not rendered.
+    def scene_detection_analyse(zone_is, detect):
+        if scene_detection_diffs_available:
+            luma = None
+            luma_diffs, luma_min, luma_max = scene_detection_diffs, scene_detection_min, scene_detection_max
+        else:
+            luma = np.empty((4, zone_default.source_clip.num_frames), dtype=np.float32)
+            luma_diffs, luma_min, luma_max = luma[0], luma[2], luma[3]
+
+        clip_base = zone_default.source_clip
+        bits = clip_base.format.bits_per_sample
+
+        if luma is not None:
+            clip_base = clip_base.std.PlaneStats(clip_base[0] + clip_base, plane=0, prop="Luma")
+
+        if detect:
+            target_width = np.round(np.sqrt(1280 * 720 / clip_base.width / clip_base.height) * clip_base.width / 40) * 40
+            if target_width < clip_base.width * 0.9:
+                target_height = np.ceil(target_width / clip_base.width * clip_base.height / 2) * 2
+                src_height = target_height / target_width * clip_base.width
+                src_top = (clip_base.height - src_height) / 2
+                clip_base = clip_base.resize.Point(width=target_width, height=target_height, src_top=src_top, src_height=src_height,
+                                                   format=vs.YUV420P8, dither_type="none")
+
+        clips = []
+        for zone_i in zone_is:
+            clip = clip_base[zones[zone_i]["start_frame"]:zones[zone_i]["end_frame"]]
+            if detect and zones[zone_i]["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
+                clip = clip.wwxd.WWXD()
+                if zones[zone_i]["zone"].scene_detection_vapoursynth_method == "wwxd_scxvid":
+                    clip = clip.scxvid.Scxvid()
+            clips.append(clip)
+        clip_frames = core.std.Splice(clips, mismatch=True).frames(backlog=48)
+
+        zones_diffs = {}
+        zones_vapoursynth_scenecut = {}
+        zones_luma_scenecut = {}
+        start = time.time() - 0.000001
+        analysed_frames = 0
+        for zone_i in zone_is:
+            zone = zones[zone_i]
+            zone_detect = detect and zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]
+            if zone_detect:
+                diffs = np.empty((zone["end_frame"] - zone["start_frame"],), dtype=float)
+                vapoursynth_scenecut = np.zeros((zone["end_frame"] - zone["start_frame"],), dtype=float)
+                luma_scenecut = np.zeros((zone["end_frame"] - zone["start_frame"],), dtype=bool)
+                luma_scenecut_prev = True
+
+            for offset_frame in range(zone["end_frame"] - zone["start_frame"]):
+                frame = next(clip_frames)
+                current_frame = zone["start_frame"] + offset_frame
+                print(f"\r\033[K{frame_print(current_frame)} / {"Detecting scenes" if detect else "Measuring frame luminance"} / {analysed_frames / (time.time() - start):.2f} fps", end="", flush=True)
+
+                if luma is not None:
+                    luma[0, current_frame] = frame.props["LumaDiff"]
+                    luma[1, current_frame] = frame.props["LumaAverage"]
+                    luma[2, current_frame] = frame.props["LumaMin"]
+                    luma[3, current_frame] = frame.props["LumaMax"]
+
+                if zone_detect:
+                    diffs[offset_frame] = luma_diffs[current_frame]
+
+                    if zone["zone"].scene_detection_vapoursynth_method == "wwxd":
+                        vapoursynth_scenecut[offset_frame] = frame.props["Scenechange"] == 1
+                    elif zone["zone"].scene_detection_vapoursynth_method == "wwxd_scxvid":
+                        vapoursynth_scenecut[offset_frame] = (frame.props["Scenechange"] == 1) + (frame.props["_SceneChangePrev"] == 1) / 2
+
+                    if zone["zone"].scene_detection_vapoursynth_range == "limited":
+                        luma_scenecut_current = luma_min[current_frame] > 231.125 * 2 ** (bits - 8) or \
+                                                luma_max[current_frame] < 19.875 * 2 ** (bits - 8)
+                    elif zone["zone"].scene_detection_vapoursynth_range == "full":
+                        luma_scenecut_current = luma_min[current_frame] > 251.125 * 2 ** (bits - 8) or \
+                                                luma_max[current_frame] < 3.875 * 2 ** (bits - 8)
+                    if luma_scenecut_current or luma_scenecut_prev:
+                        luma_scenecut[offset_frame] = True
+                    luma_scenecut_prev = luma_scenecut_current
+
+                analysed_frames += 1
+
+            if zone_detect:
+                zones_diffs[zone_i] = diffs
+                zones_vapoursynth_scenecut[zone_i] = vapoursynth_scenecut
+                zones_luma_scenecut[zone_i] = luma_scenecut
+
+        if detect:
+            print(f"\r\033[K{frame_print(analysed_frames)} / VapourSynth based scene detection complete / {analysed_frames / (time.time() - start):.2f} fps", end="\n", flush=True)
+        else:
+            print(f"\r\033[K{frame_print(analysed_frames)} / Frame luminance measurement complete / {analysed_frames / (time.time() - start):.2f} fps", end="\n", flush=True)
+
+        return luma, zones_diffs, zones_vapoursynth_scenecut, zones_luma_scenecut
+
+
+    # `--retarget` only redoes the final pass from the results kept in the
+    # temporary folder. Nothing is detected, encoded or measured again, so
+    # everything the final pass needs must already be there.
+    if not scene_detection_only and retarget:
+        assert scene_detection_scenes_file.exists(), "`--retarget` requires a temporary folder from a finished run. Run Progression Boost without `--retarget` first."
+        assert scene_detection_diffs_available, "`--retarget` requires the luma statistics of the current source in the temporary folder. Run Progression Boost without `--retarget` first."
+
+    if not resume or not scene_detection_scenes_file.exists():
+        for zone in zones:
+            if zone["zone"].scene_detection_method == "x264_vapoursynth":
+                scene_detection_perform_x264 = True
+                break
+        else:
+            scene_detection_perform_x264 = False
+        for zone in zones:
+            if zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
+                scene_detection_perform_vapoursynth = True
+                break
+        else:
+            scene_detection_perform_vapoursynth = False
+        for zone in zones:
+            if zone["zone"].scene_detection_method == "av1an":
+                if not resume or not scene_detection_av1an_scenes_file.exists():
+                    scene_detection_perform_av1an = True
+                else:
+                    scene_detection_perform_av1an = False
+
+                scene_detection_has_av1an = True
+                break
+        else:
+            scene_detection_has_av1an = False
+            scene_detection_perform_av1an = False
+        for zone in zones:
+            if zone["zone"].scene_detection_method == "external":
+                scene_detection_has_external = True
+                break
+        else:
+            scene_detection_has_external = False
+
+        scene_detection_threads = max(zone_default.scene_detection_threads - (1 if scene_detection_perform_av1an else 0), 1)
+        if scene_detection_perform_x264:
+            scene_detection_x264_threads = max(scene_detection_threads // 2, 1)
+        else:
+            scene_detection_x264_threads = 0
+        scene_detection_vapoursynth_threads = max(scene_detection_threads - scene_detection_x264_threads, 1)
+
+        # Zones are split into segments for x264 based scene detection so that
+        # they can be run in parallel. Each segment overlaps the next one by 4
+        # frames, and the first frame of every segment except the first is
+        # skipped when reading the stats since x264 always places a keyframe
+        # there. Segments are kept at least this long so that the lookahead of
+        # x264 is not cut too often.
+        scene_detection_x264_segment_frames = 1200
+
+        def scene_detection_x264_segments(zone):
+            frames = zone["end_frame"] - zone["start_frame"]
+            if frames < 120:
+                return [(0, frames)]
+            count = max(min(scene_detection_x264_threads, frames // scene_detection_x264_segment_frames), 2)
+            starts = [math.floor(frames * i / count) for i in range(count)]
+            return [(starts[i], starts[i + 1] + 4) for i in range(count - 1)] + [(starts[-1], frames)]
+
+        def scene_detection_x264_segment_name(zone_i, segments, segment_i):
+            if len(segments) == 1:
+                return f"{zone_i}"
+            else:
+                return f"{zone_i}_{segment_i}"
+
+
+        if scene_detection_perform_x264:
+            scene_detection_x264_output_file.unlink(missing_ok=True)
+            scene_detection_x264_stats_dir.mkdir(exist_ok=True)
+            if not resume:
+                for file in scene_detection_x264_stats_dir.glob("*.log"):
+                    file.unlink()
+
+            scene_detection_x264_segments_count = sum([len(scene_detection_x264_segments(zone)) for zone in zones if zone["zone"].scene_detection_method == "x264_vapoursynth"])
+            scene_detection_x264_workers = max(min(scene_detection_x264_threads, scene_detection_x264_segments_count), 1)
+            scene_detection_x264_segment_threads = max(scene_detection_x264_threads // scene_detection_x264_workers, 1)
+
+            scene_detection_x264_scenes = {}
+            scene_detection_x264_scenes["scenes"] = []
+            scene_detection_x264_total_frames = 0
+            scene_detection_x264_total_frames_print = 0
+            for zone_i, zone in enumerate(zones):
+                if zone["zone"].scene_detection_method == "x264_vapoursynth":
+                    def scene_detection_append_x264_scene(name, start_frame, end_frame):
+                        scene_detection_x264_scenes["scenes"].append({
+                            "start_frame": start_frame,
+                            "end_frame": end_frame,
+                            "zone_overrides": {
+                                "encoder": "x264",
+                                "passes": 1,
+                                "video_params": [
+                                    "--output-depth", "10",
+                                    "--preset", "veryfast",
+                                    "--qp", "80",
+                                    "--keyint", f"{end_frame - start_frame + 240}",
+                                    "--min-keyint", "1",
+                                    "--scenecut", "40",
+                                    "--rc-lookahead", "120",
+                                    "--ref", "1",
+                                    "--aq-mode", "0",
+                                    "--no-8x8dct",
+                                    "--partition", "none",
+                                    "--no-weightb",
+                                    "--weightp", "0",
+                                    "--me", "dia",
+                                    "--subme", "2", # Required for scene detection
+                                    "--no-psy",
+                                    "--trellis", "0",
+                                    "--no-cabac",
+                                    "--no-deblock",
+                                    "--slow-firstpass",
+                                    "--threads", f"{scene_detection_x264_segment_threads}",
+                                    "--pass", "1",
+                                    "--stats", f"{scene_detection_x264_stats_dir / f"{name}.log"}"
+                                ],
+                                "photon_noise": None,
+                                "photon_noise_height": None,
+                                "photon_noise_width": None,
+                                "chroma_noise": False,
+                                "extra_splits_len": zone["zone"].scene_detection_extra_split,
+                                "min_scene_len": zone["zone"].scene_detection_min_scene_len
+                            }
+                        })
+                    scene_detection_x264_total_frames_print += zone["end_frame"] - zone["start_frame"]
+                    segments = scene_detection_x264_segments(zone)
+                    for segment_i, (segment_start_frame, segment_end_frame) in enumerate(segments):
+                        scene_detection_x264_total_frames += segment_end_frame - segment_start_frame
+                        scene_detection_append_x264_scene(scene_detection_x264_segment_name(zone_i, segments, segment_i), zone["start_frame"] + segment_start_frame, zone["start_frame"] + segment_end_frame)
+            scene_detection_x264_scenes["frames"] = scene_detection_x264_total_frames
+            scene_detection_x264_scenes["split_scenes"] = scene_detection_x264_scenes["scenes"]
+
+            with scene_detection_x264_scenes_file.open("w") as scene_detection_x264_scenes_f:
+                json.dump(scene_detection_x264_scenes, scene_detection_x264_scenes_f, cls=NumpyEncoder)
+
+            if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
+                scene_detection_x264_temp_dir_cache = scene_detection_x264_temp_dir / "split" / "cache"
+                scene_detection_x264_temp_dir_cache = scene_detection_x264_temp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
+            
+                if not scene_detection_x264_temp_dir_cache.exists():
+                    source_clip_cache_place(context, scene_detection_x264_temp_dir_cache)
+
+            command = [
+                "av1an",
+                "-y"
+            ]
+            if verbose < 2:
+                command += ["--quiet"]
+            if verbose >= 3:
+                command += ["--verbose"]
+            command += [
+                "--temp", scene_detection_x264_temp_dir,
+                "--keep"
+            ]
+            if resume:
+                command += ["--resume"]
+            command += [
+                "-i", scene_detection_input_file
+            ]
+            if scene_detection_vspipe_args is not None:
+                command += ["--vspipe-args"] + scene_detection_vspipe_args
+            command += [
+                "-o", scene_detection_x264_output_file,
+                "--scenes", scene_detection_x264_scenes_file,
+                "--chunk-method", zone_default.source_provider_av1an,
+                "--encoder", "x264",
+                "--pix-format", "yuv420p10le",
+                "--workers", f"{scene_detection_x264_workers}",
+                "--force", "--video-params", f"[K[0m[1;3m> {program_name} [0m[3mx264-based-scene-detection[0m[1;3m <[0m",
+                "--audio-params", "-an",
+                "--concat", "mkvmerge"
+            ]
+            scene_detection_x264_process = subprocess.Popen(command, text=True)
+
+
+        if scene_detection_perform_av1an:
+            scene_detection_av1an_scenes_file.unlink(missing_ok=True)
+
+            if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
+                scene_detection_av1an_temp_dir_cache = scene_detection_temp_dir / "av1an.tmp" / "split" / "cache"
+                scene_detection_av1an_temp_dir_cache = scene_detection_av1an_temp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
+            
+                if not scene_detection_av1an_temp_dir_cache.exists():
+                    source_clip_cache_place(context, scene_detection_av1an_temp_dir_cache)
+
+            scene_detection_av1an_force_keyframes = []
+            for zone in zones:
+                scene_detection_av1an_force_keyframes.append(str(zone["start_frame"]))
+            command = [
+                "av1an",
+                "--temp", scene_detection_temp_dir.joinpath("av1an.tmp"),
+                "-i", scene_detection_input_file
+            ]
+            if scene_detection_vspipe_args is not None:
+                command += ["--vspipe-args"] + scene_detection_vspipe_args
+            command += [
+                "--scenes", scene_detection_av1an_scenes_file,
+                *zone_default.scene_detection_av1an_parameters(),
+                "--force-keyframes", ",".join(scene_detection_av1an_force_keyframes)
+            ]
+            scene_detection_process = subprocess.Popen(command, text=True)
+
+        
+        if scene_detection_perform_vapoursynth:
+            for zone in zones:
+                assert zone["zone"].scene_detection_method in ["av1an", "x264_vapoursynth", "vapoursynth", "external"], "Invalid `scene_detection_method`. Please check your config inside `Progression-Boost.py`."
+
+                if zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
+                    assert zone["zone"].scene_detection_vapoursynth_method in ["wwxd", "wwxd_scxvid"], "Invalid `scene_detection_vapoursynth_method`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_vapoursynth_range in ["limited", "full"], "Invalid `scene_detection_vapoursynth_range`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_extra_split >= zone["zone"].scene_detection_min_scene_len * 2, "`scene_detection_method` `vapoursynth` does not support `scene_detection_extra_split` to be smaller than 2 times `scene_detection_min_scene_len`."
+
+        scene_detection_analyse_zones = [zone_i for zone_i, zone in enumerate(zones) if not scene_detection_diffs_available or zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]]
+        if scene_detection_analyse_zones:
+            scene_detection_core_threads = core.num_threads
+            core.num_threads = scene_detection_vapoursynth_threads
+            scene_detection_analysed_luma, zones_diffs, zones_vapoursynth_scenecut, zones_luma_scenecut = scene_detection_analyse(scene_detection_analyse_zones, scene_detection_perform_vapoursynth)
+            core.num_threads = scene_detection_core_threads
+            if not scene_detection_diffs_available:
+                scene_detection_luma = scene_detection_analysed_luma
+                scene_detection_diffs, scene_detection_average, scene_detection_min, scene_detection_max = scene_detection_luma
+                luma_store_save(context, scene_detection_luma)
+                scene_detection_diffs_available = True
+
+        if scene_detection_has_external:
+            with input_scenes_file.open("r") as input_scenes_f:
+                try:
+                    scene_detection_external_scenes = json.load(input_scenes_f)
+                except:
+                    raise ValueError("Invalid scenes file from `--input-scenes`")
+            assert "scenes" in scene_detection_external_scenes, "Invalid scenes file from `--input-scenes`"
+
+
+        if scene_detection_perform_av1an:
+            scene_detection_process.wait()
+            if scene_detection_process.returncode != 0:
+                raise subprocess.CalledProcessError
+
+            assert scene_detection_av1an_scenes_file.exists(), "Unexpected result from av1an"
+
+        if scene_detection_has_av1an:
+            with scene_detection_av1an_scenes_file.open("r") as av1an_scenes_f:
+                scene_detection_av1an_scenes = json.load(av1an_scenes_f)
+
+            assert scene_detection_av1an_scenes["frames"] == zone_default.source_clip.num_frames, "Unexpected result from av1an"
+            if "split_scenes" in scene_detection_av1an_scenes:
+                scene_detection_av1an_scenes["scenes"] = scene_detection_av1an_scenes["split_scenes"]
+            assert "scenes" in scene_detection_av1an_scenes, "Unexpected result from av1an"
+
+
+        if scene_detection_perform_x264:
+            zones_x264_scenecut = {}
+            scene_detection_x264_pending = []
+            for zone_i, zone in enumerate(zones):
+                if zone["zone"].scene_detection_method == "x264_vapoursynth":
+                    zones_x264_scenecut[zone_i] = np.zeros((zone["end_frame"] - zone["start_frame"],), dtype=float)
+                    segments = scene_detection_x264_segments(zone)
+                    for segment_i, (segment_start_frame, segment_end_frame) in enumerate(segments):
+                        scene_detection_x264_pending.append((zones_x264_scenecut[zone_i],
+                                                             scene_detection_x264_stats_dir / f"{scene_detection_x264_segment_name(zone_i, segments, segment_i)}.log",
+                                                             segment_start_frame, segment_end_frame, segment_i != 0))
+
+            def scene_detection_read_x264_finished():
+                for item in scene_detection_x264_pending[:]:
+                    if item[1].exists():
+                        x264_read_scenecut(*item)
+                        scene_detection_x264_pending.remove(item)
+
+            if scene_detection_x264_process.poll() is None:
+                print(f"\r\033[K{frame_print(0)} / Performing x264 based scene detection", end="", flush=True)
+            while scene_detection_x264_process.poll() is None:
+                scene_detection_read_x264_finished()
+                time.sleep(1)
+            scene_detection_read_x264_finished()
+            print(f"\r\033[K{frame_print(scene_detection_x264_total_frames_print)} / x264 based scene detection finished", end="\n", flush=True)
+
+            assert not scene_detection_x264_pending, "Unexpected result from av1an or x264"
+
+
+        scenes = {}
+        scenes["frames"] = zone_default.source_clip.num_frames
+        scenes["scenes"] = []
+        for zone_i, zone in enumerate(zones):
+            if zone["zone"].scene_detection_method == "av1an":
+                av1an_scenes_start_copying = False
+                for av1an_scene in scene_detection_av1an_scenes["scenes"]:
+                    if av1an_scene["start_frame"] == zone["start_frame"]:
+                        av1an_scenes_start_copying = True
+                    assert (av1an_scene["start_frame"] >= zone["start_frame"]) == av1an_scenes_start_copying, "Unexpected result from av1an"
+                    if av1an_scene["start_frame"] == zone["end_frame"]:
+                        break
+                    assert av1an_scene["start_frame"] < zone["end_frame"], "Unexpected result from av1an"
+
+                    if av1an_scenes_start_copying:
+                        print(f"\r\033[K{frame_scene_print(av1an_scene["start_frame"], av1an_scene["end_frame"])} / Creating scenes", end="", flush=True)
+                        scenes["scenes"].append(av1an_scene)
+
+            elif zone["zone"].scene_detection_method == "external":
+                external_scenes_start_copying = False
+                last_end_frame = None
+                for external_scene in scene_detection_external_scenes["scenes"]:
+                    assert "start_frame" in external_scene and "end_frame" in external_scene, "Invalid scenes file from `--input-scenes`"
+
+                    if external_scene["start_frame"] >= zone["start_frame"]:
+                        if not external_scenes_start_copying and external_scene["start_frame"] > zone["start_frame"]:
+                            if not zone["zone"].metric_enable and external_scene["end_frame"] - zone["start_frame"] < 5:
+                                print(f"\r\033[K[{frame_scene_print(zone["start_frame"], external_scene["end_frame"])} / A scene from `--input-scenes` is cut off by zone boundary into a scene shorter than 5 frames. As Progression Boost module is disabled for the zone, this scene might get poorly encoded.", end="\n", flush=True)
+                
+                            scenes["scenes"].append({"start_frame": zone["start_frame"],
+                                                     "end_frame": external_scene["start_frame"],
+                                                     "zone_overrides": None})
+                                                 
+                        external_scenes_start_copying = True
+
+                    if external_scenes_start_copying:
+                        if last_end_frame is not None:
+                            assert last_end_frame == external_scene["start_frame"], "Invalid scenes file from `--input-scenes`. Scenes file not continuous."
+                        last_end_frame = external_scene["end_frame"]
+                        assert external_scene["end_frame"] > external_scene["start_frame"], "Invalid scenes file from `--input-scenes`"
+
+                        if external_scene["end_frame"] > zone["end_frame"]:
+                            if not zone["zone"].metric_enable and zone["end_frame"] - external_scene["start_frame"] < 5:
+                                print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], zone["end_frame"])} / A scene from `--input-scenes` is cut off by zone boundary into a scene shorter than 5 frames. As Progression Boost module is disabled for the zone, this scene might get poorly encoded.", end="\n", flush=True)
+                            print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], zone["end_frame"])} / Creating scenes", end="", flush=True)
+                            scenes["scenes"].append({"start_frame": external_scene["start_frame"],
+                                                     "end_frame": zone["end_frame"],
+                                                     "zone_overrides": None})
+                        else:
+                            print(f"\r\033[K{frame_scene_print(external_scene["start_frame"], external_scene["end_frame"])} / Creating scenes", end="", flush=True)
+                            scenes["scenes"].append({"start_frame": external_scene["start_frame"],
+                                                     "end_frame": external_scene["end_frame"],
+                                                     "zone_overrides": None})
+
+                    if external_scene["end_frame"] >= zone["end_frame"]:
+                        break
+                else:
+                    raise ValueError("Invalid scenes file from `--input-scenes`. There are no scenes in the scenes file that reach the end of the zone")
+
+            elif zone["zone"].scene_detection_method in ["x264_vapoursynth", "vapoursynth"]:
+                diffs = zones_diffs[zone_i]
+                luma_scenecut = zones_luma_scenecut[zone_i]
+                vapoursynth_scenecut = zones_vapoursynth_scenecut[zone_i]
+                if zone["zone"].scene_detection_method == "x264_vapoursynth":
+                    x264_scenecut = zones_x264_scenecut[zone_i]
+
+                diffs_half = diffs / 2
+                diffs_0012 = diffs >= 0.0012
+                diffs_0042 = diffs >= 0.0042
+                diffs[1:] -= diffs[:-1]
+                diffs[diffs < diffs_half] = diffs_half[diffs < diffs_half]
+                diffs[np.logical_and(diffs_0012, diffs < 0.0012)] = 0.0012
+                diffs[np.logical_and(diffs_0042, diffs < 0.0042)] = 0.0042
+
+                diffs[luma_scenecut] *= 1.70
+                diffs[luma_scenecut] += 1.24
+
+                if zone["zone"].scene_detection_method == "x264_vapoursynth":
+                    vapoursynth_scenecut *= 0.88
+                    x264_scenecut *= 0.94
+                    vapoursynth_scenecut += x264_scenecut
+                    vapoursynth_scenecut[vapoursynth_scenecut > 1.0] = 1.0
+                diffs[~luma_scenecut] += vapoursynth_scenecut[~luma_scenecut]
+            
+                # Sparse table holding the frame with the highest diff for every
+                # power-of-two long range, with ties going to the later frame
+                # the same way as reversing a stable `np.argsort` does.
+                # `diffs_sort` uses it to walk through only the frames of the
+                # scene being split, from the highest diff downwards, instead of
+                # scanning every frame of the zone on every split.
+                diffs_table = [np.arange(len(diffs))]
+                diffs_table_width = 1
+                while diffs_table_width * 2 <= len(diffs):
+                    left = diffs_table[-1][:-diffs_table_width]
+                    right = diffs_table[-1][diffs_table_width:]
+                    diffs_table.append(np.where(diffs[right] >= diffs[left], right, left))
+                    diffs_table_width *= 2
+
+                def diffs_sort_candidate(left, right):
+                    level = (right - left + 1).bit_length() - 1
+                    current_frame = diffs_table[level][left]
+                    other_frame = diffs_table[level][right - (1 << level) + 1]
+                    if diffs[other_frame] >= diffs[current_frame]:
+                        current_frame = other_frame
+                    current_frame = int(current_frame)
+                    return (-float(diffs[current_frame]), -current_frame, left, right)
+
+                def diffs_sort(start_frame, end_frame):
+                    heap = [diffs_sort_candidate(start_frame, min(end_frame, len(diffs) - 1))]
+                    while heap:
+                        _, current_frame, left, right = heapq.heappop(heap)
+                        current_frame = -current_frame
+                        yield current_frame
+                        if left < current_frame:
+                            heapq.heappush(heap, diffs_sort_candidate(left, current_frame - 1))
+                        if current_frame < right:
+                            heapq.heappush(heap, diffs_sort_candidate(current_frame + 1, right))
+
+                def scene_detection_split_scene(start_frame, end_frame):
+                    assert zone["zone"].scene_detection_0042_still_scene_extra_split >= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_0042_still_scene_extra_split`. This value must be bigger than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_0012_still_scene_extra_split >= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_0012_still_scene_extra_split`. This value must be bigger than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_min_scene_len * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_min_scene_len`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_18_target_split * 2 <= zone["zone"].scene_detection_12_target_split, "Invalid `scene_detection_18_target_split`. 2 times this value must be smaller than or equal to `scene_detection_12_target_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_18_target_split * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_18_target_split`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_12_target_split * 2 <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_12_target_split`. 2 times this value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+                    assert zone["zone"].scene_detection_27_extra_target_split <= zone["zone"].scene_detection_extra_split, "Invalid `scene_detection_27_extra_target_split`. This value must be smaller than or equal to `scene_detection_extra_split`. Please check your config inside `Progression-Boost.py`."
+
+
+
+                    print(f"\r\033[K{frame_scene_print(start_frame + zone["start_frame"], end_frame + zone["start_frame"])} / Creating scenes", end="", flush=True)
+
+
+
+                    if end_frame - start_frame < 2 * zone["zone"].scene_detection_min_scene_len:
+                        if verbose >= 3:
+                            print(f" / branch complete", end="\n", flush=True)
+                        return [start_frame]
+
+
+
+                    if end_frame - start_frame >= 2 * zone["zone"].scene_detection_extra_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.27:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_27_extra_target_split and end_frame - current_frame >= zone["zone"].scene_detection_27_extra_target_split and \
+                               math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                               math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                               math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.40):
+                                if verbose >= 3:
+                                    print(f" / split / extra_split 1.27 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    if end_frame - start_frame <= 2 * zone["zone"].scene_detection_18_target_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 doubleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 doubleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 doubleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 doubleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 doubleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.18 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.18 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.18 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.18 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_18_target_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_18_target_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.18 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    if end_frame - start_frame <= 2 * zone["zone"].scene_detection_18_target_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len and \
+                               ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.18:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len:
+                                if verbose >= 3:
+                                    print(f" / split / 1.18 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+                        if verbose >= 3:
+                            print(f" / branch complete", end="\n", flush=True)
+                        return [start_frame]
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.18 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.18 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.18 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.18 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.18:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.18 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    if end_frame - start_frame <= 2 * zone["zone"].scene_detection_12_target_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
+                               ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 doubleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
+                               ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 doubleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
+                               ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 doubleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
+                               ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 doubleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and \
+                               ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 doubleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.12 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.12 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.12 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.12 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_12_target_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_12_target_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / 1.12 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    if end_frame - start_frame <= zone["zone"].scene_detection_extra_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+                                   
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split and \
+                               ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1):
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+    
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.12:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_18_target_split and end_frame - current_frame >= zone["zone"].scene_detection_18_target_split:
+                                if verbose >= 3:
+                                    print(f" / split / 1.12 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+                        if verbose >= 3:
+                            print(f" / branch complete", end="\n", flush=True)
+                        return [start_frame]
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+    
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.12:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.12 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+                    if end_frame - start_frame >= 2 * zone["zone"].scene_detection_extra_split:
+                        for current_frame in diffs_sort(start_frame, end_frame):
+                            if diffs[current_frame] < 1.15:
+                                break
+                            if current_frame - start_frame >= zone["zone"].scene_detection_extra_split and end_frame - current_frame >= zone["zone"].scene_detection_extra_split and \
+                               math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                               math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                               math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                                if verbose >= 3:
+                                    print(f" / split / extra_split 1.15 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                                return scene_detection_split_scene(start_frame, current_frame) + \
+                                       scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    section_diffs = diffs[start_frame + 1:end_frame]
+                    section_diffs_0012 = section_diffs >= 0.0012
+                    section_diffs_0042 = section_diffs >= 0.0042
+
+
+                    if np.all(~section_diffs_0012):
+                        if end_frame - start_frame <= zone["zone"].scene_detection_0012_still_scene_extra_split:
+                            if verbose >= 3:
+                                print(f" / branch complete / 0.0012 mode", end="\n", flush=True)
+                            return [start_frame]
+                        else:
+                            sections = math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_0012_still_scene_extra_split)
+                            section_frames = (end_frame - start_frame) / sections
+                            section_frames = np.min([math.ceil((section_frames - 1) / 16) * 16 + 1, zone["zone"].scene_detection_0012_still_scene_extra_split])
+                            returning_frames = []
+                            for frame in range(start_frame, end_frame, section_frames):
+                                returning_frames.append(frame)
+                            if verbose >= 3:
+                                print(f" / split / 0.0012 divide mode / frame {" ".join([str(item) for item in returning_frames[1:]])}", end="\n", flush=True)
+                            return returning_frames
+
+                    if np.all(~section_diffs_0042):
+                        if end_frame - start_frame <= zone["zone"].scene_detection_0042_still_scene_extra_split:
+                            if verbose >= 3:
+                                print(f" / branch complete / 0.0042 mode", end="\n", flush=True)
+                            return [start_frame]
+                        else:
+                            sections = math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_0042_still_scene_extra_split)
+                            section_frames = (end_frame - start_frame) / sections
+                            section_frames = np.min([math.ceil((section_frames - 1) / 16) * 16 + 1, zone["zone"].scene_detection_0042_still_scene_extra_split])
+                            returning_frames = []
+                            for frame in range(start_frame, end_frame, section_frames):
+                                returning_frames.append(frame)
+                            if verbose >= 3:
+                                print(f" / split / 0.0042 divide mode / frame {" ".join([str(item) for item in returning_frames[1:]])}", end="\n", flush=True)
+                            return returning_frames
+
+
+                    offset_frame = np.argmax(section_diffs_0012) + 1
+                    reserve_offset_frame = np.argmax(section_diffs_0012[::-1]) + 1
+
+                    split_frame = np.max([end_frame - reserve_offset_frame,
+                                          end_frame - zone["zone"].scene_detection_0012_still_scene_extra_split,
+                                          start_frame + zone["zone"].scene_detection_min_scene_len])
+                    if end_frame - split_frame > zone["zone"].scene_detection_12_target_split and \
+                       math.ceil((split_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                       1 <= \
+                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                        if verbose >= 3:
+                            print(f" / split / 0.0012 rear mode / frame {split_frame}", end="\n", flush=True)
+                        return scene_detection_split_scene(start_frame, split_frame) + \
+                               [split_frame]
+
+                    split_frame = np.min([start_frame + offset_frame,
+                                          start_frame + zone["zone"].scene_detection_0012_still_scene_extra_split,
+                                          end_frame - zone["zone"].scene_detection_min_scene_len])
+                    if split_frame - start_frame > zone["zone"].scene_detection_12_target_split and \
+                       1 + \
+                       math.ceil((end_frame - split_frame) / zone["zone"].scene_detection_extra_split) <= \
+                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                        if verbose >= 3:
+                            print(f" / split / 0.0012 front mode / frame {split_frame}", end="\n", flush=True)
+                        return [start_frame] + \
+                               scene_detection_split_scene(split_frame, end_frame)
+
+
+                    offset_frame = np.argmax(section_diffs_0042) + 1
+                    reserve_offset_frame = np.argmax(section_diffs_0042[::-1]) + 1
+
+                    split_frame = np.max([end_frame - reserve_offset_frame,
+                                          end_frame - zone["zone"].scene_detection_0042_still_scene_extra_split,
+                                          start_frame + zone["zone"].scene_detection_min_scene_len])
+                    if end_frame - split_frame > zone["zone"].scene_detection_12_target_split and \
+                       math.ceil((split_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                       1 <= \
+                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                        if verbose >= 3:
+                            print(f" / split / 0.0042 rear mode / frame {split_frame}", end="\n", flush=True)
+                        return scene_detection_split_scene(start_frame, split_frame) + \
+                               [split_frame]
+
+                    split_frame = np.min([start_frame + offset_frame,
+                                          start_frame + zone["zone"].scene_detection_0042_still_scene_extra_split,
+                                          end_frame - zone["zone"].scene_detection_min_scene_len])
+                    if split_frame - start_frame > zone["zone"].scene_detection_12_target_split and \
+                       1 + \
+                       math.ceil((end_frame - split_frame) / zone["zone"].scene_detection_extra_split) <= \
+                       math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                        if verbose >= 3:
+                            print(f" / split / 0.0042 front mode / frame {split_frame}", end="\n", flush=True)
+                        return [start_frame] + \
+                               scene_detection_split_scene(split_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+    
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.08:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.08 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 1.02:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 1.02 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 32 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 32 == 1)) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 16 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 16 == 1)) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 8 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 8 == 1)) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 4 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 4 == 1)) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           ((current_frame - start_frame <= zone["zone"].scene_detection_extra_split and (current_frame - start_frame) % 2 == 1) or \
+                            (end_frame - current_frame <= zone["zone"].scene_detection_extra_split and (end_frame - current_frame) % 2 == 1)) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+                               
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.50):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 singleside mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.96:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.96 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+                                
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.84:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_min_scene_len and end_frame - current_frame >= zone["zone"].scene_detection_min_scene_len) and \
+                           (current_frame - start_frame <= zone["zone"].scene_detection_extra_split or \
+                            end_frame - current_frame <= zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / extra_split 0.84 mode / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                    scene_detection_split_scene(current_frame, end_frame)
+
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.09:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.09:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.09:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.09:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if diffs[current_frame] < 0.09:
+                            break
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split + 0.05):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 32 == 1 or (end_frame - current_frame) % 32 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 32-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 16 == 1 or (end_frame - current_frame) % 16 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 16-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 8 == 1 or (end_frame - current_frame) % 8 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 8-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 4 == 1 or (end_frame - current_frame) % 4 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 4-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           ((current_frame - start_frame) % 2 == 1 or (end_frame - current_frame) % 2 == 1) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / 2-frame hierarchical structure flavoured / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+                    for current_frame in diffs_sort(start_frame, end_frame):
+                        if (current_frame - start_frame >= zone["zone"].scene_detection_12_target_split and end_frame - current_frame >= zone["zone"].scene_detection_12_target_split) and \
+                           math.ceil((current_frame - start_frame) / zone["zone"].scene_detection_extra_split) + \
+                           math.ceil((end_frame - current_frame) / zone["zone"].scene_detection_extra_split) <= \
+                           math.ceil((end_frame - start_frame) / zone["zone"].scene_detection_extra_split):
+                            if verbose >= 3:
+                                print(f" / split / low scenechange / frame {current_frame} / diff {np.floor(diffs[current_frame] * 100) / 100:.2f}", end="\n", flush=True)
+                            return scene_detection_split_scene(start_frame, current_frame) + \
+                                   scene_detection_split_scene(current_frame, end_frame)
+
+
+                    assert False, "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+                start_frames = scene_detection_split_scene(0, len(diffs))
+
+                start_frames += [zone["end_frame"] - zone["start_frame"]]
+                for i in range(len(start_frames) - 1):
+                    scenes["scenes"].append({"start_frame": start_frames[i] + zone["start_frame"],
+                                             "end_frame": start_frames[i + 1] + zone["start_frame"],
+                                             "zone_overrides": None})
+
+        print(f"\r\033[K{frame_scene_print(scenes["scenes"][-1]["start_frame"], scenes["scenes"][-1]["end_frame"])} / Scene creation complete", end="\n", flush=True)
+
+        with scene_detection_scenes_file.open("w") as scenes_f:
+            json.dump(scenes, scenes_f, cls=NumpyEncoder)
+
+        if scene_detection_only:
+            scenes["split_scenes"] = scenes["scenes"]
+            with scenes_file.open("w") as scenes_f:
+                json.dump(scenes, scenes_f, cls=NumpyEncoder)
+
+            if scene_detection_perform_vapoursynth:
+                print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / {program_name} finished", end="\n", flush=True)
+
+            return None, None
+
+        if scene_detection_perform_vapoursynth:
+            print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / Scene detection finished", end="\n", flush=True)
+
+        for dir_ in [progression_boost_temp_dir, character_boost_temp_dir]:
+            shutil.rmtree(dir_, ignore_errors=True)
+            dir_.mkdir(parents=True, exist_ok=True)
+    else:
+        with scene_detection_scenes_file.open("r") as scenes_f:
+            scenes = json.load(scenes_f)
+
+        if not scene_detection_diffs_available:
+            scene_detection_luma, _, _, _ = scene_detection_analyse(list(range(len(zones))), False)
+            scene_detection_diffs, scene_detection_average, scene_detection_min, scene_detection_max = scene_detection_luma
+            luma_store_save(context, scene_detection_luma)
+            scene_detection_diffs_available = True
+
+    return scenes, scene_detection_luma
+
+
+# Runs scene detection, and unless `context.scene_detection_only` is
+# set, probing, metric and character boost, and writes the scenes file.
+def run(context):
+    program_name = context.program_name
+    scene_detection_only = context.scene_detection_only
+    verbose = context.verbose
+    resume = context.resume
+    input_file = context.input_file
+    probing_input_file = context.probing_input_file
+    probing_input_vspipe_args = context.probing_input_vspipe_args
+    input_scenes_file = context.input_scenes_file
+    roi_maps_dir = context.roi_maps_dir
+    zone_default = context.zone_default
+    progression_boost_temp_dir = context.progression_boost_temp_dir
+    character_boost_temp_dir = context.character_boost_temp_dir
+    retarget = context.retarget
+    metric_targets = context.metric_targets
+
+    if not scene_detection_only:
+        from scipy import fftpack, signal
+
+    zones = zones_load(context)
+
+    for zone in zones:
+        if zone["zone"].scene_detection_method == "external":
+            if not input_scenes_file:
+                print(f"\r\033[K`scene_detection_method` is set to `\"external\"` in at least one of the active zones. `scene_detection_method` of `\"external\"` requires an external scene to be provided via `--input-scenes`. Missing the required `--input-scenes` parameter.", end="\n", flush=True)
+                raise SystemExit(2)
+        
+            break
+    else:
+        if input_scenes_file:
+            print(f"\r\033[KCommandline parameter `--input-scenes` is provided, but there are no active zones that are using it.", end="\n", flush=True)
+
+    probing_reduced = zone_default.probing_reduced_height is not None and zone_default.probing_reduced_height < zone_default.source_clip.height
+    if probing_reduced:
+        probing_reduced_height = round(zone_default.probing_reduced_height / 2) * 2
+        probing_reduced_width = round(zone_default.source_clip.width * probing_reduced_height / zone_default.source_clip.height / 2) * 2
+        for zone in zones:
+            if zone["zone"].metric_enable and zone["zone"].metric_method == "ffvship":
+                print(f"\r\033[K`probing_reduced_height` is set, but in at least one active zone, `\"ffvship\"` is selected as `metric_method`. `metric_method` of `\"ffvship\"` can only compare probe encodes against the source at full resolution. You should switch to a VapourSynth based method, or unset `probing_reduced_height`.", end="\n", flush=True)
+                raise SystemExit(2)
+
+    for zone in zones:
+        if zone["zone"].metric_enable and zone["zone"].metric_method == "ffvship":
+            if probing_input_file != input_file:
+                if zone["zone"].metric_continue_filtered_with_ffvship:
+                    print(f"\r\033[KYou've set a filtered source to be used for probe encodes via `--encode-input`, but in at least one active zone, `\"ffvship\"` is selected as `metric_method`. `metric_method` of `\"ffvship\"` does not support comparing filtered source against filtered probe encodes. By selecting `\"ffvship\"`, you might be comparing a filtered encode with unfiltered source, which will produce completly unusable metric scores.", end="\n", flush=True)
+                else:
+                    print(f"\r\033[KYou've set a filtered source to be used for probe encodes via `--encode-input`, but in at least one active zone, `\"ffvship\"` is selected as `metric_method`. `metric_method` of `\"ffvship\"` does not support comparing filtered source against filtered probe encodes. By selecting `\"ffvship\"`, you're now comparing a filtered encode with unfiltered source, which will produce completly unusable metric scores. You should switch to a VapourSynth based methods, and then copy in your filtering chain for `metric_reference`.", end="\n", flush=True)
+                    print(f"\r\033[KProgression Boost will quit now, but if you know what you're doing, you may let it continue by setting `metric_continue_filtered_with_ffvship` for the related zones.", end="\n", flush=True)
+                    raise SystemExit(2)
+
+            break
+
+    for zone in zones:
+        if zone["zone"].metric_enable and zone["zone"].probing_preset < 6:
+            print(f"\r\033[KProbing with slower `--preset` than `--preset 6` is not tested, and Progression Boost's `--preset` readjustment feature may not work properly. Using slower `--preset` than `--preset 7` does not yield any meaningful improvements, and you should use `--preset 7` instead.", end="\n", flush=True)
+
+            break
+
+    for zone in zones:
+        if zone["zone"].character_enable:
+            character_backend = zone_default.character_get_backend()
+            character_model = zone_default.character_get_model()
+
+            break
+    for zone in zones:
+        if zone["zone"].character_enable and zone["zone"].character_roi_boost_max:
+            if not roi_maps_dir:
+                print(f"\r\033[KCharacter Boost is enabled in at least one active zone, but commandline parameter `--output-roi-map` is not provided.", end="\n", flush=True)
+                raise SystemExit(2)
+            roi_maps_dir.mkdir(parents=True, exist_ok=True)
+
+            break
+
+
+    print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / {program_name} started", end="\n", flush=True)
+
+
+    #  ███████╗ ██████╗███████╗███╗   ██╗███████╗    ██████╗ ███████╗████████╗███████╗ ██████╗████████╗██╗ ██████╗ ███╗   ██╗
+    #  ██╔════╝██╔════╝██╔════╝████╗  ██║██╔════╝    ██╔══██╗██╔════╝╚══██╔══╝██╔════╝██╔════╝╚══██╔══╝██║██╔═══██╗████╗  ██║
+    #  ███████╗██║     █████╗  ██╔██╗ ██║█████╗      ██║  ██║█████╗     ██║   █████╗  ██║        ██║   ██║██║   ██║██╔██╗ ██║
+    #  ╚════██║██║     ██╔══╝  ██║╚██╗██║██╔══╝      ██║  ██║██╔══╝     ██║   ██╔══╝  ██║        ██║   ██║██║   ██║██║╚██╗██║
+    #  ███████║╚██████╗███████╗██║ ╚████║███████╗    ██████╔╝███████╗   ██║   ███████╗╚██████╗   ██║   ██║╚██████╔╝██║ ╚████║
+    #  ╚══════╝ ╚═════╝╚══════╝╚═╝  ╚═══╝╚══════╝    ╚═════╝ ╚══════╝   ╚═╝   ╚══════╝ ╚═════╝   ╚═╝   ╚═╝ ╚═════╝ ╚═╝  ╚═══╝
+    #
+    #  ANSI Shadow ANSI FIGlet font
+
+
+    scenes, scene_detection_luma = scene_detection_run(context, zones)
+    if scenes is None:
+        return
+    scene_detection_diffs, scene_detection_average, scene_detection_min, scene_detection_max = scene_detection_luma
+
+    frame_print = lambda frame: f"Frame {frame}"
+
+
+    for zone in zones:
+        if zone["zone"].metric_enable:
+            metric_has_metric = True
+            break
+    else:
+        metric_has_metric = False
+    for zone in zones:
+        if zone["zone"].character_enable:
+            character_has_character = True
+            break
+    else:
+        character_has_character = False
+
+
+    zone_scenes = copy.deepcopy(scenes)
+    zone_head = 0
+    for zone_scene in zone_scenes["scenes"]:
+        if resume:
+            assert zone_scene["start_frame"] <= zones[zone_head]["end_frame"], "Scene detection scenes misaligned with zones. Try run Progression Boost fresh without `--resume`. If this issue persists, Please report this to the repository including this entire error message."
+        else:
+            assert zone_scene["start_frame"] <= zones[zone_head]["end_frame"], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+        if zone_scene["start_frame"] == zones[zone_head]["end_frame"]:
+            zone_head += 1
+
+        zone_scene["zone"] = zones[zone_head]["zone"]
+
+        zone_scene["zone_overrides"] = {
+            "encoder": "svt_av1",
+            "passes": 1,
+            "extra_splits_len": zone_scene["zone"].scene_detection_extra_split,
+            "min_scene_len": zone_scene["zone"].scene_detection_min_scene_len
+        }
+
+
+    #  ██████╗ ██████╗  ██████╗ ██████╗ ██╗███╗   ██╗ ██████╗       ███████╗██╗██████╗ ███████╗████████╗
+    #  ██╔══██╗██╔══██╗██╔═══██╗██╔══██╗██║████╗  ██║██╔════╝       ██╔════╝██║██╔══██╗██╔════╝╚══██╔══╝
+    #  ██████╔╝██████╔╝██║   ██║██████╔╝██║██╔██╗ ██║██║  ███╗█████╗█████╗  ██║██████╔╝███████╗   ██║   
+    #  ██╔═══╝ ██╔══██╗██║   ██║██╔══██╗██║██║╚██╗██║██║   ██║╚════╝██╔══╝  ██║██╔══██╗╚════██║   ██║   
+    #  ██║     ██║  ██║╚██████╔╝██████╔╝██║██║ ╚████║╚██████╔╝      ██║     ██║██║  ██║███████║   ██║   
+    #  ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝       ╚═╝     ╚═╝╚═╝  ╚═╝╚══════╝   ╚═╝   
+
+
+    if retarget:
+        if metric_has_metric:
+            metric_result_file = progression_boost_temp_dir / f"result.jsonl"
+            assert metric_result_file.exists(), "`--retarget` requires the probing results in the temporary folder. Run Progression Boost without `--retarget` first."
+            metric_result = journal_load(metric_result_file, scenes)
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable:
+                    assert all(key in metric_result["scenes"][scene_n] for key in ["first_qstep", "first_score", "second_qstep", "second_score"]), f"{scene_frame_print(scenes, scene_n)} has not finished probing. Run Progression Boost with `--resume` but without `--retarget` to finish it first."
+
+        if character_has_character:
+            character_file = character_boost_temp_dir / "kyara.jsonl"
+            assert character_file.exists(), "`--retarget` requires the character results in the temporary folder. Run Progression Boost without `--retarget` first."
+            character_kyara = journal_load(character_file, scenes)
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].character_enable:
+                    assert "kyara" in character_kyara["scenes"][scene_n] and (character_boost_temp_dir / f"character-{scene_rjust(scenes, scene_n)}.npy").exists(), f"{scene_frame_print(scenes, scene_n)} has not finished character segmentation. Run Progression Boost with `--resume` but without `--retarget` to finish it first."
+
+
+    if metric_has_metric and not retarget:
+        def probing_perform_probing(probing_tmp_dir, probing_scenes_file, probing_output_file, probing_output_file_cache, reduced=True):
+            probing_output_file.unlink(missing_ok=True)
+            if probing_output_file_cache is not None:
+                probing_output_file_cache.unlink(missing_ok=True)
+            
+            if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None:
+                probing_tmp_dir_cache = probing_tmp_dir / "split" / "cache"
+                probing_tmp_dir_cache = probing_tmp_dir_cache.with_suffix(zone_default.source_clip_cache.suffix)
+            
+                if not probing_tmp_dir_cache.exists():
+                    source_clip_cache_place(context, probing_tmp_dir_cache)
+
+            command = [
+                "av1an",
+                "-y"
+            ]
+            if verbose < 2:
+                command += ["--quiet"]
+            if verbose >= 3:
+                command += ["--verbose"]
+            command += [
+                "--temp", probing_tmp_dir,
+                "--keep"
+            ]
+            if resume:
+                command += ["--resume"]
+            command += [
+                "-i", probing_input_file
+            ]
+            if probing_input_vspipe_args is not None:
+                command += ["--vspipe-args"] + probing_input_vspipe_args
+            if probing_reduced and reduced:
+                command += ["--ffmpeg", f"-vf scale={probing_reduced_width}:{probing_reduced_height}:flags=bicubic"]
+            command += [
+                "-o", probing_output_file,
+                "--scenes", probing_scenes_file,
+                *zone_default.probing_av1an_parameters(f"[K[0m[1;3m> Progression Boost [0m[3m{probing_output_file.stem}[0m[1;3m <[0m")
+            ]
+            return subprocess.Popen(command, text=True)
+
+        # With several `--metric-target`, the second probe is placed on the
+        # side of the first probe where the target furthest from the first
+        # score lies, so that the targets left outside of the two probes are
+        # the ones closest to a probe.
+        def probing_second_qstep(scene_n, zone_scene):
+            if not metric_targets:
+                probing_target = zone_scene["zone"].metric_target
+            else:
+                probing_target = max(metric_targets, key=lambda target: abs(target - metric_result["scenes"][scene_n]["first_score"]))
+            if zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["first_score"], probing_target):
+                metric_result["scenes"][scene_n]["second_qstep"] = 891
+            else:
+                metric_result["scenes"][scene_n]["second_qstep"] = 155
+
+        def probing_second_probing_scene(scene_n, zone_scene):
+            probing_second_qstep(scene_n, zone_scene)
+
+            probing_scene = {
+                "start_frame": zone_scene["start_frame"],
+                "end_frame": zone_scene["end_frame"],
+                "zone_overrides": copy.copy(zone_scene["zone_overrides"])
+            }
+            probing_scene["zone_overrides"]["encoder"] = zone_scene["zone"].probing_dynamic_encoder(zone_scene["start_frame"],
+                                                                                                    zone_scene["end_frame"],
+                                                                                                    scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                    scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                    scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                    scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+            if zone_scene["zone"].quarterstep_crf:
+                probing_scene["zone_overrides"]["video_params"] = [
+                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4:.2f}"
+                ]
+            else:
+                probing_scene["zone_overrides"]["video_params"] = [
+                    "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4:.0f}"
+                ]
+            probing_scene["zone_overrides"]["video_params"] += [
+                "--preset", f"{zone_scene["zone"].probing_preset}",
+                *zone_scene["zone"].probing_dynamic_parameters(zone_scene["start_frame"],
+                                                               zone_scene["end_frame"],
+                                                               (np.searchsorted(dc, metric_result["scenes"][scene_n]["second_qstep"], side="right") - 1) / 4,
+                                                               scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                               scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                               scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                               scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+            ]
+            probing_scene["zone_overrides"]["photon_noise"] = None
+            probing_scene["zone_overrides"]["photon_noise_height"] = None
+            probing_scene["zone_overrides"]["photon_noise_width"] = None
+            probing_scene["zone_overrides"]["chroma_noise"] = False
+            return probing_scene
+    
+        probing_first_tmp_dir = progression_boost_temp_dir / f"probe-encode-first.tmp"
+        probing_first_done_file = probing_first_tmp_dir / "done.json"
+        probing_first_scenes_file = progression_boost_temp_dir / f"probe-encode-first.scenes.json"
+        probing_first_output_file = progression_boost_temp_dir / f"probe-encode-first.mkv"
+        probing_first_output_file_cache = zone_default.source_provider_cache(probing_first_output_file)
+    
+        probing_second_tmp_dir = progression_boost_temp_dir / f"probe-encode-second.tmp"
+        probing_second_done_file = probing_second_tmp_dir / "done.json"
+        probing_second_scenes_file = progression_boost_temp_dir / f"probe-encode-second.scenes.json"
+        probing_second_output_file = progression_boost_temp_dir / f"probe-encode-second.mkv"
+        probing_second_output_file_cache = zone_default.source_provider_cache(probing_second_output_file)
+
+        probing_second_rest_tmp_dir = progression_boost_temp_dir / f"probe-encode-second-rest.tmp"
+        probing_second_rest_scenes_file = progression_boost_temp_dir / f"probe-encode-second-rest.scenes.json"
+        probing_second_rest_output_file = progression_boost_temp_dir / f"probe-encode-second-rest.mkv"
+        probing_second_rest_output_file_cache = zone_default.source_provider_cache(probing_second_rest_output_file)
+
+        # With `probing_second_model`, the second probe runs in two rounds.
+        # The first round encodes the sampled scenes, spread evenly across
+        # the scenes with `metric_enable`. The second round encodes the rest
+        # of the scenes, except for the ones whose second score is predicted.
+        probing_second_model = zone_default.probing_second_model
+        if probing_second_model:
+            probing_second_model_scene_ns = [scene_n for scene_n, zone_scene in enumerate(zone_scenes["scenes"]) if zone_scene["zone"].metric_enable]
+            probing_second_model_samples = set(np.array(probing_second_model_scene_ns)[np.unique(np.round(np.linspace(0, len(probing_second_model_scene_ns) - 1,
+                                                                                                                       num=math.ceil(len(probing_second_model_scene_ns) * zone_default.probing_second_model_sample))).astype(int))].tolist())
+
+        def probing_second_round(scene_n):
+            if not probing_second_model or scene_n in probing_second_model_samples:
+                return 0
+            elif metric_result["scenes"][scene_n].get("second_predicted", False):
+                return None
+            else:
+                return 1
+
+        metric_result_file = progression_boost_temp_dir / f"result.jsonl"
+
+        probing_first_perform_encode = False
+        probing_second_perform_encode = False
+
+        if resume and metric_result_file.exists():
+            metric_result = journal_load(metric_result_file, scenes)
+        else:
+            metric_result = copy.deepcopy(scenes)
+
+        if not resume or not probing_first_output_file.exists():
+            probing_first_perform_encode = True
+
+        if probing_first_perform_encode:
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable:
+                    if "first_score" in metric_result["scenes"][scene_n]:
+                        del metric_result["scenes"][scene_n]["first_score"]
+                    if "calibration_score" in metric_result["scenes"][scene_n]:
+                        del metric_result["scenes"][scene_n]["calibration_score"]
+                        del metric_result["scenes"][scene_n]["calibration_reduced_score"]
+
+        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+            if zone_scene["zone"].metric_enable:
+                if "first_score" not in metric_result["scenes"][scene_n]:
+                    probing_second_perform_encode = True
+                    shutil.rmtree(probing_second_tmp_dir, ignore_errors=True)
+                    break
+
+        if not resume or not probing_second_output_file.exists():
+            probing_second_perform_encode = True
+
+        if probing_second_perform_encode:
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable:
+                    if "second_score" in metric_result["scenes"][scene_n]:
+                        del metric_result["scenes"][scene_n]["second_score"]
+                    if "second_predicted" in metric_result["scenes"][scene_n]:
+                        del metric_result["scenes"][scene_n]["second_predicted"]
+            shutil.rmtree(probing_second_rest_tmp_dir, ignore_errors=True)
+            probing_second_rest_output_file.unlink(missing_ok=True)
+
+        journal_write(metric_result_file, metric_result)
+
+        probing_second_streaming = zone_default.probing_second_streaming and probing_second_perform_encode
+        if probing_second_streaming:
+            for file in progression_boost_temp_dir.glob("probe-encode-second-*"):
+                if file.is_dir():
+                    shutil.rmtree(file)
+                else:
+                    file.unlink()
+
+            # A segment is only started early once it has this many frames, so
+            # that av1an startup doesn't dominate when the metric is slower
+            # than the encode. The last segment is started regardless.
+            probing_second_streaming_frames = 2400
+
+            probing_second_segments = []
+
+            def probing_second_stream(final):
+                if probing_second_segments and probing_second_segments[-1]["process"].poll() is None:
+                    return False
+
+                segment_scenes = {}
+                segment_scenes["scenes"] = []
+                segment_scene_ns = []
+                total_frames = 0
+                for scene_n in range(probing_second_segments[-1]["scene_ns"][-1] + 1 if probing_second_segments else 0, len(zone_scenes["scenes"])):
+                    if zone_scenes["scenes"][scene_n]["zone"].metric_enable and probing_second_round(scene_n) == 0:
+                        if "first_score" not in metric_result["scenes"][scene_n]:
+                            break
+                        segment_scenes["scenes"].append(probing_second_probing_scene(scene_n, zone_scenes["scenes"][scene_n]))
+                        segment_scene_ns.append(scene_n)
+                        total_frames += zone_scenes["scenes"][scene_n]["end_frame"] - zone_scenes["scenes"][scene_n]["start_frame"]
+                if not segment_scene_ns or (not final and total_frames < probing_second_streaming_frames):
+                    return False
+                segment_scenes["frames"] = total_frames
+                segment_scenes["split_scenes"] = segment_scenes["scenes"]
+
+                segment_n = len(probing_second_segments)
+                segment_tmp_dir = progression_boost_temp_dir / f"probe-encode-second-{segment_n}.tmp"
+                segment_scenes_file = progression_boost_temp_dir / f"probe-encode-second-{segment_n}.scenes.json"
+                segment_output_file = progression_boost_temp_dir / f"probe-encode-second-{segment_n}.mkv"
+                with segment_scenes_file.open("w") as probing_scenes_f:
+                    json.dump(segment_scenes, probing_scenes_f, cls=NumpyEncoder)
+
+                print(f"\r\033[K{scene_frame_print(scenes, segment_scene_ns[0])} / Starting second probe segment {segment_n} for {len(segment_scene_ns)} scenes", end="\n", flush=True)
+                probing_second_segments.append({
+                    "scene_ns": segment_scene_ns,
+                    "output_file": segment_output_file,
+                    "process": probing_perform_probing(segment_tmp_dir, segment_scenes_file, segment_output_file, zone_default.source_provider_cache(segment_output_file))
+                })
+                return True
+
+    if metric_has_metric and not retarget and probing_first_perform_encode:
+        probing_first_scenes = {}
+        probing_first_scenes["scenes"] = []
+        total_frames = 0
+        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+            if zone_scene["zone"].metric_enable:
+                metric_result["scenes"][scene_n]["first_qstep"] = 343
+
+                total_frames += zone_scene["end_frame"] - zone_scene["start_frame"]
+                probing_scene = {
+                    "start_frame": zone_scene["start_frame"],
+                    "end_frame": zone_scene["end_frame"],
+                    "zone_overrides": copy.copy(zone_scene["zone_overrides"])
+                }
+                probing_scene["zone_overrides"]["encoder"] = zone_scene["zone"].probing_dynamic_encoder(zone_scene["start_frame"],
+                                                                                                        zone_scene["end_frame"],
+                                                                                                        scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                        scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                        scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                        scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+                if zone_scene["zone"].quarterstep_crf:
+                    probing_scene["zone_overrides"]["video_params"] = [
+                        "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4:.2f}"
+                    ]
+                else:
+                    probing_scene["zone_overrides"]["video_params"] = [
+                        "--crf", f"{(np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4:.0f}"
+                    ]
+                probing_scene["zone_overrides"]["video_params"] += [
+                    "--preset", f"{zone_scene["zone"].probing_preset}",
+                    *zone_scene["zone"].probing_dynamic_parameters(zone_scene["start_frame"],
+                                                                   zone_scene["end_frame"],
+                                                                   (np.searchsorted(dc, metric_result["scenes"][scene_n]["first_qstep"], side="right") - 1) / 4,
+                                                                   scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                   scene_detection_min[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                   scene_detection_max[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                   scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]])
+                ]
+                probing_scene["zone_overrides"]["photon_noise"] = None
+                probing_scene["zone_overrides"]["photon_noise_height"] = None
+                probing_scene["zone_overrides"]["photon_noise_width"] = None
+                probing_scene["zone_overrides"]["chroma_noise"] = False
+                probing_first_scenes["scenes"].append(probing_scene)
+        probing_first_scenes["frames"] = total_frames
+        probing_first_scenes["split_scenes"] = probing_first_scenes["scenes"]
+
+        journal_write(metric_result_file, metric_result)
+            
+        with probing_first_scenes_file.open("w") as probing_scenes_f:
+            json.dump(probing_first_scenes, probing_scenes_f, cls=NumpyEncoder)
+
+        probing_first_process = probing_perform_probing(probing_first_tmp_dir, probing_first_scenes_file, probing_first_output_file, probing_first_output_file_cache)
+
+        if verbose < 2:
+            probing_first_start = time.time() - 0.000001
+            probing_first_done_scenes_len_start = 0
+            if probing_first_done_file.exists():
+                with probing_first_done_file.open("r") as done_f:
+                    done_scenes = None
+                    try:
+                        done_scenes = json.load(done_f)
+                    except json.JSONDecodeError:
+                        pass
+                    
+                    if done_scenes is not None and "done" in done_scenes:
+                        probing_first_done_scenes_len_start = len(done_scenes["done"])
+
+
+    if character_has_character and not retarget:
+        character_file = character_boost_temp_dir / "kyara.jsonl"
+
+        if resume and character_file.exists():
+            character_kyara = journal_load(character_file, scenes)
+        else:
+            character_kyara = copy.deepcopy(scenes)
+            character_file.parent.mkdir(parents=True, exist_ok=True)
+        journal_write(character_file, character_kyara)
+
+        import vsmlrt
+
+        character_clip = zone_default.source_clip
+
+        character_block_width = math.ceil(character_clip.width / 64)
+        character_block_height = math.ceil(character_clip.height / 64)
+        character_clip = character_clip.resize.Bicubic(filter_param_a=0, filter_param_b=0.5, \
+                                                       width=character_block_width*64, height=character_block_height*64, src_width=character_block_width*64, src_height=character_block_height*64, \
+                                                       format=vs.RGBS, primaries_in=1, matrix_in=1, transfer_in=1, range_in=0, transfer=13, range=1)
+        character_clip = vsmlrt.inference(character_clip, character_model, backend=character_backend)
+        character_clip = character_clip.akarin.Expr("x 0.25 > x 0 ?")
+
+        character_clip = character_clip.std.PlaneStats(prop="Kyara")
+
+        character_clip = character_clip.std.Maximum()
+        character_clip = character_clip.resize.Bicubic(filter_param_a=0, filter_param_b=0, \
+                                                       width=character_block_width, height=character_block_height)
+        character_clip = character_clip.akarin.Expr("""
+        x[-1,-1] x[-1,0] x[-1,1]
+        x[0,-1]          x[0,1]
+        x[1,-1]  x[1,0]  x[1,1]
+        + + + + + + + sur!
+        x sur@ 0.75 pow * sur@ 8 / max
+        1 min
+        """)
+
+        # Scenes are rendered together in one clip until about this many
+        # frames are pending, so that the inference queue stays full across
+        # scene boundaries.
+        character_batch_frames = 512
+
+        def character_calculate_character(batch):
+            clip_maps = []
+            for scene_n, _ in batch:
+                diffs = scene_detection_diffs[scenes["scenes"][scene_n]["start_frame"]:scenes["scenes"][scene_n]["end_frame"]]
+                frames = np.zeros((math.ceil(diffs.shape[0] / 32) * 32 + 1,), dtype=bool)
+
+                frames[0] = True
+                for frame, diff in enumerate(diffs):
+                    if diff >= 0.0012:
+                        frames[[math.floor(frame / 4) * 4, math.ceil(frame / 4) * 4]] = True
+                        frames[[math.floor(frame / 8) * 8, math.ceil(frame / 8) * 8]] = True
+                        frames[[math.floor(frame / 16) * 16, math.ceil(frame / 16) * 16]] = True
+                        frames[[math.floor(frame / 32) * 32, math.ceil(frame / 32) * 32]] = True
+
+                clip_map = [0]
+                for i in range(1, math.ceil((scenes["scenes"][scene_n]["end_frame"] - scenes["scenes"][scene_n]["start_frame"]) / 4)):
+                    if frames[i * 4]:
+                        clip_map.append(i)
+                clip_maps.append(clip_map)
+
+            clip = core.std.Splice([character_clip[int(scenes["scenes"][scene_n]["start_frame"] + i * 4)] for (scene_n, _), clip_map in zip(batch, clip_maps) for i in clip_map])
+            clip_frames = clip.frames(backlog=48)
+
+            for (scene_n, character_map_file), clip_map in zip(batch, clip_maps):
+                character_map = np.full((math.ceil((scenes["scenes"][scene_n]["end_frame"] - scenes["scenes"][scene_n]["start_frame"]) / 4), character_block_width * character_block_height),
+                                        np.nan, dtype=np.float64)
+
+                character_kyara["scenes"][scene_n]["kyara"] = 0.0
+                for i in clip_map:
+                    frame = next(clip_frames)
+                    character_map[i] = np.array(frame[0], dtype=np.float32).reshape((-1,))
+                    character_kyara["scenes"][scene_n]["kyara"] = np.max([frame.props["KyaraAverage"], character_kyara["scenes"][scene_n]["kyara"]])
+
+                np.save(character_map_file, character_map)
+                journal_append(character_file, character_kyara, scene_n, ["kyara"])
+
+        # Character segmentation doesn't depend on probing, so it runs in its
+        # own thread from here and in parallel with the probe encodes and the
+        # metric calculation. It's only waited for before the final pass.
+        character_pending = []
+        for scene_n in range(0, len(scenes["scenes"])):
+            if zone_scenes["scenes"][scene_n]["zone"].character_enable:
+                character_map_file = character_boost_temp_dir / f"character-{scene_rjust(scenes, scene_n)}.npy"
+                if not resume or not character_map_file.exists() or "kyara" not in character_kyara["scenes"][scene_n]:
+                    character_pending.append((scene_n, character_map_file))
+        character_done = []
+        character_exception = []
+
+        def character_run():
+            try:
+                batch = []
+                batch_frames = 0
+                for scene_n, character_map_file in character_pending:
+                    batch.append((scene_n, character_map_file))
+                    batch_frames += math.ceil((scenes["scenes"][scene_n]["end_frame"] - scenes["scenes"][scene_n]["start_frame"]) / 32) + 1
+                    if batch_frames >= character_batch_frames:
+                        character_calculate_character(batch)
+                        character_done.extend(batch)
+                        batch = []
+                        batch_frames = 0
+                if batch:
+                    character_calculate_character(batch)
+                    character_done.extend(batch)
+            except BaseException as e:
+                character_exception.append(e)
+
+        character_start = time.time() - 0.000001
+        character_thread = threading.Thread(target=character_run, daemon=True)
+        character_thread.start()
+
+
+    if metric_has_metric and not retarget and probing_first_perform_encode:
+        if verbose < 2:
+            if probing_first_process.poll() is not None:
+                print(f"\r\033[KScene {scene_rjust(scenes, len(probing_first_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_first_scenes["scenes"]))} / First probe complete", end="\n", flush=True)
+            else:
+                while True:
+                    if probing_first_process.poll() is not None:
+                        break
+
+                    if probing_first_done_file.exists():
+                        with probing_first_done_file.open("r") as done_f:
+                            done_scenes_len_previous = probing_first_done_scenes_len_start
+                            while True:
+                                if probing_first_process.poll() is not None:
+                                    break
+
+                                done_scenes = None
+                                done_f.seek(0)
+                                try:
+                                    done_scenes = json.load(done_f)
+                                except json.JSONDecodeError:
+                                    time.sleep(1 / 6000 * 1001)
+                                    continue
+
+                                if done_scenes is not None and "done" in done_scenes:
+                                    if (done_scenes_len := len(done_scenes["done"])) != done_scenes_len_previous or done_scenes_len == 0:
+                                        print(f"\r\033[KScene {scene_rjust(scenes, done_scenes_len)}/{scene_rjust(scenes, len(probing_first_scenes["scenes"]))} / Performing first probe / {(done_scenes_len - probing_first_done_scenes_len_start) / (time.time() - probing_first_start):.2f} scenes per second", end="", flush=True)
+                                        done_scenes_len_previous = done_scenes_len
+
+                                time.sleep(1 / 6000 * 1001)
+                        break
+
+                time.sleep(1 / 6000 * 1001)
+
+                print(f"\r\033[KScene {scene_rjust(scenes, len(probing_first_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_first_scenes["scenes"]))} / First probe complete / {(len(probing_first_scenes["scenes"]) - probing_first_done_scenes_len_start) / (time.time() - probing_first_start):.2f} scenes per second", end="\n", flush=True)
+        else:
+            probing_first_process.wait()
+    
+        assert probing_first_output_file.exists()
+
+
+    if metric_has_metric and not retarget:
+        for zone in zones:
+            if zone["zone"].metric_enable and zone["zone"].metric_method == "vapoursynth":
+                metric_method_has_vapoursynth = True
+                break
+        else:
+            metric_method_has_vapoursynth = False
+        for zone in zones:
+            if zone["zone"].metric_enable and zone["zone"].metric_method == "ffvship":
+                metric_method_has_ffvship = True
+                break
+        else:
+            metric_method_has_ffvship = False
+
+        metric_processed_reference = {}
+        metric_first = zone_default.source_provider(probing_first_output_file)
+        metric_processed_first = {}
+
+        metric_diff_clips = {}
+        if metric_method_has_vapoursynth:
+            metric_first_metric_clips = {}
+
+            metric_vapoursynth_batch_pending = 0
+            metric_vapoursynth_batches = []
+
+        if metric_method_has_ffvship:
+            metric_ffvship_first_cache = progression_boost_temp_dir / "metric-ffvship-first.ffindex"
+
+            if zone_default.source_clip_cache_reuse and zone_default.source_clip_cache is not None and zone_default.source_clip_cache.suffix == ".ffindex":
+                if not metric_ffvship_source_cache(context).exists():
+                    source_clip_cache_place(context, metric_ffvship_source_cache(context))
+
+            metric_ffvship_batches = {}
+
+        # With `probing_reduced_height`, the probes are compared against
+        # `metric_reference` downscaled the same way as ffmpeg does inside
+        # av1an, which is bicubic with b=0 and c=0.6.
+        def probing_reduced_reference(zone):
+            if probing_reduced:
+                return zone.metric_reference.resize.Bicubic(probing_reduced_width, probing_reduced_height, filter_param_a=0.0, filter_param_b=0.6)
+            else:
+                return zone.metric_reference
+
+        # The calibration of each zone for `probing_reduced_map`.
+        probing_reduced_calibration = {}
+
+        if probing_reduced:
+            probing_calibration_tmp_dir = progression_boost_temp_dir / f"probe-encode-calibration.tmp"
+            probing_calibration_scenes_file = progression_boost_temp_dir / f"probe-encode-calibration.scenes.json"
+            probing_calibration_output_file = progression_boost_temp_dir / f"probe-encode-calibration.mkv"
+            probing_calibration_output_file_cache = zone_default.source_provider_cache(probing_calibration_output_file)
+
+            # The calibration scenes are spread evenly across the scenes of
+            # each zone, and are measured on frames spread evenly across the
+            # scene, in both the first probe and a full resolution encode of
+            # the same scene at the same `--crf`.
+            probing_calibration_heads = {}
+            probing_calibration_zone_scene_ns = {}
+            probing_frame_head = 0
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable:
+                    if zone_scene["end_frame"] - zone_scene["start_frame"] >= 2:
+                        probing_calibration_heads[scene_n] = probing_frame_head
+                        probing_calibration_zone_scene_ns.setdefault(zone_scene["zone"], []).append(scene_n)
+                    probing_frame_head += zone_scene["end_frame"] - zone_scene["start_frame"]
+            probing_calibration_scene_ns = []
+            for zone, zone_scene_ns in probing_calibration_zone_scene_ns.items():
+                probing_calibration_scene_ns += np.array(zone_scene_ns)[np.unique(np.round(np.linspace(0, len(zone_scene_ns) - 1,
+                                                                                                       num=min(len(zone_scene_ns), zone_default.probing_reduced_calibration_scenes))).astype(int))].tolist()
+            probing_calibration_scene_ns.sort()
+
+            def probing_calibration_score(zone, scene_n, reference, encoded, frames):
+                clip = zone.metric_vapoursynth_calculate(zone.metric_process(reference), zone.metric_process(encoded))
+                clip = core.std.Splice([clip[int(frame)] for frame in frames])
+                scores = np.array([zone.metric_vapoursynth_metric(frame) for frame in clip.frames(backlog=48)])
+                return metric_summarise_scene(context, scenes, zone, scene_n, frames, scores)
+
+            if any(["calibration_score" not in metric_result["scenes"][scene_n] for scene_n in probing_calibration_scene_ns]):
+                if probing_first_perform_encode or not resume or not probing_calibration_output_file.exists():
+                    with probing_first_scenes_file.open("r") as probing_scenes_f:
+                        probing_calibration_first_scenes = json.load(probing_scenes_f)
+                    probing_calibration_start_frames = set([zone_scenes["scenes"][scene_n]["start_frame"] for scene_n in probing_calibration_scene_ns])
+                    probing_calibration_scenes = {}
+                    probing_calibration_scenes["scenes"] = [probing_scene for probing_scene in probing_calibration_first_scenes["scenes"] if probing_scene["start_frame"] in probing_calibration_start_frames]
+                    probing_calibration_scenes["frames"] = sum([probing_scene["end_frame"] - probing_scene["start_frame"] for probing_scene in probing_calibration_scenes["scenes"]])
+                    probing_calibration_scenes["split_scenes"] = probing_calibration_scenes["scenes"]
+                    with probing_calibration_scenes_file.open("w") as probing_scenes_f:
+                        json.dump(probing_calibration_scenes, probing_scenes_f, cls=NumpyEncoder)
+
+                    shutil.rmtree(probing_calibration_tmp_dir, ignore_errors=True)
+                    print(f"\r\033[K{scene_frame_print(scenes, probing_calibration_scene_ns[0])} / Starting full resolution calibration probe for {len(probing_calibration_scene_ns)} scenes", end="\n", flush=True)
+                    probing_calibration_process = probing_perform_probing(probing_calibration_tmp_dir, probing_calibration_scenes_file, probing_calibration_output_file, probing_calibration_output_file_cache, reduced=False)
+                    probing_calibration_process.wait()
+                    assert probing_calibration_output_file.exists()
+
+                metric_calibration = zone_default.source_provider(probing_calibration_output_file)
+                calibration_frame_head = 0
+                for scene_n in probing_calibration_scene_ns:
+                    zone_scene = zone_scenes["scenes"][scene_n]
+                    scene_frames = zone_scene["end_frame"] - zone_scene["start_frame"]
+                    if "calibration_score" not in metric_result["scenes"][scene_n]:
+                        print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Calculating metric for calibration", end="", flush=True)
+                        frames = np.unique(np.round(np.linspace(0, scene_frames - 1, num=min(scene_frames, 16)))).astype(int)
+                        metric_result["scenes"][scene_n]["calibration_reduced_score"] = probing_calibration_score(zone_scene["zone"], scene_n,
+                                                                                                                  probing_reduced_reference(zone_scene["zone"])[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                                  metric_first[probing_calibration_heads[scene_n]:probing_calibration_heads[scene_n] + scene_frames],
+                                                                                                                  frames)
+                        metric_result["scenes"][scene_n]["calibration_score"] = probing_calibration_score(zone_scene["zone"], scene_n,
+                                                                                                          zone_scene["zone"].metric_reference[zone_scene["start_frame"]:zone_scene["end_frame"]],
+                                                                                                          metric_calibration[calibration_frame_head:calibration_frame_head + scene_frames],
+                                                                                                          frames)
+                        journal_append(metric_result_file, metric_result, scene_n, ["calibration_reduced_score", "calibration_score"])
+                    calibration_frame_head += scene_frames
+
+            for zone, zone_scene_ns in probing_calibration_zone_scene_ns.items():
+                reduced_scores = np.array([metric_result["scenes"][scene_n]["calibration_reduced_score"] for scene_n in probing_calibration_scene_ns if zone_scenes["scenes"][scene_n]["zone"] is zone])
+                scores = np.array([metric_result["scenes"][scene_n]["calibration_score"] for scene_n in probing_calibration_scene_ns if zone_scenes["scenes"][scene_n]["zone"] is zone])
+                a, b = None, None
+                if reduced_scores.shape[0] >= 3 and np.ptp(reduced_scores) > 0:
+                    a, b = Polynomial.fit(reduced_scores, scores, 1).convert().coef
+                if b is None or b <= 0:
+                    a, b = np.mean(scores - reduced_scores), 1.0
+                probing_reduced_calibration[zone] = (a, b)
+                print(f"\r\033[K{scene_frame_print(scenes, zone_scene_ns[0])} / Calibration from {reduced_scores.shape[0]} scenes / full resolution score = {a:.3f} + {b:.3f} * reduced score", end="\n", flush=True)
+
+        # `EncodeDiff` between the source and the first probe is measured for
+        # every scene that needs it in one render ahead of frame selection, and
+        # kept as a float32 array indexed by frame of the first probe. Frames
+        # not measured are left as NaN. It's saved next to the metric results,
+        # so a resume that has lost `frames` only slices the array.
+        metric_encode_diffs_file = progression_boost_temp_dir / "metric-encode-diffs.npy"
+        metric_encode_diffs_frames = sum([zone_scene["end_frame"] - zone_scene["start_frame"] for zone_scene in zone_scenes["scenes"] if zone_scene["zone"].metric_enable])
+        metric_encode_diffs = None
+        if resume and not probing_first_perform_encode and metric_encode_diffs_file.exists():
+            metric_encode_diffs = np.load(metric_encode_diffs_file)
+            if metric_encode_diffs.shape != (metric_encode_diffs_frames,):
+                metric_encode_diffs = None
+        if metric_encode_diffs is None:
+            metric_encode_diffs = np.full((metric_encode_diffs_frames,), np.nan, dtype=np.float32)
+
+        metric_encode_diffs_pending = []
+        probing_frame_head = 0
+        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+            if zone_scene["zone"].metric_enable:
+                scene_frames = zone_scene["end_frame"] - zone_scene["start_frame"]
+                if "frames" not in metric_result["scenes"][scene_n] and \
+                   zone_scene["zone"].metric_highest_probing_diff_frames and scene_frames > 1 and \
+                   np.any(np.isnan(metric_encode_diffs[probing_frame_head:probing_frame_head + scene_frames])):
+                    reference_offset = zone_scene["start_frame"] - probing_frame_head
+                    if (zone_scene["zone"], reference_offset) not in metric_diff_clips:
+                        if zone_scene["zone"] not in metric_processed_reference:
+                            metric_processed_reference[zone_scene["zone"]] = zone_scene["zone"].metric_process(probing_reduced_reference(zone_scene["zone"]))
+                        if zone_scene["zone"] not in metric_processed_first:
+                            metric_processed_first[zone_scene["zone"]] = zone_scene["zone"].metric_process(metric_first)
+                        metric_diff_clips[(zone_scene["zone"], reference_offset)] = core.std.PlaneStats(metric_processed_reference[zone_scene["zone"]][reference_offset:],
+                                                                                                        metric_processed_first[zone_scene["zone"]],
+                                                                                                        prop="Encode")
+                    metric_encode_diffs_pending.append((probing_frame_head, metric_diff_clips[(zone_scene["zone"], reference_offset)][probing_frame_head:probing_frame_head + scene_frames]))
+                probing_frame_head += scene_frames
+
+        if metric_encode_diffs_pending:
+            clip = core.std.Splice([scene_clip for _, scene_clip in metric_encode_diffs_pending], mismatch=True) if len(metric_encode_diffs_pending) >= 2 else metric_encode_diffs_pending[0][1]
+            encode_diffs = np.empty((clip.num_frames,), dtype=np.float32)
+            for i, frame in enumerate(clip.frames(backlog=48)):
+                if i % 240 == 0:
+                    print(f"\r\033[K{frame_print(i)} / Measuring probing diff / {i / clip.num_frames * 100:.1f}%", end="", flush=True)
+                encode_diffs[i] = frame.props["EncodeDiff"]
+            print(f"\r\033[K{frame_print(clip.num_frames)} / Probing diff measured for {len(metric_encode_diffs_pending)} scenes", end="\n", flush=True)
+
+            frames_head = 0
+            for probing_frame_head, scene_clip in metric_encode_diffs_pending:
+                metric_encode_diffs[probing_frame_head:probing_frame_head + scene_clip.num_frames] = encode_diffs[frames_head:frames_head + scene_clip.num_frames]
+                frames_head += scene_clip.num_frames
+
+            temp_file = metric_encode_diffs_file.with_suffix(".tmp")
+            with temp_file.open("wb") as encode_diffs_f:
+                np.save(encode_diffs_f, metric_encode_diffs)
+            temp_file.replace(metric_encode_diffs_file)
+
+        # Picks the frames to measure in a scene longer than one frame. The
+        # frames are offset from `scene["start_frame"] + 1` as `offfset_frames`,
+        # so they start from -1, and both masks below are indexed by
+        # `offfset_frame + 1`. `taken` marks the frames already picked, and
+        # `blocked` marks the frames closer than
+        # `metric_diff_brackets_min_separation` to one of them, so that every
+        # candidate is checked in constant time instead of scanning the frames
+        # picked so far.
+        def metric_select_frames(zone_scene, encode_diffs):
+            zone = zone_scene["zone"]
+            scene_frames = zone_scene["end_frame"] - zone_scene["start_frame"]
+            rng = default_rng(1188246) # Guess what is this number. It's the easiest cipher out there.
+
+            offfset_frames = []
+            taken = np.zeros((scene_frames,), dtype=bool)
+            blocked = np.zeros((scene_frames,), dtype=bool)
+            blocked_radius = math.ceil(zone.metric_diff_brackets_min_separation) - 1
+
+            def pick(candidates, count):
+                candidates = candidates[~taken[candidates + 1]][:max(count, 0)]
+                taken[candidates + 1] = True
+                offfset_frames.extend(candidates.tolist())
+                if verbose >= 3:
+                    for offfset_frame in candidates:
+                        print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
+
+            def block(offfset_frame):
+                if blocked_radius >= 0:
+                    blocked[max(offfset_frame + 1 - blocked_radius, 0):offfset_frame + 2 + blocked_radius] = True
+
+            def pick_separated(candidates, count):
+                picked = 0
+                for offfset_frame in candidates:
+                    if picked >= count:
+                        break
+                    if blocked[offfset_frame + 1]:
+                        continue
+                    offfset_frames.append(offfset_frame)
+                    taken[offfset_frame + 1] = True
+                    block(offfset_frame)
+                    picked += 1
+                    if verbose >= 3:
+                        print(f" {zone_scene["start_frame"] + 1 + offfset_frame}", end="", flush=True)
+                return picked
+
+            scene_diffs = scene_detection_diffs[zone_scene["start_frame"] + 1:zone_scene["end_frame"]]
+
+            transform = fftpack.dct(scene_diffs)
+            transform[np.max([math.ceil(transform.shape[0] / 5), 7]):] = 0
+            reconstructed = fftpack.idct(transform)
+
+            peaks, properties = signal.find_peaks(reconstructed, prominence=0)
+            peaks_sort = peaks[np.argsort(properties["prominences"])[::-1]]
+
+            if verbose >= 3:
+                print(f" / peak transformed", end="", flush=True)
+            pick(peaks_sort, zone.metric_peak_transformed_diff_frames)
+
+            if verbose >= 3:
+                print(f" / highest diff", end="", flush=True)
+            pick(np.argsort(scene_diffs)[::-1], zone.metric_highest_diff_frames)
+
+            if zone.metric_highest_probing_diff_frames:
+                if verbose >= 3:
+                    print(f" / highest probing diff", end="", flush=True)
+                pick(np.argsort(encode_diffs, stable=True)[::-1] - 1, zone.metric_highest_probing_diff_frames)
+
+            if verbose >= 3:
+                print(f" / last", end="", flush=True)
+            if zone.metric_last_frame >= 1:
+                pick(np.array([scene_frames - 2]), 1)
+
+            scene_diffs_percentile = np.percentile(scene_diffs, 40, method="linear")
+            scene_diffs_percentile_absolute_deviation = np.percentile(np.abs(scene_diffs - scene_diffs_percentile), 40, method="linear")
+            scene_diffs_upper_bracket_ = np.argwhere(scene_diffs > scene_diffs_percentile + 5 * scene_diffs_percentile_absolute_deviation).reshape((-1))
+            scene_diffs_lower_bracket_ = np.argwhere(scene_diffs <= scene_diffs_percentile + 5 * scene_diffs_percentile_absolute_deviation).reshape((-1))
+            scene_diffs_upper_bracket = np.empty_like(scene_diffs_upper_bracket_)
+            rng.shuffle((scene_diffs_upper_bracket__ := scene_diffs_upper_bracket_[:math.ceil(scene_diffs_upper_bracket_.shape[0] / 2)]))
+            scene_diffs_upper_bracket[::2] = scene_diffs_upper_bracket__
+            rng.shuffle((scene_diffs_upper_bracket__ := scene_diffs_upper_bracket_[-math.floor(scene_diffs_upper_bracket_.shape[0] / 2):]))
+            scene_diffs_upper_bracket[1::2] = scene_diffs_upper_bracket__
+            scene_diffs_lower_bracket = np.empty_like(scene_diffs_lower_bracket_)
+            rng.shuffle((scene_diffs_lower_bracket__ := scene_diffs_lower_bracket_[:math.ceil(scene_diffs_lower_bracket_.shape[0] / 2)]))
+            scene_diffs_lower_bracket[::2] = scene_diffs_lower_bracket__
+            rng.shuffle((scene_diffs_lower_bracket__ := scene_diffs_lower_bracket_[-math.floor(scene_diffs_lower_bracket_.shape[0] / 2):]))
+            scene_diffs_lower_bracket[1::2] = scene_diffs_lower_bracket__
+
+            for offfset_frame in offfset_frames:
+                block(offfset_frame)
+
+            if verbose >= 3:
+                print(f" / upper bracket", end="", flush=True)
+            picked = pick_separated(scene_diffs_upper_bracket, zone.metric_upper_diff_bracket_frames)
+
+            if picked < zone.metric_upper_diff_bracket_fallback_frames:
+                to_pick = zone.metric_lower_diff_bracket_frames + zone.metric_upper_diff_bracket_fallback_frames - picked
+            else:
+                to_pick = zone.metric_lower_diff_bracket_frames
+
+            if verbose >= 3:
+                print(f" / first", end="", flush=True)
+            if zone.metric_first_frame >= 1 and not taken[0]:
+                pick(np.array([-1]), 1)
+                block(-1)
+
+            if verbose >= 3:
+                print(f" / lower bracket", end="", flush=True)
+            pick_separated(scene_diffs_lower_bracket, to_pick)
+
+            if verbose >= 3:
+                print(f"", end="\n", flush=True)
+
+            return np.sort(np.array(offfset_frames, dtype=np.int32)) + 1
+
+        # Batched scenes only get their `first_score` once their batch is
+        # run, and a second probe segment can't start before that. While
+        # streaming, the batches are run as soon as they hold the frames of a
+        # segment, instead of only at the end for FFVship.
+        probing_second_streaming_unscored = 0
+
+        start = time.time() - 0.000001
+        start_count = -1
+        probing_frame_head = 0
+        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+            if zone_scene["zone"].metric_enable:
+                metric_result_keys = set(metric_result["scenes"][scene_n])
+
+                if "first_score" not in metric_result["scenes"][scene_n]:
+                    start_count += 1
+                    print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Calculating metric / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
+    
+                    assert zone_scene["zone"].metric_method in ["ffvship", "vapoursynth"], "Invalid `metric_method`. Please check your config inside `Progression-Boost.py`."
+
+                if zone_scene["zone"] not in metric_processed_reference:
+                    metric_processed_reference[zone_scene["zone"]] = zone_scene["zone"].metric_process(probing_reduced_reference(zone_scene["zone"]))
+                if zone_scene["zone"] not in metric_processed_first:
+                    metric_processed_first[zone_scene["zone"]] = zone_scene["zone"].metric_process(metric_first)
+                
+                reference_offset = zone_scene["start_frame"] - probing_frame_head
+
+
+                if "frames" not in metric_result["scenes"][scene_n]:
+                    if verbose >= 3:
+                        print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Frame selection", end="", flush=True)
+
+                    if zone_scene["end_frame"] - zone_scene["start_frame"] > 1:
+                        if zone_scene["zone"].metric_highest_probing_diff_frames:
+                            encode_diffs = metric_encode_diffs[probing_frame_head:probing_frame_head + zone_scene["end_frame"] - zone_scene["start_frame"]]
+                        else:
+                            encode_diffs = None
+                        metric_result["scenes"][scene_n]["frames"] = metric_select_frames(zone_scene, encode_diffs)
+
+                    else:
+                        if verbose >= 3:
+                            print(f" / frame {zone_scene["start_frame"]}", end="\n", flush=True)
+                        metric_result["scenes"][scene_n]["frames"] = np.array([0], dtype=np.int32)
+
+
+                if "first_score" not in metric_result["scenes"][scene_n]:
+                    if zone_scene["zone"].metric_method == "vapoursynth":
+                        if (zone_scene["zone"], reference_offset) not in metric_first_metric_clips:
+                            metric_first_metric_clips[(zone_scene["zone"], reference_offset)] = zone_scene["zone"].metric_vapoursynth_calculate(metric_processed_reference[zone_scene["zone"]][reference_offset:], metric_processed_first[zone_scene["zone"]])
+        
+                        clip = metric_first_metric_clips[(zone_scene["zone"], reference_offset)][int(metric_result["scenes"][scene_n]["frames"][0] + probing_frame_head)]
+                        for frame in metric_result["scenes"][scene_n]["frames"][1:]:
+                            clip += metric_first_metric_clips[(zone_scene["zone"], reference_offset)][int(frame + probing_frame_head)]
+
+                        if zone_scene["zone"].metric_vapoursynth_batch:
+                            metric_vapoursynth_batches.append((scene_n, zone_scene, clip))
+                            metric_vapoursynth_batch_pending += clip.num_frames
+                            scores = None
+                        else:
+                            scores = np.array([zone_scene["zone"].metric_vapoursynth_metric(frame) for frame in clip.frames(backlog=48)])
+                    
+                    elif zone_scene["zone"].metric_method == "ffvship":
+                        if zone_scene["zone"].metric_ffvship_batch:
+                            metric_ffvship_batches.setdefault(metric_ffvship_batch_key(zone_scene["zone"], reference_offset), []).append((scene_n, zone_scene))
+                            scores = None
+                        else:
+                            scores = metric_ffvship_run(context, probing_first_output_file, metric_ffvship_first_cache, zone_scene["zone"],
+                                                        metric_result["scenes"][scene_n]["frames"] + zone_scene["start_frame"], reference_offset)
+                            scores = np.array([zone_scene["zone"].metric_ffvship_metric(frame) for frame in scores])
+                
+                    if scores is not None:
+                        metric_result["scenes"][scene_n]["first_score"] = probing_reduced_map(probing_reduced_calibration, zone_scene["zone"], metric_summarise_scene(context, scenes, zone_scene["zone"], scene_n, np.array(metric_result["scenes"][scene_n]["frames"]), scores))
+                    elif probing_second_streaming and probing_second_round(scene_n) == 0:
+                        probing_second_streaming_unscored += zone_scene["end_frame"] - zone_scene["start_frame"]
+
+
+                probing_frame_head += zone_scene["end_frame"] - zone_scene["start_frame"]
+
+                if (metric_result_new_keys := set(metric_result["scenes"][scene_n]) - metric_result_keys):
+                    journal_append(metric_result_file, metric_result, scene_n, metric_result_new_keys)
+
+                if metric_method_has_vapoursynth and metric_vapoursynth_batch_pending >= metric_vapoursynth_batch_frames:
+                    metric_vapoursynth_run_batches(context, metric_vapoursynth_batches, metric_result, metric_result_file, probing_reduced_calibration, "first_score")
+                    metric_vapoursynth_batch_pending = 0
+
+                if probing_second_streaming:
+                    if probing_second_streaming_unscored >= probing_second_streaming_frames:
+                        if metric_method_has_vapoursynth and metric_vapoursynth_batches:
+                            metric_vapoursynth_run_batches(context, metric_vapoursynth_batches, metric_result, metric_result_file, probing_reduced_calibration, "first_score")
+                            metric_vapoursynth_batch_pending = 0
+                        if metric_method_has_ffvship and metric_ffvship_batches:
+                            metric_ffvship_run_batches(context, metric_ffvship_batches, probing_first_output_file, metric_ffvship_first_cache, metric_result, metric_result_file, probing_reduced_calibration, "first_score")
+                        probing_second_streaming_unscored = 0
+                    probing_second_stream(False)
+
+        if metric_method_has_vapoursynth and metric_vapoursynth_batches:
+            metric_vapoursynth_run_batches(context, metric_vapoursynth_batches, metric_result, metric_result_file, probing_reduced_calibration, "first_score")
+        if metric_method_has_ffvship and metric_ffvship_batches:
+            metric_ffvship_run_batches(context, metric_ffvship_batches, probing_first_output_file, metric_ffvship_first_cache, metric_result, metric_result_file, probing_reduced_calibration, "first_score")
+
+        if probing_second_streaming:
+            probing_second_stream(True)
+
+        if start_count != -1:
+            print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Metric calculation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
+
+
+    #  ██████╗ ██████╗  ██████╗ ██████╗ ██╗███╗   ██╗ ██████╗       ███████╗███████╗ ██████╗ ██████╗ ███╗   ██╗██████╗ 
+    #  ██╔══██╗██╔══██╗██╔═══██╗██╔══██╗██║████╗  ██║██╔════╝       ██╔════╝██╔════╝██╔════╝██╔═══██╗████╗  ██║██╔══██╗
+    #  ██████╔╝██████╔╝██║   ██║██████╔╝██║██╔██╗ ██║██║  ███╗█████╗███████╗█████╗  ██║     ██║   ██║██╔██╗ ██║██║  ██║
+    #  ██╔═══╝ ██╔══██╗██║   ██║██╔══██╗██║██║╚██╗██║██║   ██║╚════╝╚════██║██╔══╝  ██║     ██║   ██║██║╚██╗██║██║  ██║
+    #  ██║     ██║  ██║╚██████╔╝██████╔╝██║██║ ╚████║╚██████╔╝      ███████║███████╗╚██████╗╚██████╔╝██║ ╚████║██████╔╝
+    #  ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝       ╚══════╝╚══════╝ ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚═════╝ 
+
+
+    if metric_has_metric and not retarget and probing_second_perform_encode and not probing_second_streaming:
+        probing_second_scenes = {}
+        probing_second_scenes["scenes"] = []
+        total_frames = 0
+        for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+            if zone_scene["zone"].metric_enable and probing_second_round(scene_n) == 0:
+                total_frames += zone_scene["end_frame"] - zone_scene["start_frame"]
+                probing_second_scenes["scenes"].append(probing_second_probing_scene(scene_n, zone_scene))
+        probing_second_scenes["frames"] = total_frames
+        probing_second_scenes["split_scenes"] = probing_second_scenes["scenes"]
+
+        journal_write(metric_result_file, metric_result)
+            
+        with probing_second_scenes_file.open("w") as probing_scenes_f:
+            json.dump(probing_second_scenes, probing_scenes_f, cls=NumpyEncoder)
+
+        probing_second_process = probing_perform_probing(probing_second_tmp_dir, probing_second_scenes_file, probing_second_output_file, probing_second_output_file_cache)
+
+        if verbose < 2:
+            probing_second_start = time.time() - 0.000001
+            probing_second_done_scenes_len_start = 0
+            if probing_second_done_file.exists():
+                with probing_second_done_file.open("r") as done_f:
+                    done_scenes = None
+                    try:
+                        done_scenes = json.load(done_f)
+                    except json.JSONDecodeError:
+                        pass
+                    
+                    if done_scenes is not None and "done" in done_scenes:
+                        probing_second_done_scenes_len_start = len(done_scenes["done"])
+
+
+    if metric_has_metric and not retarget and probing_second_perform_encode and probing_second_streaming:
+        while True:
+            probing_second_segments[-1]["process"].wait()
+            if not probing_second_stream(True):
+                break
+        print(f"\r\033[KScene {scene_rjust(scenes, len(zone_scenes["scenes"]))}/{scene_rjust(scenes, len(zone_scenes["scenes"]))} / Second probe complete / {len(probing_second_segments)} segments", end="\n", flush=True)
+
+        journal_write(metric_result_file, metric_result)
+
+        probing_second_output_file.unlink(missing_ok=True)
+        if probing_second_output_file_cache is not None:
+            probing_second_output_file_cache.unlink(missing_ok=True)
+        for segment in probing_second_segments:
+            assert segment["output_file"].exists()
+        if len(probing_second_segments) == 1:
+            probing_second_segments[0]["output_file"].replace(probing_second_output_file)
+        else:
+            command = [
+                "mkvmerge",
+                "--quiet",
+                "-o", probing_second_output_file,
+                probing_second_segments[0]["output_file"]
+            ]
+            for segment in probing_second_segments[1:]:
+                command += ["+", segment["output_file"]]
+            subprocess.run(command, text=True, stdout=subprocess.DEVNULL)
+
+        assert probing_second_output_file.exists()
+
+    if metric_has_metric and not retarget and probing_second_perform_encode and not probing_second_streaming:
+        if verbose < 2:
+            if probing_second_process.poll() is not None:
+                print(f"\r\033[KScene {scene_rjust(scenes, len(probing_second_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_second_scenes["scenes"]))} / Second probe complete", end="\n", flush=True)
+            else:
+                while True:
+                    if probing_second_process.poll() is not None:
+                        break
+
+                    if probing_second_done_file.exists():
+                        with probing_second_done_file.open("r") as done_f:
+                            done_scenes_len_previous = probing_second_done_scenes_len_start
+                            while True:
+                                if probing_second_process.poll() is not None:
+                                    break
+
+                                done_scenes = None
+                                done_f.seek(0)
+                                try:
+                                    done_scenes = json.load(done_f)
+                                except json.JSONDecodeError:
+                                    time.sleep(1 / 6000 * 1001)
+                                    continue
+
+                                if done_scenes is not None and "done" in done_scenes:
+                                    if (done_scenes_len := len(done_scenes["done"])) != done_scenes_len_previous or done_scenes_len == 0:
+                                        print(f"\r\033[KScene {scene_rjust(scenes, done_scenes_len)}/{scene_rjust(scenes, len(probing_second_scenes["scenes"]))} / Performing second probe / {(done_scenes_len - probing_second_done_scenes_len_start) / (time.time() - probing_second_start):.2f} scenes per second", end="", flush=True)
+                                        done_scenes_len_previous = done_scenes_len
+
+                                time.sleep(1 / 6000 * 1001)
+                        break
+
+                    time.sleep(1 / 6000 * 1001)
+
+                print(f"\r\033[KScene {scene_rjust(scenes, len(probing_second_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_second_scenes["scenes"]))} / Second probe complete / {(len(probing_second_scenes["scenes"]) - probing_second_done_scenes_len_start) / (time.time() - probing_second_start):.2f} scenes per second", end="\n", flush=True)
+        else:
+            probing_second_process.wait()
+
+        assert probing_second_output_file.exists()
+
+    if metric_has_metric and not retarget and probing_second_model:
+        # A model is fitted for each zone and each side of the second probe,
+        # using least squares on the sampled scenes. It predicts the second
+        # score from the first score and the luma statistics of the scene.
+        # The expected error of a prediction is the standard error of the
+        # prediction from the residuals of the fit.
+        def probing_second_model_features(zone_scene, first_score):
+            return [1.0,
+                    first_score,
+                    np.mean(scene_detection_average[zone_scene["start_frame"]:zone_scene["end_frame"]]),
+                    np.percentile(scene_detection_diffs[zone_scene["start_frame"]:zone_scene["end_frame"]], 25)]
+
+        # Predicts the scenes not in the sample, and encodes the scenes that
+        # can't be predicted in the second round of second probe. Returns
+        # whether there is any scene in the second round.
+        def probing_second_model_perform():
+            if resume and not probing_second_perform_encode and probing_second_rest_output_file.exists():
+                return any(probing_second_round(scene_n) == 1 for scene_n in probing_second_model_scene_ns)
+
+            probing_second_model_data = {}
+            for scene_n in probing_second_model_samples:
+                zone_scene = zone_scenes["scenes"][scene_n]
+                probing_second_model_data.setdefault((zone_scene["zone"], metric_result["scenes"][scene_n]["second_qstep"]), []) \
+                                         .append((probing_second_model_features(zone_scene, metric_result["scenes"][scene_n]["first_score"]), metric_result["scenes"][scene_n]["second_score"]))
+
+            probing_second_models = {}
+            for key, data in probing_second_model_data.items():
+                X = np.array([features for features, _ in data], dtype=np.float64)
+                y = np.array([score for _, score in data], dtype=np.float64)
+                coef, _, rank, _ = np.linalg.lstsq(X, y, rcond=None)
+                if y.shape[0] - rank < 2:
+                    continue
+                variance = np.sum(np.square(y - X @ coef)) / (y.shape[0] - rank)
+                probing_second_models[key] = (coef, variance, np.linalg.pinv(X.T @ X))
+
+            probing_second_rest_scenes = {}
+            probing_second_rest_scenes["scenes"] = []
+            probing_second_rest_scenes_ns = []
+            total_frames = 0
+            for scene_n in probing_second_model_scene_ns:
+                if scene_n in probing_second_model_samples:
+                    continue
+                zone_scene = zone_scenes["scenes"][scene_n]
+                if "second_predicted" in metric_result["scenes"][scene_n]:
+                    del metric_result["scenes"][scene_n]["second_predicted"]
+                if "second_score" in metric_result["scenes"][scene_n]:
+                    del metric_result["scenes"][scene_n]["second_score"]
+
+                probing_second_qstep(scene_n, zone_scene)
+                if (key := (zone_scene["zone"], metric_result["scenes"][scene_n]["second_qstep"])) in probing_second_models:
+                    coef, variance, covariance = probing_second_models[key]
+                    x = np.array(probing_second_model_features(zone_scene, metric_result["scenes"][scene_n]["first_score"]), dtype=np.float64)
+                    score = float(x @ coef)
+                    error = math.sqrt(max(variance * (1 + x @ covariance @ x), 0.0))
+                    if metric_result["scenes"][scene_n]["second_qstep"] > metric_result["scenes"][scene_n]["first_qstep"]:
+                        reliable = zone_scene["zone"].metric_better(metric_result["scenes"][scene_n]["first_score"], score)
+                    else:
+                        reliable = zone_scene["zone"].metric_better(score, metric_result["scenes"][scene_n]["first_score"])
+                    if verbose >= 3:
+                        print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Second probe model / predicted {score:.3f} / expected error {error:.3f}", end="\n", flush=True)
+                    if reliable and error <= zone_default.probing_second_model_tolerance:
+                        metric_result["scenes"][scene_n]["second_score"] = score
+                        metric_result["scenes"][scene_n]["second_predicted"] = True
+                        continue
+
+                total_frames += zone_scene["end_frame"] - zone_scene["start_frame"]
+                probing_second_rest_scenes["scenes"].append(probing_second_probing_scene(scene_n, zone_scene))
+                probing_second_rest_scenes_ns.append(scene_n)
+            probing_second_rest_scenes["frames"] = total_frames
+            probing_second_rest_scenes["split_scenes"] = probing_second_rest_scenes["scenes"]
+
+            journal_write(metric_result_file, metric_result)
+
+            print(f"\r\033[KScene {scene_rjust(scenes, len(probing_second_model_scene_ns) - len(probing_second_model_samples) - len(probing_second_rest_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_second_model_scene_ns) - len(probing_second_model_samples))} / Second probe predicted from {len(probing_second_model_samples)} sampled scenes", end="\n", flush=True)
+            if not probing_second_rest_scenes["scenes"]:
+                return False
+
+            with probing_second_rest_scenes_file.open("w") as probing_scenes_f:
+                json.dump(probing_second_rest_scenes, probing_scenes_f, cls=NumpyEncoder)
+
+            print(f"\r\033[K{scene_frame_print(scenes, probing_second_rest_scenes_ns[0])} / Starting second probe for {len(probing_second_rest_scenes["scenes"])} scenes not predicted", end="\n", flush=True)
+            probing_second_rest_process = probing_perform_probing(probing_second_rest_tmp_dir, probing_second_rest_scenes_file, probing_second_rest_output_file, probing_second_rest_output_file_cache)
+            probing_second_rest_process.wait()
+            print(f"\r\033[KScene {scene_rjust(scenes, len(probing_second_rest_scenes["scenes"]))}/{scene_rjust(scenes, len(probing_second_rest_scenes["scenes"]))} / Second probe for scenes not predicted complete", end="\n", flush=True)
+
+            assert probing_second_rest_output_file.exists()
+            return True
+
+    if metric_has_metric and not retarget:
+        for probing_second_round_n in ([0, 1] if probing_second_model else [0]):
+            if probing_second_round_n == 0:
+                probing_round_output_file = probing_second_output_file
+            else:
+                probing_round_output_file = probing_second_rest_output_file
+                if not probing_second_model_perform():
+                    continue
+
+            if metric_method_has_vapoursynth:
+                metric_processed_reference = {}
+        
+                metric_second = zone_default.source_provider(probing_round_output_file)
+                metric_processed_second = {}
+                metric_second_metric_clips = {}
+                metric_vapoursynth_batches = []
+                metric_vapoursynth_batch_pending = 0
+        
+            if metric_method_has_ffvship:
+                metric_ffvship_second_cache = progression_boost_temp_dir / f"metric-ffvship-{probing_round_output_file.stem.removeprefix("probe-encode-")}.ffindex"
+                metric_ffvship_batches = {}
+
+            start = time.time() - 0.000001
+            start_count = -1
+            probing_frame_head = 0
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable and probing_second_round(scene_n) == probing_second_round_n:
+                    metric_result_keys = set(metric_result["scenes"][scene_n])
+
+                    if "second_score" not in metric_result["scenes"][scene_n]:
+                        start_count += 1
+                        print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Calculating metric / {start_count / (time.time() - start):.2f} scenes per second", end="", flush=True)
+
+                        assert "frames" in metric_result["scenes"][scene_n], "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+    
+                        reference_offset = zone_scene["start_frame"] - probing_frame_head
+                        if zone_scene["zone"].metric_method == "vapoursynth":
+                            if zone_scene["zone"] not in metric_processed_reference:
+                                metric_processed_reference[zone_scene["zone"]] = zone_scene["zone"].metric_process(probing_reduced_reference(zone_scene["zone"]))
+                            if zone_scene["zone"] not in metric_processed_second:
+                                metric_processed_second[zone_scene["zone"]] = zone_scene["zone"].metric_process(metric_second)
+    
+                            if (zone_scene["zone"], reference_offset) not in metric_second_metric_clips:
+                                metric_second_metric_clips[(zone_scene["zone"], reference_offset)] = zone_scene["zone"].metric_vapoursynth_calculate(metric_processed_reference[zone_scene["zone"]][reference_offset:], metric_processed_second[zone_scene["zone"]])
+        
+                            clip = metric_second_metric_clips[(zone_scene["zone"], reference_offset)][int(metric_result["scenes"][scene_n]["frames"][0] + probing_frame_head)]
+                            for frame in metric_result["scenes"][scene_n]["frames"][1:]:
+                                clip += metric_second_metric_clips[(zone_scene["zone"], reference_offset)][int(frame + probing_frame_head)]
+        
+                            if zone_scene["zone"].metric_vapoursynth_batch:
+                                metric_vapoursynth_batches.append((scene_n, zone_scene, clip))
+                                metric_vapoursynth_batch_pending += clip.num_frames
+                                scores = None
+                            else:
+                                scores = np.array([zone_scene["zone"].metric_vapoursynth_metric(frame) for frame in clip.frames(backlog=48)])
+                    
+                        elif zone_scene["zone"].metric_method == "ffvship":
+                            if zone_scene["zone"].metric_ffvship_batch:
+                                metric_ffvship_batches.setdefault(metric_ffvship_batch_key(zone_scene["zone"], reference_offset), []).append((scene_n, zone_scene))
+                                scores = None
+                            else:
+                                scores = metric_ffvship_run(context, probing_round_output_file, metric_ffvship_second_cache, zone_scene["zone"],
+                                                            metric_result["scenes"][scene_n]["frames"] + zone_scene["start_frame"], reference_offset)
+                                scores = np.array([zone_scene["zone"].metric_ffvship_metric(frame) for frame in scores])
+                
+                        if scores is not None:
+                            metric_result["scenes"][scene_n]["second_score"] = probing_reduced_map(probing_reduced_calibration, zone_scene["zone"], metric_summarise_scene(context, scenes, zone_scene["zone"], scene_n, np.array(metric_result["scenes"][scene_n]["frames"]), scores))
+
+                    probing_frame_head += zone_scene["end_frame"] - zone_scene["start_frame"]
+
+                    if (metric_result_new_keys := set(metric_result["scenes"][scene_n]) - metric_result_keys):
+                        journal_append(metric_result_file, metric_result, scene_n, metric_result_new_keys)
+
+                    if metric_method_has_vapoursynth and metric_vapoursynth_batch_pending >= metric_vapoursynth_batch_frames:
+                        metric_vapoursynth_run_batches(context, metric_vapoursynth_batches, metric_result, metric_result_file, probing_reduced_calibration, "second_score")
+                        metric_vapoursynth_batch_pending = 0
+
+            if metric_method_has_vapoursynth and metric_vapoursynth_batches:
+                metric_vapoursynth_run_batches(context, metric_vapoursynth_batches, metric_result, metric_result_file, probing_reduced_calibration, "second_score")
+            if metric_method_has_ffvship and metric_ffvship_batches:
+                metric_ffvship_run_batches(context, metric_ffvship_batches, probing_round_output_file, metric_ffvship_second_cache, metric_result, metric_result_file, probing_reduced_calibration, "second_score")
+
+            if start_count != -1:
+                print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Metric calculation complete / {(start_count + 1) / (time.time() - start):.2f} scenes per second", end="\n", flush=True)
+
+        # Failsafe for `--resume` # Fixed it properly this time
+        # for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+        #     if zone_scene["zone"].metric_enable:
+        #         if "first_qstep" not in metric_result["scenes"][scene_n]:
+        #             metric_result["scenes"][scene_n]["first_qstep"] = 343
+
+        if verbose >= 3:
+            for scene_n, zone_scene in enumerate(zone_scenes["scenes"]):
+                if zone_scene["zone"].metric_enable:
+                    print(f"\r\033[K{scene_frame_print(scenes, scene_n)} / Metric result / first_qstep {metric_result["scenes"][scene_n]["first_qstep"]} / first_score {metric_result["scenes"][scene_n]["first_score"]:.3f} / second_qstep {metric_result["scenes"][scene_n]["second_qstep"]} / second_score {metric_result["scenes"][scene_n]["second_score"]:.3f}", end="\n", flush=True)
+
+
+    if character_has_character and not retarget:
+        if character_thread.is_alive():
+            while character_thread.is_alive():
+                print(f"\r\033[KScene {scene_rjust(scenes, len(character_done))}/{scene_rjust(scenes, len(character_pending))} / Performing character segmentation / {len(character_done) / (time.time() - character_start):.2f} scenes per second", end="", flush=True)
+                character_thread.join(timeout=1)
+            print(f"\r\033[KScene {scene_rjust(scenes, len(character_done))}/{scene_rjust(scenes, len(character_pending))} / Character segmentation complete / {len(character_done) / (time.time() - character_start):.2f} scenes per second", end="\n", flush=True)
+        else:
+            character_thread.join()
+        if character_exception:
+            raise character_exception[0]
+        assert len(character_done) == len(character_pending), "This indicates a bug in the original code. Please report this to the repository including this entire error message."
+
+
+    #  ███████╗██╗███╗   ██╗ █████╗ ██╗     
+    #  ██╔════╝██║████╗  ██║██╔══██╗██║     
+    #  █████╗  ██║██╔██╗ ██║███████║██║     
+    #  ██╔══╝  ██║██║╚██╗██║██╔══██║██║     
+    #  ██║     ██║██║ ╚████║██║  ██║███████╗
+    #  ╚═╝     ╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝
+
+
+    if not metric_has_metric:
+        metric_result = None
+    if not character_has_character:
+        character_kyara = None
+    for final_target, final_scenes_file in final_scenes_files(context):
+        final_write_scenes(context, scenes, zone_scenes, scene_detection_luma, metric_result, character_kyara, final_target, final_scenes_file)
+
+    print(f"\r\033[KTime {datetime.now().time().isoformat(timespec="seconds")} / {program_name} finished", end="\n", flush=True)